@@ -0,0 +1,133 @@
+import os
+import subprocess
+import sys
+import tempfile
+from typing import List
+
+import numpy as np
+
+from Benchmarks.StatisticsBenchmark import make_frame_store
+from Src.CaptureFile import load_capture, save_capture
+from Src.FrameStore import FrameStore
+from Src.PathTable import path_table
+
+
+def get_sample_path_names(frame_store: FrameStore) -> List[str]:
+    path_ids: np.ndarray = frame_store.get_samples(0, len(frame_store.samples), ["path_id"])["path_id"]
+    return [path_table.path_names[path_id] for path_id in path_ids]
+
+
+def assert_stores_equal(frame_store: FrameStore, other: FrameStore) -> None:
+    """
+    Compares every frame, sample and time record. Samples are compared by path name, since path ids differ between
+    sessions.
+    """
+
+    assert frame_store.first_frame_number == other.first_frame_number
+    assert np.array_equal(frame_store.frames.get(0, len(frame_store.frames)), other.frames.get(0, len(other.frames)))
+    assert np.array_equal(frame_store.times.get(0, len(frame_store.times)), other.times.get(0, len(other.times)))
+
+    samples: np.ndarray = frame_store.get_samples(0, len(frame_store.samples))
+    other_samples: np.ndarray = other.get_samples(0, len(other.samples))
+    for field in FrameStore.sample_dtype.names:
+        if field != "path_id":
+            assert np.array_equal(samples[field], other_samples[field]), field
+    assert get_sample_path_names(frame_store) == get_sample_path_names(other)
+
+
+def check_round_trip(temp_dir: str) -> None:
+    frame_store: FrameStore = make_frame_store(2000, 20)
+    # Some frames spilled, so every region of the store is written.
+    frame_store.set_retention(500)
+
+    capture_file: str = os.path.join(temp_dir, "round_trip.udoncap")
+    save_capture(frame_store, capture_file)
+    assert_stores_equal(frame_store, load_capture(capture_file))
+
+
+def check_save_onto_loaded(temp_dir: str) -> None:
+    # Saving a capture onto the file its frames are mapped from mustn't truncate it under them.
+    capture_file: str = os.path.join(temp_dir, "loaded.udoncap")
+    frame_store: FrameStore = make_frame_store(2000, 20)
+    save_capture(frame_store, capture_file)
+
+    loaded: FrameStore = load_capture(capture_file)
+    save_capture(loaded, capture_file)
+    assert_stores_equal(frame_store, loaded)
+    assert_stores_equal(frame_store, load_capture(capture_file))
+    # Temporary file the capture was written to is gone.
+    assert os.listdir(temp_dir) == ["loaded.udoncap"]
+
+
+def check_bad_files(temp_dir: str) -> None:
+    capture_file: str = os.path.join(temp_dir, "good.udoncap")
+    save_capture(make_frame_store(200, 10), capture_file)
+    with open(capture_file, "rb") as capture:
+        data: bytes = capture.read()
+
+    bad_file: str = os.path.join(temp_dir, "bad.udoncap")
+    # Truncated at every section, and a file that isn't a capture.
+    for contents in [data[:size] for size in (0, 10, 100, len(data) // 2, len(data) - 1)] + [b"not a capture" * 100]:
+        with open(bad_file, "wb") as capture:
+            capture.write(contents)
+
+        try:
+            load_capture(bad_file)
+        except ValueError:
+            continue
+
+        raise AssertionError(f"bad capture of {len(contents)} bytes loaded")
+
+
+def check_other_session(capture_file: str, path_names_file: str) -> None:
+    """
+    Child process. Loads a capture written by another session, with paths already in the path table in a different
+    order, so its path ids are translated.
+    """
+
+    path_table.intern("/Other", "")
+    path_table.intern("/Other/Sample", "/Other")
+
+    loaded: FrameStore = load_capture(capture_file)
+    assert loaded.path_id_map is not None
+
+    with open(path_names_file) as path_names:
+        assert get_sample_path_names(loaded) == path_names.read().split("\n")
+
+    # Ids are written translated, so the saved capture matches this session's path table.
+    resaved_file: str = capture_file + ".resaved"
+    save_capture(loaded, resaved_file)
+    resaved: FrameStore = load_capture(resaved_file)
+    assert resaved.path_id_map is None
+    assert_stores_equal(loaded, resaved)
+
+
+def check_translated_path_ids(temp_dir: str) -> None:
+    frame_store: FrameStore = make_frame_store(2000, 20)
+    capture_file: str = os.path.join(temp_dir, "session.udoncap")
+    save_capture(frame_store, capture_file)
+
+    # Path of every sample, which mustn't depend on the session the capture is opened in.
+    path_names_file: str = os.path.join(temp_dir, "path_names.txt")
+    with open(path_names_file, "w") as path_names:
+        path_names.write("\n".join(get_sample_path_names(frame_store)))
+
+    subprocess.run([sys.executable, "-m", "Benchmarks.CaptureCheck", "--child", capture_file, path_names_file],
+                   check=True)
+
+
+if __name__ == "__main__":
+    # Run from the UdonProfilerApp directory: python -m Benchmarks.CaptureCheck
+    if "--child" in sys.argv:
+        check_other_session(sys.argv[sys.argv.index("--child") + 1], sys.argv[sys.argv.index("--child") + 2])
+        sys.exit(0)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        check_round_trip(temp_dir)
+        check_bad_files(temp_dir)
+        check_translated_path_ids(temp_dir)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        check_save_onto_loaded(temp_dir)
+
+    print("capture checks passed")
@@ -0,0 +1,54 @@
+import timeit
+from typing import Dict, List
+
+from Benchmarks.StatisticsBenchmark import make_frame_store
+from Src.FrameComparison import compare_frame_ranges
+from Src.FrameStore import FrameStore
+from Src.FrameView import FrameView
+
+
+def sum_per_sample(frame_store: FrameStore, start_frame_idx: int, stop_frame_idx: int) -> Dict[int, List[float]]:
+    # One sample at a time through frame views, the way a frame is read for the hierarchy view.
+    sums: Dict[int, List[float]] = dict()
+    for frame_idx in range(start_frame_idx, stop_frame_idx):
+        frame_view: FrameView = frame_store.get_frame(frame_idx)
+        for sample in frame_view.samples:
+            path_sums: List[float] = sums.setdefault(sample.path_id, [0.0, 0.0, 0.0])
+            path_sums[0] += sample.total_time_ms
+            path_sums[1] += sample.self_time_ms
+            path_sums[2] += sample.num_calls
+
+    return sums
+
+
+def compare_per_sample(frame_store: FrameStore, base_start: int, base_stop: int, other_start: int,
+                       other_stop: int) -> Dict[int, List[float]]:
+    base_sums: Dict[int, List[float]] = sum_per_sample(frame_store, base_start, base_stop)
+    other_sums: Dict[int, List[float]] = sum_per_sample(frame_store, other_start, other_stop)
+
+    deltas: Dict[int, List[float]] = dict()
+    for path_id in base_sums.keys() | other_sums.keys():
+        base: List[float] = base_sums.get(path_id, [0.0, 0.0, 0.0])
+        other: List[float] = other_sums.get(path_id, [0.0, 0.0, 0.0])
+        deltas[path_id] = [o / (other_stop - other_start) - b / (base_stop - base_start) for b, o in zip(base, other)]
+
+    return deltas
+
+
+if __name__ == "__main__":
+    # Run from the UdonProfilerApp directory: python -m Benchmarks.ComparisonBenchmark
+    repeats: int = 5
+
+    print(f"{'samples':>8} {'window':>8} {'vectorized ms':>14} {'per-sample ms':>14}")
+    for num_samples in (50, 200):
+        frame_store: FrameStore = make_frame_store(20000, num_samples)
+
+        for window in (1, 1000, 10000):
+            vectorized_time: float = min(timeit.repeat(
+                lambda: compare_frame_ranges(frame_store, (0, window), (20000 - window, 20000)),
+                number=1, repeat=repeats))
+            loop_time: float = min(timeit.repeat(
+                lambda: compare_per_sample(frame_store, 0, window, 20000 - window, 20000),
+                number=1, repeat=1))
+
+            print(f"{num_samples:>8} {window:>8} {vectorized_time * 1000:>14.2f} {loop_time * 1000:>14.1f}")
@@ -0,0 +1,34 @@
+import timeit
+from typing import List
+
+from Benchmarks.SyntheticLog import make_frame_lines
+from Src.Sample import Sample
+from Src.FrameInfo import FrameInfo
+from Src.FrameParser import parse_frame_block
+
+
+def parse_per_line(lines: List[str]) -> FrameInfo:
+    frame_info: FrameInfo = FrameInfo(0)
+    for line in lines:
+        frame_info.add_sample(Sample(line))
+
+    return frame_info
+
+
+if __name__ == "__main__":
+    # Run from the UdonProfilerApp directory: python -m Benchmarks.FrameParserBenchmark
+    repeats: int = 20
+
+    print(f"{'samples':>8} {'per-line ms':>12} {'block ms':>10} {'speedup':>8}")
+    for num_samples in (100, 1000, 5000, 20000):
+        lines: List[str] = make_frame_lines(num_samples)
+
+        # Warm up so that path interning isn't part of the measurement.
+        parse_per_line(lines)
+        parse_frame_block(lines)
+
+        per_line_time: float = min(timeit.repeat(lambda: parse_per_line(lines), number=1, repeat=repeats))
+        block_time: float = min(timeit.repeat(lambda: parse_frame_block(lines), number=1, repeat=repeats))
+
+        print(f"{num_samples:>8} {per_line_time * 1000:>12.3f} {block_time * 1000:>10.3f} "
+              f"{per_line_time / block_time:>7.1f}x")
@@ -0,0 +1,63 @@
+import time
+from typing import List, Union
+
+import numpy as np
+
+from Src.HitchDetector import HitchDetector
+
+
+def make_frame_times(num_frames: int, num_hitches: int, seed: int = 0) -> np.ndarray:
+    # Jittery 90 fps frame times, with a slow drift so the rolling threshold has to follow it, and a few spikes.
+    rng: np.random.Generator = np.random.default_rng(seed)
+    frame_times: np.ndarray = rng.normal(11.1, 0.6, num_frames) + 2 * np.sin(np.arange(num_frames) / 5000)
+    frame_times[rng.choice(num_frames, num_hitches, replace=False)] += rng.uniform(20, 200, num_hitches)
+
+    return frame_times
+
+
+def detect_per_frame(frame_times: np.ndarray) -> List[int]:
+    # Median and MAD recomputed over the whole window for every frame.
+    hitch_idxs: List[int] = list()
+    for frame_idx in range(HitchDetector.min_window_size, len(frame_times)):
+        window: np.ndarray = frame_times[max(0, frame_idx - HitchDetector.window_size):frame_idx]
+        median: float = float(np.median(window))
+        mad: float = max(float(np.median(np.abs(window - median))), HitchDetector.min_mad_ms)
+        if frame_times[frame_idx] > median + HitchDetector.threshold_mads * HitchDetector.mad_scale * mad:
+            hitch_idxs.append(frame_idx)
+
+    return hitch_idxs
+
+
+if __name__ == "__main__":
+    # Run from the UdonProfilerApp directory: python -m Benchmarks.HitchBenchmark
+    num_hitches: int = 500
+
+    for num_frames in (20000, 200000):
+        frame_times: np.ndarray = make_frame_times(num_frames, num_hitches)
+
+        hitch_detector: HitchDetector = HitchDetector()
+        start_time: float = time.perf_counter()
+        hitch_detector.extend(frame_times)
+        streaming_time: float = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        hitch_idxs: List[int] = detect_per_frame(frame_times)
+        per_frame_time: float = time.perf_counter() - start_time
+
+        if hitch_idxs != hitch_detector.hitch_idxs.data.tolist():
+            raise RuntimeError("streaming and per frame hitches differ")
+
+        print(f"{num_frames} frames, {hitch_detector.num_hitches} hitches")
+        print(f"  streaming:  {streaming_time * 1e3:8.1f} ms  {streaming_time / num_frames * 1e6:6.2f} us/frame")
+        print(f"  per frame:  {per_frame_time * 1e3:8.1f} ms  {per_frame_time / num_frames * 1e6:6.2f} us/frame")
+
+        # Walking every hitch, as the hitch buttons do.
+        start_time = time.perf_counter()
+        frame_idx: int = -1
+        num_visited: int = 0
+        next_idx: Union[int, None] = hitch_detector.get_next_hitch(frame_idx)
+        while next_idx is not None:
+            frame_idx = next_idx
+            num_visited += 1
+            next_idx = hitch_detector.get_next_hitch(frame_idx)
+        print(f"  next hitch: {(time.perf_counter() - start_time) / max(1, num_visited) * 1e6:6.2f} us/jump")
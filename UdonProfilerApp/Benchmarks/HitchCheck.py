@@ -0,0 +1,66 @@
+from typing import List, Union
+
+import numpy as np
+
+from Benchmarks.HitchBenchmark import detect_per_frame, make_frame_times
+from Src.HitchDetector import HitchDetector
+
+
+def detect_one_at_a_time(frame_times: np.ndarray, window_size: int,
+                         budget_ms: Union[float, None] = None) -> List[int]:
+    hitch_detector: HitchDetector = HitchDetector(window_size, budget_ms=budget_ms)
+    for frame_time in frame_times.tolist():
+        hitch_detector.add(frame_time)
+
+    return hitch_detector.hitch_idxs.data.tolist()
+
+
+def detect_in_batches(frame_times: np.ndarray, batch_sizes: List[int], window_size: int,
+                      budget_ms: Union[float, None] = None) -> List[int]:
+    """
+    Adds the frames in batches of the given sizes, cycling through them, with a single add between batches.
+    """
+
+    hitch_detector: HitchDetector = HitchDetector(window_size, budget_ms=budget_ms)
+    start: int = 0
+    batch: int = 0
+    while start < len(frame_times):
+        stop: int = min(start + batch_sizes[batch % len(batch_sizes)], len(frame_times))
+        hitch_detector.extend(frame_times[start:stop])
+        if stop < len(frame_times):
+            hitch_detector.add(float(frame_times[stop]))
+            stop += 1
+
+        start = stop
+        batch += 1
+
+    assert len(hitch_detector) == len(frame_times)
+    return hitch_detector.hitch_idxs.data.tolist()
+
+
+if __name__ == "__main__":
+    # Run from the UdonProfilerApp directory: python -m Benchmarks.HitchCheck
+    frame_times: np.ndarray = make_frame_times(20000, 100)
+    # Steady frame times, where the MAD is at its lower bound, and ties in every window.
+    steady_frame_times: np.ndarray = np.round(make_frame_times(5000, 20, seed=1) * 2) / 2
+
+    # Batches of every size around the window size and the chunk size, so each frame lands on every code path.
+    batch_sizes: List[int] = [1, 7, HitchDetector.window_size - 1, HitchDetector.window_size,
+                              HitchDetector.window_size + 1, 1000, HitchDetector.chunk_frames + 3]
+
+    for times in (frame_times, steady_frame_times):
+        expected: List[int] = detect_per_frame(times)
+        assert detect_one_at_a_time(times, HitchDetector.window_size) == expected
+
+        hitch_detector: HitchDetector = HitchDetector()
+        hitch_detector.extend(times)
+        assert hitch_detector.hitch_idxs.data.tolist() == expected
+        assert detect_in_batches(times, batch_sizes, HitchDetector.window_size) == expected
+
+        # Other window sizes, and a fixed budget.
+        for window_size in (1, 2, 31, 500):
+            assert detect_in_batches(times, batch_sizes, window_size) == detect_one_at_a_time(times, window_size)
+        assert detect_in_batches(times, batch_sizes, HitchDetector.window_size, budget_ms=14) == \
+               detect_one_at_a_time(times, HitchDetector.window_size, budget_ms=14)
+
+    print("hitch checks passed")
@@ -0,0 +1,102 @@
+import os
+import tempfile
+from typing import List
+
+import numpy as np
+
+from Benchmarks.SyntheticLog import make_frame_block, make_frame_lines
+from Src.FrameBlock import FrameBlock
+from Src.FrameParser import parse_frame_block
+from Src.LogImporter import import_log
+from Src.PathTable import PathTable, path_table
+from Src.Sample import Sample
+
+# Frame lines that are truncated or malformed, each of which must be rejected with ValueError.
+malformed_lines: List[str] = [
+    # Empty start and end time lists.
+    "/UdonBehaviour;;1;1;0;1;1;;\n",
+    # Empty end time list on the last line.
+    "/UdonBehaviour;;1;1;0;1;1;1;\n",
+    # Empty start time list.
+    "/UdonBehaviour;;1;1;0;1;1;;2\n",
+    # Empty time inside a list.
+    "/UdonBehaviour;;1;1;0;1;1;1,,2;3,4,5\n",
+    # Times that aren't numbers.
+    "/UdonBehaviour;;1;1;0;1;1;2.x;3\n",
+    "/UdonBehaviour;;1;1;0;1;1;1;3y\n",
+    # Numeric fields that aren't numbers, or are empty.
+    "/UdonBehaviour;;1;1;x;1;1;1;2\n",
+    "/UdonBehaviour;;;1;1;1;1;1;2\n",
+    # Too few and too many fields, e.g. a line cut off by the next log message.
+    "/UdonBehaviour;;1;1;0;1\n",
+    "/UdonBehaviour;;1;1;0;1;1;1;2;3\n",
+    # New path that is its own parent. Parents are only read when a path is first seen.
+    "/UdonBehaviour/Self;/UdonBehaviour/Self;1;1;0;1;1;1;2\n",
+]
+
+
+def check_parse_matches_per_line() -> None:
+    lines: List[str] = make_frame_lines(500)
+    frame_block: FrameBlock = parse_frame_block(lines)
+
+    times_offset: int = 0
+    for line, record in zip(lines, frame_block.samples):
+        sample: Sample = Sample(line)
+        assert path_table.path_names[record["path_id"]] == sample.path_name
+        assert record["num_calls"] == sample.num_calls
+        assert record["total_time_ms"] == sample.total_time_ms
+        assert record["self_time_ms"] == sample.self_time_ms
+        assert record["time_offset"] == times_offset
+        assert record["num_times"] == len(sample.start_times)
+
+        times: np.ndarray = frame_block.times[times_offset:times_offset + record["num_times"]]
+        assert np.array_equal(times["start_time"], sample.start_times)
+        assert np.array_equal(times["end_time"], sample.end_times)
+        times_offset += int(record["num_times"])
+
+    assert frame_block.frame_time == Sample(lines[0]).total_time_ms
+
+
+def check_unpaired_times() -> None:
+    # Profiler always pairs start and end times. Unpaired times are dropped rather than misaligning the rest.
+    frame_block: FrameBlock = parse_frame_block(["/UdonBehaviour;;1;1;2;1;1;1,2,3;4,5\n",
+                                                 "/UdonBehaviour/A;/UdonBehaviour;1;1;1;1;1;6;7\n"], PathTable())
+    assert frame_block.samples["num_times"].tolist() == [2, 1]
+    assert frame_block.times["start_time"].tolist() == [1, 2, 6]
+    assert frame_block.times["end_time"].tolist() == [4, 5, 7]
+
+
+def check_malformed_lines() -> None:
+    good_lines: List[str] = make_frame_lines(20)
+    for line in malformed_lines:
+        # Alone, and among good lines, since times are parsed for the whole frame at once.
+        for lines in ([line], good_lines + [line], [line] + good_lines):
+            try:
+                parse_frame_block(lines, PathTable())
+            except ValueError:
+                continue
+
+            raise AssertionError(f"malformed line parsed: {line!r}")
+
+
+def check_import_skips_malformed_frames() -> None:
+    # Malformed frames are skipped, and the frames around them are still imported.
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log_file: str = os.path.join(temp_dir, "Editor.log")
+        with open(log_file, "w") as log:
+            for line in malformed_lines:
+                log.write(make_frame_block(20))
+                log.write("##FRAME_INFO_BEGIN##\n" + line + "##FRAME_INFO_END##\n")
+            log.write(make_frame_block(20))
+
+        frame_blocks: List[FrameBlock] = import_log(log_file, max_workers=1)
+        assert len(frame_blocks) == len(malformed_lines) + 1
+
+
+if __name__ == "__main__":
+    # Run from the UdonProfilerApp directory: python -m Benchmarks.ParserCheck
+    check_parse_matches_per_line()
+    check_unpaired_times()
+    check_malformed_lines()
+    check_import_skips_malformed_frames()
+    print("parser checks passed")
@@ -0,0 +1,56 @@
+import timeit
+from typing import List
+
+import numpy as np
+
+from Benchmarks.StatisticsBenchmark import make_frame_store
+from Src.FrameQuery import find_path_ids, parse_query, query_frames
+from Src.FrameStore import FrameStore
+from Src.SampleSeries import SampleSeries
+
+
+def query_sample_table(frame_store: FrameStore, query: str) -> np.ndarray:
+    # Same query over every sample of every frame, without per-path series.
+    samples: np.ndarray = frame_store.samples.get(0, len(frame_store.samples))
+    frame_idxs: np.ndarray = np.repeat(np.arange(len(frame_store)),
+                                       frame_store.frames.get(0, len(frame_store))["num_samples"])
+
+    matches: np.ndarray = np.arange(len(frame_store))
+    for condition in parse_query(query):
+        mask: np.ndarray = np.isin(samples["path_id"], find_path_ids(condition.path))
+        # Sample records have the same field names as series records.
+        mask &= condition.evaluate(samples)
+        matches = np.intersect1d(matches, frame_idxs[mask])
+
+    return matches
+
+
+if __name__ == "__main__":
+    # Run from the UdonProfilerApp directory: python -m Benchmarks.QueryBenchmark
+    repeats: int = 5
+    num_frames: int = 1000000
+    num_samples: int = 10
+
+    frame_store: FrameStore = make_frame_store(num_frames, num_samples)
+
+    # Series are built on the first query of a path, then reused.
+    sample_series: SampleSeries = SampleSeries(frame_store)
+    load_time: float = timeit.timeit(lambda: sample_series.load(find_path_ids("Sample3") + find_path_ids("Sample1")),
+                                     number=1)
+    print(f"load: {load_time:.2f} s for 2 paths over {num_frames} frames, {sample_series.nbytes / 1e6:.0f} MB of series")
+
+    queries: List[str] = [
+        "Sample3 total_ms > 0.8",
+        "Sample3 total_ms > 0.8 and self_ms < 0.3",
+        "Sample3 total_ms > 0.8 and Sample1 percent <= 50",
+    ]
+    for query in queries:
+        if not np.array_equal(query_frames(sample_series, query), query_sample_table(frame_store, query)):
+            raise RuntimeError(f"series and sample table results differ for {query}")
+
+        series_time: float = min(timeit.repeat(lambda: query_frames(sample_series, query),
+                                               number=1, repeat=repeats))
+        table_time: float = min(timeit.repeat(lambda: query_sample_table(frame_store, query),
+                                              number=1, repeat=repeats))
+        print(f"{query}: {len(query_frames(sample_series, query))} frames")
+        print(f"  series: {series_time * 1e3:8.1f} ms  sample table: {table_time * 1e3:8.1f} ms")
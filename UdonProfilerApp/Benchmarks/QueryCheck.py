@@ -0,0 +1,78 @@
+from typing import List
+
+import numpy as np
+
+from Benchmarks.QueryBenchmark import query_sample_table
+from Benchmarks.RetentionCheck import make_frame_blocks
+from Src.FrameBlock import FrameBlock
+from Src.FrameParser import parse_frame_block
+from Src.FrameQuery import find_path_ids, query_frames
+from Src.FrameStore import FrameStore
+from Src.SampleSeries import SampleSeries
+
+queries: List[str] = [
+    "Sample3 total_ms > 0.8",
+    "Sample3 total_ms > 0.8 and self_ms < 0.3",
+    "Sample3 total_ms > 0.8 and Sample1 percent <= 50",
+    "Sample20 calls == 4 and Sample1 total_ms < 0.6",
+    "UdonBehaviour/Sample3 calls >= 4",
+    "Sample90 total_ms > 0",
+]
+
+# Samples with the same name as a synthetic sample under another parent, so a query on the name matches both.
+other_parent_lines: List[str] = [
+    "/UdonBehaviour;;100;10;1;2.0;0.5;0;2\n",
+    "/UdonBehaviour/Other;/UdonBehaviour;50;10;1;1.0;0.2;0.5;1.5\n",
+    "/UdonBehaviour/Other/Sample3;/UdonBehaviour/Other;40;40;2;0.9;0.9;0.6,1;0.8,1.4\n",
+]
+
+
+def record(frame_store: FrameStore, frame_blocks: List[FrameBlock], num_frames: int) -> None:
+    for i in range(0, num_frames):
+        frame_store.append(frame_blocks[i % len(frame_blocks)])
+
+
+def check_queries(sample_series: SampleSeries, frame_store: FrameStore) -> None:
+    for query in queries:
+        expected: np.ndarray = query_sample_table(frame_store, query)
+        assert np.array_equal(query_frames(sample_series, query), expected), query
+
+    # Queries on a path that doesn't exist, or that can't be parsed, are rejected.
+    for query in ("NoSuchSample total_ms > 1", "Sample3 total_ms >", "total_ms > 1"):
+        try:
+            query_frames(sample_series, query)
+        except ValueError:
+            continue
+
+        raise AssertionError(f"bad query ran: {query}")
+
+
+if __name__ == "__main__":
+    # Run from the UdonProfilerApp directory: python -m Benchmarks.QueryCheck
+    # Frames with different sample counts, so paths are missing from some frames.
+    frame_blocks: List[FrameBlock] = make_frame_blocks(16) + [parse_frame_block(other_parent_lines)]
+    assert len(find_path_ids("Sample3")) == 2
+
+    frame_store: FrameStore = FrameStore()
+    record(frame_store, frame_blocks, 5000)
+
+    # Series built on first query, then brought up to date with the frames recorded after it.
+    sample_series: SampleSeries = SampleSeries(frame_store)
+    check_queries(sample_series, frame_store)
+    record(frame_store, frame_blocks, 3001)
+    check_queries(sample_series, frame_store)
+
+    # Series dropped past the size limit and rebuilt when queried again give the same results.
+    small_series: SampleSeries = SampleSeries(frame_store, max_bytes=1024)
+    check_queries(small_series, frame_store)
+    assert len(small_series.series) < len(sample_series.series)
+    record(frame_store, frame_blocks, 500)
+    check_queries(small_series, frame_store)
+
+    # Cleared series start over with the frames stored now.
+    frame_store.clear()
+    sample_series.clear()
+    record(frame_store, frame_blocks, 700)
+    check_queries(sample_series, frame_store)
+
+    print("query checks passed")
@@ -0,0 +1,43 @@
+import time
+import tracemalloc
+from typing import List, Union
+
+from Benchmarks.SyntheticLog import make_frame_lines
+from Src.FrameBlock import FrameBlock
+from Src.FrameParser import parse_frame_block
+from Src.FrameStore import FrameStore
+
+
+def record(num_frames: int, num_samples: int, max_frames: Union[int, None], report_interval: int) -> None:
+    frame_blocks: List[FrameBlock] = [parse_frame_block(make_frame_lines(num_samples, seed=seed))
+                                      for seed in range(0, 16)]
+
+    frame_store: FrameStore = FrameStore()
+    frame_store.set_retention(max_frames)
+
+    tracemalloc.start()
+    start_time: float = time.perf_counter()
+    for i in range(0, num_frames):
+        frame_store.append(frame_blocks[i % len(frame_blocks)])
+
+        if (i + 1) % report_interval == 0:
+            current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+            print(f"{i + 1:>9} {frame_store.nbytes / 1e6:>10.1f} {current_bytes / 1e6:>10.1f} "
+                  f"{peak_bytes / 1e6:>10.1f} {(time.perf_counter() - start_time) / (i + 1) * 1e6:>9.2f}")
+
+    # Spilled frames are still readable.
+    frame_store.get_frame(0)
+    tracemalloc.stop()
+    frame_store.clear()
+
+
+if __name__ == "__main__":
+    # Run from the UdonProfilerApp directory: python -m Benchmarks.RetentionBenchmark
+    # About an hour of recording at 60 fps.
+    num_frames: int = 200000
+    num_samples: int = 50
+
+    for max_frames in (None, 20000):
+        print(f"max frames in memory: {max_frames}, {num_samples} samples per frame")
+        print(f"{'frames':>9} {'store MB':>10} {'traced MB':>10} {'peak MB':>10} {'us/frame':>9}")
+        record(num_frames, num_samples, max_frames, num_frames // 5)
@@ -0,0 +1,79 @@
+import os
+import tempfile
+from typing import List
+
+from Benchmarks.CaptureCheck import assert_stores_equal
+from Benchmarks.SyntheticLog import make_frame_lines
+from Src.CaptureFile import load_capture, save_capture
+from Src.FrameBlock import FrameBlock
+from Src.FrameParser import parse_frame_block
+from Src.FrameStore import FrameStore
+
+
+def make_frame_blocks(num_variants: int) -> List[FrameBlock]:
+    # Different sample counts, so frames don't all take the same room.
+    return [parse_frame_block(make_frame_lines(10 + 7 * seed, seed=seed)) for seed in range(0, num_variants)]
+
+
+def record(frame_blocks: List[FrameBlock], num_frames: int, frame_store: FrameStore) -> None:
+    """
+    Appends frames to a store, checking after every frame that the frames in memory are within its limits.
+    """
+
+    for i in range(0, num_frames):
+        frame_store.append(frame_blocks[i % len(frame_blocks)])
+
+        num_memory_frames: int = len(frame_store.frames.memory)
+        assert frame_store.frames.memory_start + num_memory_frames == len(frame_store)
+        if frame_store.max_frames is not None:
+            assert num_memory_frames <= frame_store.max_frames
+        # Newest frame is always kept, even if it's over the limit on its own.
+        if frame_store.max_bytes is not None and num_memory_frames > 1:
+            assert frame_store.nbytes <= frame_store.max_bytes
+
+
+def check_retention(frame_blocks: List[FrameBlock]) -> None:
+    expected: FrameStore = FrameStore()
+    record(frame_blocks, 3000, expected)
+
+    for max_frames, max_bytes in ((100, None), (None, 64 * 1024), (250, 16 * 1024), (1, None)):
+        frame_store: FrameStore = FrameStore()
+        frame_store.set_retention(max_frames, max_bytes)
+        record(frame_blocks, 3000, frame_store)
+
+        # Spilled frames read back the same as frames kept in memory, including across the spill boundary.
+        assert frame_store.frames.num_spilled > 0
+        assert_stores_equal(expected, frame_store)
+        for frame_idx in (0, frame_store.frames.memory_start - 1, frame_store.frames.memory_start, 2999):
+            assert [sample.path_name for sample in frame_store.get_frame(frame_idx).samples] == \
+                   [sample.path_name for sample in expected.get_frame(frame_idx).samples]
+
+    # Lowering the limits of a store spills the frames over them right away.
+    expected.set_retention(10)
+    assert len(expected.frames.memory) <= 10
+
+
+def check_retention_after_capture(frame_blocks: List[FrameBlock]) -> None:
+    # Frames of an opened capture stay mapped, and only frames recorded after it are spilled.
+    with tempfile.TemporaryDirectory() as temp_dir:
+        capture_file: str = os.path.join(temp_dir, "retention.udoncap")
+        captured: FrameStore = FrameStore()
+        record(frame_blocks, 1000, captured)
+        save_capture(captured, capture_file)
+
+        frame_store: FrameStore = load_capture(capture_file)
+        frame_store.set_retention(100)
+        assert frame_store.frames.num_mapped == 1000 and frame_store.frames.num_spilled == 0
+
+        record(frame_blocks, 1000, frame_store)
+        record(frame_blocks, 1000, captured)
+        assert frame_store.frames.num_mapped == 1000 and frame_store.frames.num_spilled > 0
+        assert_stores_equal(captured, frame_store)
+
+
+if __name__ == "__main__":
+    # Run from the UdonProfilerApp directory: python -m Benchmarks.RetentionCheck
+    frame_blocks: List[FrameBlock] = make_frame_blocks(16)
+    check_retention(frame_blocks)
+    check_retention_after_capture(frame_blocks)
+    print("retention checks passed")
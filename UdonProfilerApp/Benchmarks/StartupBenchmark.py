@@ -0,0 +1,102 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from Benchmarks.SyntheticLog import make_frame_lines
+
+frame_begin_line: str = "##FRAME_INFO_BEGIN##\n"
+frame_end_line: str = "##FRAME_INFO_END##\n"
+# Frames are rewritten until the app shows one, since the ingest thread only reads what's written after it starts.
+frame_write_interval_ms: int = 20
+
+
+def run_app(logfile_name: str, build_all_tabs: bool) -> None:
+    """
+    Child process. Launches the app on a log, writes a frame to the log and exits once it's on screen.
+    Prints phase timings in seconds from the start of the child process, one "name value" per line.
+    """
+
+    start_time: float = time.perf_counter()
+
+    from UdonProfiler import UdonProfiler
+    from Src.FrameBlock import FrameBlock
+    import_time: float = time.perf_counter()
+
+    app: UdonProfiler = UdonProfiler(logfile_name)
+    if build_all_tabs:
+        # What startup cost before tabs were built on first use.
+        app.details_panel.build_timeline_view()
+        app.details_panel.build_statistics_view()
+    app.update_idletasks()
+    window_time: float = time.perf_counter()
+
+    frame_text: str = frame_begin_line + "".join(make_frame_lines(200)) + frame_end_line
+
+    def write_frame() -> None:
+        with open(logfile_name, "a") as logfile:
+            logfile.write(frame_text)
+
+        app.after(frame_write_interval_ms, write_frame)
+
+    on_frame_block_received: Any = app.on_frame_block_received
+
+    def on_first_frame(frame_block: FrameBlock) -> None:
+        on_frame_block_received(frame_block)
+        app.update_idletasks()
+        frame_time: float = time.perf_counter()
+
+        print(f"import {import_time - start_time}")
+        print(f"window {window_time - start_time}")
+        print(f"first_frame {frame_time - start_time}")
+        sys.stdout.flush()
+
+        app.on_exit()
+
+    app.on_frame_block_received = on_first_frame
+    app.record()
+    app.after_idle(write_frame)
+    app.run()
+
+
+def launch_app(logfile_name: str, build_all_tabs: bool) -> Dict[str, float]:
+    args: List[str] = [sys.executable, "-m", "Benchmarks.StartupBenchmark", "--child", logfile_name]
+    if build_all_tabs:
+        args.append("--build-all-tabs")
+
+    launch_time: float = time.perf_counter()
+    output: str = subprocess.run(args, check=True, capture_output=True, text=True).stdout
+    exit_time: float = time.perf_counter()
+
+    timings: Dict[str, float] = {name: float(value) for name, value in
+                                 (line.split() for line in output.splitlines() if line)}
+    timings["process"] = exit_time - launch_time
+
+    return timings
+
+
+if __name__ == "__main__":
+    # Run from the UdonProfilerApp directory: python -m Benchmarks.StartupBenchmark
+    # Needs a display. Each launch is a new process, so imports are measured cold.
+    if "--child" in sys.argv:
+        run_app(sys.argv[sys.argv.index("--child") + 1], "--build-all-tabs" in sys.argv)
+        sys.exit(0)
+
+    repeats: int = 5
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log_file: str = os.path.join(temp_dir, "Editor.log")
+
+        print(f"{'tabs':>8} {'import ms':>10} {'window ms':>10} {'first frame ms':>15} {'process ms':>11}")
+        for build_all_tabs in (False, True):
+            results: List[Dict[str, float]] = list()
+            for _ in range(0, repeats):
+                open(log_file, "w").close()
+                results.append(launch_app(log_file, build_all_tabs))
+
+            best: Dict[str, float] = {name: min(r[name] for r in results) for name in results[0].keys()}
+            print(f"{'all' if build_all_tabs else 'lazy':>8} {best['import'] * 1000:>10.1f} "
+                  f"{best['window'] * 1000:>10.1f} {best['first_frame'] * 1000:>15.1f} "
+                  f"{best['process'] * 1000:>11.1f}")
@@ -0,0 +1,66 @@
+import timeit
+from typing import Dict, List
+
+import numpy as np
+
+from Benchmarks.SyntheticLog import make_frame_lines
+from Src.FrameBlock import FrameBlock
+from Src.FrameParser import parse_frame_block
+from Src.FrameStore import FrameStore
+from Src.FrameView import FrameView
+from Src.PathTable import path_table
+from Src.SampleStatistics import SampleStatistics
+from Src.StatisticsAggregation import aggregate_frame_range, aggregate_frames
+
+
+def make_frame_store(num_frames: int, num_samples: int, num_variants: int = 16) -> FrameStore:
+    # A few distinct frames repeated, so building the store doesn't dominate the benchmark.
+    frame_blocks: List[FrameBlock] = [parse_frame_block(make_frame_lines(num_samples, seed=seed))
+                                      for seed in range(0, num_variants)]
+
+    frame_store: FrameStore = FrameStore()
+    for i in range(0, num_frames):
+        frame_store.append(frame_blocks[i % num_variants])
+
+    return frame_store
+
+
+def aggregate_per_sample(frame_store: FrameStore, start_frame_idx: int,
+                         stop_frame_idx: int) -> Dict[int, SampleStatistics]:
+    # One sample at a time, the way statistics were accumulated from FrameInfo.samples.
+    statistics: Dict[int, SampleStatistics] = dict()
+    for frame_idx in range(start_frame_idx, stop_frame_idx):
+        frame_view: FrameView = frame_store.get_frame(frame_idx)
+        for sample in frame_view.samples:
+            name_id: int = path_table.name_ids[sample.path_id]
+            if name_id not in statistics:
+                statistics[name_id] = SampleStatistics(path_table.unique_names[name_id])
+            statistics[name_id].add_statistic(sample.total_time_ms)
+
+    return statistics
+
+
+if __name__ == "__main__":
+    # Run from the UdonProfilerApp directory: python -m Benchmarks.StatisticsBenchmark
+    repeats: int = 5
+    num_samples: int = 50
+
+    frame_store: FrameStore = make_frame_store(100000, num_samples)
+
+    # Per-sample loop is far too slow for every frame, so time a slice and scale it up.
+    loop_frames: int = 2000
+    loop_time: float = min(timeit.repeat(lambda: aggregate_per_sample(frame_store, 0, loop_frames),
+                                         number=1, repeat=1))
+
+    print(f"{num_samples} samples per frame")
+    print(f"{'frames':>8} {'range ms':>10} {'selection ms':>13} {'per-sample ms (est.)':>21}")
+    for start, stop in ((2000, 2600), (0, 10000), (0, 100000)):
+        selection: np.ndarray = np.arange(start, stop)
+
+        range_time: float = min(timeit.repeat(lambda: aggregate_frame_range(frame_store, start, stop),
+                                              number=1, repeat=repeats))
+        selection_time: float = min(timeit.repeat(lambda: aggregate_frames(frame_store, selection),
+                                                  number=1, repeat=repeats))
+
+        print(f"{stop - start:>8} {range_time * 1000:>10.1f} {selection_time * 1000:>13.1f} "
+              f"{loop_time / loop_frames * (stop - start) * 1000:>21.0f}")
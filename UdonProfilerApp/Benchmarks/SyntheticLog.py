@@ -0,0 +1,46 @@
+import random
+from typing import List
+
+
+def make_frame_lines(num_samples: int, num_calls: int = 4, branching: int = 8, seed: int = 0) -> List[str]:
+    """
+    Builds sample lines in the format written by the Unity profiler package.
+    Samples form a tree under /UdonBehaviour with the given branching factor, encoded parents first.
+    :param num_samples: Number of sample lines, including the /UdonBehaviour root.
+    :param num_calls: Start/end time pairs per sample.
+    :param branching: Children per sample.
+    :param seed: Random seed for sample timings.
+    :return: Sample lines, each ending with a newline.
+    """
+
+    rng: random.Random = random.Random(seed)
+
+    path_names: List[str] = ["/UdonBehaviour"]
+    parent_path_names: List[str] = [""]
+    for i in range(1, num_samples):
+        parent: str = path_names[(i - 1) // branching]
+        path_names.append(f"{parent}/Sample{i}")
+        parent_path_names.append(parent)
+
+    lines: List[str] = list()
+    for path_name, parent_path_name in zip(path_names, parent_path_names):
+        start_times: List[float] = sorted(rng.uniform(0, 16) for _ in range(num_calls))
+        end_times: List[float] = [t + rng.uniform(0, 0.5) for t in start_times]
+        total_time_ms: float = sum(e - s for s, e in zip(start_times, end_times))
+        lines.append(
+            f"{path_name};{parent_path_name};{rng.uniform(0, 100):.2f};{rng.uniform(0, 100):.2f};{num_calls};"
+            f"{total_time_ms:.4f};{rng.uniform(0, total_time_ms):.4f};"
+            + ",".join(f"{t:.4f}" for t in start_times) + ";"
+            + ",".join(f"{t:.4f}" for t in end_times) + "\n"
+        )
+
+    return lines
+
+
+def make_frame_block(num_samples: int, num_calls: int = 4, branching: int = 8, seed: int = 0) -> str:
+    """
+    Builds a complete frame block, as it appears in the Unity log.
+    """
+
+    return "##FRAME_INFO_BEGIN##\n" + "".join(make_frame_lines(num_samples, num_calls, branching, seed)) + \
+           "##FRAME_INFO_END##\n"
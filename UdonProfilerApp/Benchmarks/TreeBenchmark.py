@@ -0,0 +1,92 @@
+import timeit
+from typing import Hashable, List, Tuple, Union
+
+from Widgets.Tree.TreeNode import TreeNode
+from Widgets.Tree.TreeEntryConfig import TreeEntryConfig
+from Widgets.Tree.TreeDataStructure import TreeDataStructure
+
+
+def make_entries(num_entries: int, branching: int = 8) -> List[Tuple[Hashable, Union[Hashable, None]]]:
+    """
+    :return: (name, parent name) of every entry, parents before children, as a profiled frame would list them.
+    """
+
+    entries: List[Tuple[Hashable, Union[Hashable, None]]] = [(0, None)]
+    for i in range(1, num_entries):
+        entries.append((i, (i - 1) // branching))
+
+    return entries
+
+
+def make_node(name: Hashable) -> TreeNode:
+    return TreeNode(config=TreeEntryConfig(name, 0, [str(name)], lambda e, s: None, lambda e, s: None))
+
+
+def build_by_walking(entries: List[Tuple[Hashable, Union[Hashable, None]]]) -> TreeNode:
+    # Parent lookup used before the tree was indexed: a pre-order walk per insert.
+    root_node: TreeNode = TreeNode()
+    for name, parent_name in entries:
+        parent_node: TreeNode = root_node
+        if parent_name is not None:
+            for node in root_node:
+                if node.config and node.config.name == parent_name:
+                    parent_node = node
+                    break
+
+        parent_node.add_child(make_node(name))
+
+    return root_node
+
+
+def build_indexed(entries: List[Tuple[Hashable, Union[Hashable, None]]]) -> TreeDataStructure:
+    tree: TreeDataStructure = TreeDataStructure()
+    for name, parent_name in entries:
+        tree.add_node(make_node(name), parent_name)
+
+    return tree
+
+
+def update_indexed(tree: TreeDataStructure, entries: List[Tuple[Hashable, Union[Hashable, None]]]) -> None:
+    # What the statistics view does for every statistic on every frame.
+    for name, _ in entries:
+        if name in tree:
+            node: Union[TreeNode, None] = tree.get_node(name)
+            if node and node.config:
+                node.config.data = [str(name)]
+
+
+def build_statistics(num_entries: int) -> TreeDataStructure:
+    # Flat table of typed values, as the statistics view shows.
+    tree: TreeDataStructure = TreeDataStructure()
+    for i in range(0, num_entries):
+        tree.add_node(TreeNode(config=TreeEntryConfig(i, 0, [str(i), (i * 7919) % 1000 / 100],
+                                                      lambda e, s: None, lambda e, s: None)))
+
+    return tree
+
+
+if __name__ == "__main__":
+    # Run from the UdonProfilerApp directory: python -m Benchmarks.TreeBenchmark
+    # Only the tree data structure is measured, since entry widgets need a display.
+    repeats: int = 5
+
+    print(f"{'entries':>8} {'walk ms':>10} {'indexed ms':>11} {'us/entry':>9} {'update ms':>10} {'sort ms':>8}")
+    for num_entries in (1000, 2000, 5000, 10000):
+        entries: List[Tuple[Hashable, Union[Hashable, None]]] = make_entries(num_entries)
+
+        # Walking is quadratic, so skip it once it takes more than a few seconds.
+        walk_time: Union[float, None] = None
+        if num_entries <= 5000:
+            walk_time = min(timeit.repeat(lambda: build_by_walking(entries), number=1, repeat=1))
+
+        indexed_time: float = min(timeit.repeat(lambda: build_indexed(entries), number=1, repeat=repeats))
+
+        tree: TreeDataStructure = build_indexed(entries)
+        update_time: float = min(timeit.repeat(lambda: update_indexed(tree, entries), number=1, repeat=repeats))
+
+        statistics_tree: TreeDataStructure = build_statistics(num_entries)
+        sort_time: float = min(timeit.repeat(lambda: statistics_tree.sort(1), number=1, repeat=repeats))
+
+        walk_text: str = f"{walk_time * 1000:>10.1f}" if walk_time is not None else f"{'-':>10}"
+        print(f"{num_entries:>8} {walk_text} {indexed_time * 1000:>11.2f} "
+              f"{indexed_time / num_entries * 1e6:>9.2f} {update_time * 1000:>10.2f} {sort_time * 1000:>8.2f}")
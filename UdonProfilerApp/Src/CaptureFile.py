@@ -0,0 +1,182 @@
+from typing import BinaryIO, Callable, List, Tuple, Union
+
+import os
+import tempfile
+
+import numpy as np
+
+from Src.FrameStore import FrameStore
+from Src.PathTable import PathTable, path_table
+from Utils.SpillArray import SpillArray
+
+# Capture file layout (.udoncap). Header and path table are little-endian, records use FrameStore's native layout:
+#   header          capture_header_dtype
+#   path table      int32 parent index per path, then newline separated UTF-8 path names
+#   samples         FrameStore.sample_dtype records
+#   times           FrameStore.time_dtype records
+#   frame index     FrameStore.frame_dtype records, last so that frames can be written as they are recorded
+# Every section starts on an 8 byte boundary. Sections are memory-mapped on load, so opening a capture doesn't read
+# its frames, and any frame can be read in O(1) through the frame index.
+capture_extension: str = ".udoncap"
+capture_magic: bytes = b"UDONCAP"
+capture_version: int = 1
+section_alignment: int = 8
+
+capture_header_dtype: np.dtype = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("first_frame_number", "<u4"),
+    ("num_frames", "<u8"),
+    ("num_samples", "<u8"),
+    ("num_times", "<u8"),
+    ("num_paths", "<u8"),
+    ("path_table_offset", "<u8"),
+    ("path_table_size", "<u8"),
+    ("samples_offset", "<u8"),
+    ("times_offset", "<u8"),
+    ("frame_index_offset", "<u8"),
+])
+
+
+def align(offset: int) -> int:
+    return (offset + section_alignment - 1) // section_alignment * section_alignment
+
+
+def save_capture(frame_store: FrameStore, filename: str) -> None:
+    """
+    Writes all frames of a store to a capture file. Frames spilled to disk are copied without being read into memory
+    at once.
+    """
+
+    header: np.ndarray = np.zeros(1, dtype=capture_header_dtype)
+    header["magic"] = capture_magic
+    header["version"] = capture_version
+    header["first_frame_number"] = frame_store.first_frame_number
+    header["num_frames"] = len(frame_store.frames)
+    header["num_samples"] = len(frame_store.samples)
+    header["num_times"] = len(frame_store.times)
+
+    # Path table is shared between stores and only ever grows, so it covers every path id in the store.
+    table: PathTable = frame_store.path_table
+    num_paths: int = len(table)
+    parent_ids: np.ndarray = np.array(table.parent_ids[:num_paths], dtype="<i4")
+    path_names: bytes = "\n".join(table.path_names[:num_paths]).encode("utf-8")
+    header["num_paths"] = num_paths
+
+    # Frames of the store may be memory-mapped from the file being written, e.g. when saving a loaded capture onto
+    # itself, so the capture is written to a temporary file and only replaces the old file once it's complete. The
+    # old file stays mapped until it's closed.
+    fd, temp_filename = tempfile.mkstemp(prefix=".udonprofiler-", suffix=capture_extension,
+                                         dir=os.path.dirname(os.path.abspath(filename)))
+    try:
+        with os.fdopen(fd, "wb") as capture:
+            # Header is rewritten once the section offsets are known.
+            capture.write(header.tobytes())
+
+            header["path_table_offset"] = write_section(capture, parent_ids.tobytes() + path_names)
+            header["path_table_size"] = capture.tell() - int(header["path_table_offset"][0])
+            header["samples_offset"] = write_section(capture, frame_store.write_samples_to)
+            header["times_offset"] = write_section(capture, frame_store.times)
+            header["frame_index_offset"] = write_section(capture, frame_store.frames)
+
+            capture.seek(0)
+            capture.write(header.tobytes())
+
+        os.replace(temp_filename, filename)
+    except BaseException:
+        os.remove(temp_filename)
+        raise
+
+
+def write_section(capture: BinaryIO, data: Union[bytes, SpillArray, Callable[[BinaryIO], None]]) -> int:
+    """
+    :param data: Section contents, or a function that writes them to the capture.
+    :return: Offset of the section.
+    """
+
+    offset: int = align(capture.tell())
+    capture.write(b"\0" * (offset - capture.tell()))
+    if isinstance(data, SpillArray):
+        data.write_to(capture)
+    elif callable(data):
+        data(capture)
+    else:
+        capture.write(data)
+
+    return offset
+
+
+def load_capture(filename: str) -> FrameStore:
+    """
+    Opens a capture file as a frame store. Frame, sample and time records stay memory-mapped.
+    """
+
+    header: np.ndarray = np.fromfile(filename, dtype=capture_header_dtype, count=1)
+    if len(header) != 1 or header["magic"][0] != capture_magic:
+        raise ValueError(f"can't load capture {filename} - not a capture file")
+
+    if header["version"][0] != capture_version:
+        raise ValueError(f"can't load capture {filename} - unsupported version", int(header["version"][0]))
+
+    check_sections(filename, header)
+
+    num_paths: int = int(header["num_paths"][0])
+    path_table_offset: int = int(header["path_table_offset"][0])
+    path_table_section: np.ndarray = np.fromfile(filename, dtype=np.uint8, count=int(header["path_table_size"][0]),
+                                                 offset=path_table_offset)
+    parent_ids: np.ndarray = path_table_section[:num_paths * 4].view("<i4")
+    path_names: List[str] = list()
+    if num_paths > 0:
+        path_names = path_table_section[num_paths * 4:].tobytes().decode("utf-8").split("\n")
+
+    # Parents come before their children, so a parent index past the path itself means the table is corrupt.
+    if (len(parent_ids) != num_paths or len(path_names) != num_paths
+            or np.any((parent_ids < PathTable.no_parent_id) | (parent_ids >= np.arange(num_paths)))):
+        raise ValueError(f"can't load capture {filename} - corrupt path table")
+
+    # Paths are stored parents first, so interning in order resolves every parent.
+    path_ids: np.ndarray = np.empty(num_paths, dtype=np.int32)
+    for i, path_name in enumerate(path_names):
+        parent_path_name: str = ""
+        if parent_ids[i] != PathTable.no_parent_id:
+            parent_path_name = path_names[parent_ids[i]]
+        path_ids[i] = path_table.intern(path_name, parent_path_name)
+
+    frames: np.ndarray = map_section(filename, FrameStore.frame_dtype, header, "frame_index_offset", "num_frames")
+    samples: np.ndarray = map_section(filename, FrameStore.sample_dtype, header, "samples_offset", "num_samples")
+    times: np.ndarray = map_section(filename, FrameStore.time_dtype, header, "times_offset", "num_times")
+
+    # Capture ids only match the shared path table if it was empty or came from the same session. Otherwise they're
+    # translated as samples are read, so opening a capture never reads its samples.
+    path_id_map: Union[np.ndarray, None] = None
+    if not np.array_equal(path_ids, np.arange(num_paths)):
+        path_id_map = path_ids
+
+    return FrameStore(int(header["first_frame_number"][0]), frames, samples, times, path_id_map)
+
+
+def check_sections(filename: str, header: np.ndarray) -> None:
+    """
+    :raises ValueError: If a section doesn't fit in the file, e.g. because the file was truncated.
+    """
+
+    file_size: int = os.path.getsize(filename)
+    sections: List[Tuple[str, int, int]] = [
+        ("path table", int(header["path_table_offset"][0]), int(header["path_table_size"][0])),
+        ("samples", int(header["samples_offset"][0]), int(header["num_samples"][0]) * FrameStore.sample_dtype.itemsize),
+        ("times", int(header["times_offset"][0]), int(header["num_times"][0]) * FrameStore.time_dtype.itemsize),
+        ("frame index", int(header["frame_index_offset"][0]),
+         int(header["num_frames"][0]) * FrameStore.frame_dtype.itemsize),
+    ]
+    for name, offset, size in sections:
+        if offset < capture_header_dtype.itemsize or offset + size > file_size:
+            raise ValueError(f"can't load capture {filename} - {name} section is past the end of the file")
+
+
+def map_section(filename: str, dtype: np.dtype, header: np.ndarray, offset_field: str, count_field: str) -> np.ndarray:
+    count: int = int(header[count_field][0])
+    if count == 0:
+        # NumPy can't map an empty range.
+        return np.empty(0, dtype=dtype)
+
+    return np.memmap(filename, dtype=dtype, mode="r", offset=int(header[offset_field][0]), shape=(count,))
@@ -0,0 +1,175 @@
+from typing import Any, Hashable, List, Set, Tuple, Union
+
+import customtkinter as ctk
+import numpy as np
+
+from Widgets.Tree.TreeWidget import TreeWidget, TreeColumnConfig
+from Widgets.Tree.TreeBody import TreeBody
+from Src.FrameComparison import compare_frame_ranges
+from Src.FrameStore import FrameStore
+from Src.PathTable import PathTable, path_table
+
+
+class ComparisonView(ctk.CTkFrame):
+    """
+    Per-path differences between two frames, or two frame ranges, e.g. before and after a world update.
+    Ranges are compared by their per-frame averages, so they don't need to be the same length.
+    """
+
+    def __init__(self, master, **kwargs) -> None:
+        super().__init__(master, **kwargs)
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=0)
+        self.grid_rowconfigure(1, weight=1)
+
+        # Frame numbers of the compared ranges, inclusive.
+        self.base_frame_range: Union[Tuple[int, int], None] = None
+        self.other_frame_range: Union[Tuple[int, int], None] = None
+
+        # Layout:
+        # Frames [first] - [last] vs [first] - [last] compare
+        self.range_frame: ctk.CTkFrame = ctk.CTkFrame(self, fg_color="transparent")
+        self.range_frame.grid(row=0, column=0, padx=5, pady=(5, 0), sticky="w")
+
+        self.range_lbl: ctk.CTkLabel = ctk.CTkLabel(self.range_frame, text="Frames")
+        self.range_lbl.grid(row=0, column=0, padx=(0, 5))
+
+        self.base_first_entry: ctk.CTkEntry = ctk.CTkEntry(self.range_frame, width=80, placeholder_text="first")
+        self.base_first_entry.grid(row=0, column=1)
+
+        self.base_separator_lbl: ctk.CTkLabel = ctk.CTkLabel(self.range_frame, text="-")
+        self.base_separator_lbl.grid(row=0, column=2, padx=5)
+
+        self.base_last_entry: ctk.CTkEntry = ctk.CTkEntry(self.range_frame, width=80, placeholder_text="last")
+        self.base_last_entry.grid(row=0, column=3)
+
+        self.versus_lbl: ctk.CTkLabel = ctk.CTkLabel(self.range_frame, text="vs")
+        self.versus_lbl.grid(row=0, column=4, padx=10)
+
+        self.other_first_entry: ctk.CTkEntry = ctk.CTkEntry(self.range_frame, width=80, placeholder_text="first")
+        self.other_first_entry.grid(row=0, column=5)
+
+        self.other_separator_lbl: ctk.CTkLabel = ctk.CTkLabel(self.range_frame, text="-")
+        self.other_separator_lbl.grid(row=0, column=6, padx=5)
+
+        self.other_last_entry: ctk.CTkEntry = ctk.CTkEntry(self.range_frame, width=80, placeholder_text="last")
+        self.other_last_entry.grid(row=0, column=7)
+
+        self.compare_btn: ctk.CTkButton = ctk.CTkButton(self.range_frame, text="compare", width=20,
+                                                        fg_color="transparent",
+                                                        hover=False,
+                                                        command=self.on_compare_btn_clicked)
+        self.compare_btn.grid(row=0, column=8, padx=(5, 0))
+
+        self.tree: TreeWidget = TreeWidget(self, virtualized=True, expand_all_btn=True)
+        self.tree.grid(row=1, column=0, sticky="nsew")
+
+        # Deltas are the compared frames minus the base frames, so slower samples have positive deltas.
+        cols_config: List[TreeColumnConfig] = list()
+        cols_config.append(TreeColumnConfig(name="Overview", minsize=150, weight=1))
+        cols_config.append(TreeColumnConfig(name="Base ms", minsize=100, weight=0, fmt="{:.2f}"))
+        cols_config.append(TreeColumnConfig(name="Time ms", minsize=100, weight=0, fmt="{:.2f}"))
+        cols_config.append(TreeColumnConfig(name="Δ Time ms", minsize=100, weight=0, fmt="{:+.2f}"))
+        cols_config.append(TreeColumnConfig(name="Base Self ms", minsize=100, weight=0, fmt="{:.2f}"))
+        cols_config.append(TreeColumnConfig(name="Self ms", minsize=100, weight=0, fmt="{:.2f}"))
+        cols_config.append(TreeColumnConfig(name="Δ Self ms", minsize=100, weight=0, fmt="{:+.2f}"))
+        cols_config.append(TreeColumnConfig(name="Base Calls", minsize=100, weight=0, fmt="{:.2f}"))
+        cols_config.append(TreeColumnConfig(name="Calls", minsize=100, weight=0, fmt="{:.2f}"))
+        cols_config.append(TreeColumnConfig(name="Δ Calls", minsize=100, weight=0, fmt="{:+.2f}"))
+
+        self.tree.config_tree(cols_config)
+        self.tree.render_tree()
+
+    def compare(self, base_frame_range: Tuple[int, int], other_frame_range: Tuple[int, int]) -> None:
+        """
+        Shows the per-path differences between two frame ranges.
+        :param base_frame_range: Numbers of the first and last frame compared against, inclusive.
+        :param other_frame_range: Numbers of the first and last frame compared, inclusive.
+        """
+
+        root: Any = self.winfo_toplevel()
+        frame_store: FrameStore = root.frame_store
+
+        self.base_frame_range = base_frame_range
+        self.other_frame_range = other_frame_range
+        comparison: np.ndarray = compare_frame_ranges(
+            frame_store,
+            (base_frame_range[0] - frame_store.first_frame_number,
+             base_frame_range[1] - frame_store.first_frame_number + 1),
+            (other_frame_range[0] - frame_store.first_frame_number,
+             other_frame_range[1] - frame_store.first_frame_number + 1))
+
+        self.show_comparison(comparison)
+
+    def show_comparison(self, comparison: np.ndarray) -> None:
+        # Different set of paths, so rebuild the tree instead of updating it. Tree keeps expand states.
+        sel_entry_name: Union[Hashable, None] = self.tree.get_selected_name()
+        self.tree.clear_tree()
+
+        # Paths are interned parents first, so in path id order every parent is added before its children.
+        path_ids: Set[int] = set(comparison["path_id"].tolist())
+        for record in comparison.tolist():
+            path_id: int = record[0]
+            parent_id: int = path_table.parent_ids[path_id]
+            parent_name: Hashable = TreeBody.root_name
+            if parent_id != PathTable.no_parent_id and parent_id in path_ids:
+                parent_name = parent_id
+
+            self.tree.add_entry(
+                path_id,
+                path_table.depths[path_id],
+                ComparisonView.get_item_data(path_table.names[path_id], record),
+                parent_name,
+                default_expand=self.tree.get_expand_states().get(path_id, False),
+                default_select=path_id == sel_entry_name
+            )
+
+        self.tree.render_tree()
+
+    @staticmethod
+    def get_item_data(name: str, record: Tuple[Any, ...]) -> List[Any]:
+        _, base_total_time, total_time, base_self_time, self_time, base_num_calls, num_calls = record
+        return [
+            name,
+            base_total_time,
+            total_time,
+            total_time - base_total_time,
+            base_self_time,
+            self_time,
+            self_time - base_self_time,
+            base_num_calls,
+            num_calls,
+            num_calls - base_num_calls
+        ]
+
+    @staticmethod
+    def get_frame_range(first_entry: ctk.CTkEntry, last_entry: ctk.CTkEntry) -> Tuple[int, int]:
+        """
+        :return: Numbers of the first and last frame entered. A single frame if the last frame is left empty.
+        :raises ValueError: If a frame number isn't a number.
+        """
+
+        first_frame_num: int = int(first_entry.get())
+        last_frame_num: int = int(last_entry.get()) if last_entry.get() else first_frame_num
+        if first_frame_num > last_frame_num:
+            first_frame_num, last_frame_num = last_frame_num, first_frame_num
+
+        return first_frame_num, last_frame_num
+
+    def on_compare_btn_clicked(self) -> None:
+        try:
+            base_frame_range: Tuple[int, int] = ComparisonView.get_frame_range(self.base_first_entry,
+                                                                               self.base_last_entry)
+            other_frame_range: Tuple[int, int] = ComparisonView.get_frame_range(self.other_first_entry,
+                                                                                self.other_last_entry)
+        except ValueError:
+            return
+
+        self.compare(base_frame_range, other_frame_range)
+
+    def on_frame_info_cleared(self) -> None:
+        self.base_frame_range = None
+        self.other_frame_range = None
+        self.tree.clear_tree()
+        self.tree.render_tree()
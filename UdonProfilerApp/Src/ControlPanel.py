@@ -1,7 +1,10 @@
-from typing import Any
+from typing import Any, Union
 
+from tkinter import filedialog
 import customtkinter as ctk
 
+from Src.CaptureFile import capture_extension
+
 
 class ControlPanel(ctk.CTkFrame):
     # See: https://en.wikipedia.org/wiki/Media_control_symbols
@@ -9,6 +12,8 @@ class ControlPanel(ctk.CTkFrame):
     back_sym: str = "\u23ea"
     forward_sym: str = "\u23e9"
     end_sym: str = "\u23ed"
+    prev_hitch_text: str = "\u25c2 hitch"
+    next_hitch_text: str = "hitch \u25b8"
     recording_color: str = "#EE4B2B"
     paused_color: str = "#FFFFFF"
 
@@ -20,9 +25,9 @@ class ControlPanel(ctk.CTkFrame):
         self.do_record: bool = False
         self.sel_frame: int = 0
 
-        self.grid_columnconfigure((0, 3), weight=0)
-        self.grid_columnconfigure(4, weight=1)
-        self.grid_columnconfigure(5, weight=0)
+        self.grid_columnconfigure((0, 5), weight=0)
+        self.grid_columnconfigure(6, weight=1)
+        self.grid_columnconfigure((7, 9), weight=0)
 
         self.record_btn: ctk.CTkButton = ctk.CTkButton(self, text=ControlPanel.record_sym, width=20,
                                                        text_color=ControlPanel.paused_color,
@@ -49,24 +54,56 @@ class ControlPanel(ctk.CTkFrame):
                                                           command=self.on_cur_frame_btn_clicked)
         self.cur_frame_btn.grid(row=0, column=3)
 
+        self.prev_hitch_btn: ctk.CTkButton = ctk.CTkButton(self, text=ControlPanel.prev_hitch_text, width=20,
+                                                           fg_color="transparent",
+                                                           hover=False,
+                                                           command=self.on_prev_hitch_btn_clicked)
+        self.prev_hitch_btn.grid(row=0, column=4, padx=(10, 0))
+
+        self.next_hitch_btn: ctk.CTkButton = ctk.CTkButton(self, text=ControlPanel.next_hitch_text, width=20,
+                                                           fg_color="transparent",
+                                                           hover=False,
+                                                           command=self.on_next_hitch_btn_clicked)
+        self.next_hitch_btn.grid(row=0, column=5)
+
         self.frame_details_label: ctk.CTkLabel = ctk.CTkLabel(self, text="Frame: -/-", width=150)
-        self.frame_details_label.grid(row=0, padx=5, column=4)
+        self.frame_details_label.grid(row=0, padx=5, column=6)
 
         self.clear_frames_btn: ctk.CTkButton = ctk.CTkButton(self, text="clear", width=20,
                                                              fg_color="transparent",
                                                              hover=False,
                                                              command=self.on_clear_frames_btn_clicked)
-        self.clear_frames_btn.grid(row=0, column=5)
+        self.clear_frames_btn.grid(row=0, column=7)
+
+        self.import_log_btn: ctk.CTkButton = ctk.CTkButton(self, text="open", width=20,
+                                                           fg_color="transparent",
+                                                           hover=False,
+                                                           command=self.on_import_log_btn_clicked)
+        self.import_log_btn.grid(row=0, column=8)
+
+        self.save_capture_btn: ctk.CTkButton = ctk.CTkButton(self, text="save", width=20,
+                                                             fg_color="transparent",
+                                                             hover=False,
+                                                             command=self.on_save_capture_btn_clicked)
+        self.save_capture_btn.grid(row=0, column=9)
+
+        # Only shown while a log is being imported.
+        self.import_progress_bar: ctk.CTkProgressBar = ctk.CTkProgressBar(self)
+        self.import_progress_bar.set(0)
 
         self.prev_frame_btn_enabled: bool = True
         self.next_frame_btn_enabled: bool = True
         self.cur_frame_btn_enabled: bool = True
+        self.prev_hitch_btn_enabled: bool = True
+        self.next_hitch_btn_enabled: bool = True
         self.clear_frames_btn_enabled: bool = True
 
         # Start with buttons disabled.
         self.disable_prev_frame_btn()
         self.disable_next_frame_btn()
         self.disable_cur_frame_btn()
+        self.disable_prev_hitch_btn()
+        self.disable_next_hitch_btn()
         self.disable_clear_frames_btn()
 
     def on_record_btn_clicked(self) -> None:
@@ -96,20 +133,81 @@ class ControlPanel(ctk.CTkFrame):
             self.set_frame_details(sel_frame, cur_frame)
             self.update_playback_btn_states(sel_frame, cur_frame)
 
+    def on_prev_hitch_btn_clicked(self) -> None:
+        frame_num: Union[int, None] = self.profiler.get_prev_hitch()
+        if frame_num is not None:
+            self.goto_frame(frame_num)
+
+    def on_next_hitch_btn_clicked(self) -> None:
+        frame_num: Union[int, None] = self.profiler.get_next_hitch()
+        if frame_num is not None:
+            self.goto_frame(frame_num)
+
+    def goto_frame(self, frame_num: int) -> None:
+        """
+        Selects a frame found elsewhere, e.g. a hitch or a query match.
+        :param frame_num: Index of the frame.
+        """
+
+        sel_frame, cur_frame = self.profiler.goto_frame(frame_num)
+        self.set_frame_details(sel_frame, cur_frame)
+        self.update_playback_btn_states(sel_frame, cur_frame)
+
     def on_frame_selected_from_chart(self, frame_num: int) -> None:
         sel_frame, cur_frame = self.profiler.goto_frame(frame_num)
         self.set_frame_details(sel_frame, cur_frame)
+        self.update_playback_btn_states(sel_frame, cur_frame)
 
         # Pause frame chart animation.
-        self.do_record = False
-        self.record_btn.configure(text_color=ControlPanel.paused_color)
-        self.profiler.pause()
+        self.stop_recording()
 
     def on_clear_frames_btn_clicked(self) -> None:
         self.profiler.clear_frames()
         self.set_frame_details(0, 0)
         self.update_playback_btn_states(0, 0)
 
+    def on_import_log_btn_clicked(self) -> None:
+        filename: str = filedialog.askopenfilename(title="Open log or capture",
+                                                   filetypes=[("Log files and captures",
+                                                               f"*.log *.txt *{capture_extension}"),
+                                                              ("All files", "*")])
+        if not filename:
+            return
+
+        if filename.endswith(capture_extension):
+            self.profiler.load_capture(filename)
+        else:
+            self.profiler.import_log(filename)
+
+    def on_save_capture_btn_clicked(self) -> None:
+        filename: str = filedialog.asksaveasfilename(title="Save capture",
+                                                     defaultextension=capture_extension,
+                                                     filetypes=[("Captures", f"*{capture_extension}")])
+        if filename:
+            self.profiler.save_capture(filename)
+
+    def stop_recording(self) -> None:
+        self.do_record = False
+        self.record_btn.configure(text_color=ControlPanel.paused_color)
+        self.profiler.pause()
+
+    def set_import_progress(self, num_parsed: int, num_total: int) -> None:
+        if not self.import_progress_bar.winfo_ismapped():
+            self.import_progress_bar.grid(row=1, column=0, columnspan=10, padx=5, pady=(0, 5), sticky="ew")
+            self.import_log_btn.configure(state="disabled")
+
+        if num_total > 0:
+            self.import_progress_bar.set(num_parsed / num_total)
+            self.frame_details_label.configure(text=f"Importing: {num_parsed}/{num_total}")
+        else:
+            self.frame_details_label.configure(text="Importing...")
+
+    def on_import_finished(self) -> None:
+        self.import_progress_bar.grid_remove()
+        self.import_progress_bar.set(0)
+        self.import_log_btn.configure(state="normal")
+        self.set_frame_details(0, 0)
+
     def on_cur_frame_num_changed(self, cur_frame: int) -> None:
         if cur_frame == self.sel_frame:
             return
@@ -149,6 +247,19 @@ class ControlPanel(ctk.CTkFrame):
         else:
             self.enable_clear_frames_btn()
 
+        self.update_hitch_btn_states()
+
+    def update_hitch_btn_states(self) -> None:
+        if self.profiler.get_prev_hitch() is None:
+            self.disable_prev_hitch_btn()
+        else:
+            self.enable_prev_hitch_btn()
+
+        if self.profiler.get_next_hitch() is None:
+            self.disable_next_hitch_btn()
+        else:
+            self.enable_next_hitch_btn()
+
     def disable_prev_frame_btn(self) -> None:
         if self.prev_frame_btn_enabled:
             self.prev_frame_btn.configure(state="disabled")
@@ -179,6 +290,26 @@ class ControlPanel(ctk.CTkFrame):
             self.cur_frame_btn.configure(state="normal")
             self.cur_frame_btn_enabled = True
 
+    def disable_prev_hitch_btn(self) -> None:
+        if self.prev_hitch_btn_enabled:
+            self.prev_hitch_btn.configure(state="disabled")
+            self.prev_hitch_btn_enabled = False
+
+    def enable_prev_hitch_btn(self) -> None:
+        if not self.prev_hitch_btn_enabled:
+            self.prev_hitch_btn.configure(state="normal")
+            self.prev_hitch_btn_enabled = True
+
+    def disable_next_hitch_btn(self) -> None:
+        if self.next_hitch_btn_enabled:
+            self.next_hitch_btn.configure(state="disabled")
+            self.next_hitch_btn_enabled = False
+
+    def enable_next_hitch_btn(self) -> None:
+        if not self.next_hitch_btn_enabled:
+            self.next_hitch_btn.configure(state="normal")
+            self.next_hitch_btn_enabled = True
+
     def disable_clear_frames_btn(self) -> None:
         if self.clear_frames_btn_enabled:
             self.clear_frames_btn.configure(state="disabled")
@@ -1,12 +1,25 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Union
+
 import customtkinter as ctk
 
 from Src.HierarchyView import HierarchyView
-from Src.TimelineView import TimelineView
 from Src.StatisticsView import StatisticsView
-from Src.FrameInfo import FrameInfo
+from Src.FrameView import FrameView
+from Src.FrameStore import FrameStore
+
+if TYPE_CHECKING:
+    from Src.ComparisonView import ComparisonView
+    from Src.TimelineView import TimelineView
 
 
 class DetailsPanel(ctk.CTkFrame):
+    hierarchy_tab_name: str = "Hierarchy View"
+    timeline_tab_name: str = "Timeline View"
+    statistics_tab_name: str = "Statistics View"
+    comparison_tab_name: str = "Comparison View"
+
     def __init__(self, master) -> None:
         super().__init__(master)
 
@@ -18,40 +31,92 @@ class DetailsPanel(ctk.CTkFrame):
         self.title: ctk.CTkLabel = ctk.CTkLabel(self, text=title, fg_color="gray30", corner_radius=6)
         self.title.grid(row=0, column=0, sticky="ew")
 
-        self.tabview: ctk.CTkTabview = ctk.CTkTabview(self)
+        self.tabview: ctk.CTkTabview = ctk.CTkTabview(self, command=self.on_tab_changed)
         self.tabview.grid(row=1, column=0, sticky="nsew")
 
-        self.hierarchy_tabview: ctk.CTkFrame = self.tabview.add("Hierarchy View")
+        self.hierarchy_tabview: ctk.CTkFrame = self.tabview.add(DetailsPanel.hierarchy_tab_name)
         self.hierarchy_tabview.grid_columnconfigure(0, weight=1)
         self.hierarchy_tabview.grid_rowconfigure(0, weight=1)
 
-        self.timeline_tabview: ctk.CTkFrame = self.tabview.add("Timeline View")
+        self.timeline_tabview: ctk.CTkFrame = self.tabview.add(DetailsPanel.timeline_tab_name)
         self.timeline_tabview.grid_columnconfigure(0, weight=1)
         self.timeline_tabview.grid_rowconfigure(0, weight=1)
 
-        self.statistics_tabview: ctk.CTkFrame = self.tabview.add("Statistics View")
+        self.statistics_tabview: ctk.CTkFrame = self.tabview.add(DetailsPanel.statistics_tab_name)
         self.statistics_tabview.grid_columnconfigure(0, weight=1)
         self.statistics_tabview.grid_rowconfigure(0, weight=1)
 
-        self.tabview.set("Hierarchy View")
+        self.comparison_tabview: ctk.CTkFrame = self.tabview.add(DetailsPanel.comparison_tab_name)
+        self.comparison_tabview.grid_columnconfigure(0, weight=1)
+        self.comparison_tabview.grid_rowconfigure(0, weight=1)
+
+        self.tabview.set(DetailsPanel.hierarchy_tab_name)
 
         self.hierarchy_view: HierarchyView = HierarchyView(master=self.hierarchy_tabview)
         self.hierarchy_view.grid(row=0, column=0, sticky="nsew")
 
-        self.timeline_view: TimelineView = TimelineView(master=self.timeline_tabview)
+        # Timeline, statistics and comparison views are built the first time their tab is shown, which keeps their
+        # widgets (and matplotlib) out of startup.
+        self.timeline_view: Union[TimelineView, None] = None
+        self.statistics_view: Union[StatisticsView, None] = None
+        self.comparison_view: Union[ComparisonView, None] = None
+
+        # Shown by the timeline view once it's built.
+        self.sel_frame_info: Union[FrameView, None] = None
+
+    def on_tab_changed(self) -> None:
+        tab_name: str = self.tabview.get()
+        if tab_name == DetailsPanel.timeline_tab_name and self.timeline_view is None:
+            self.build_timeline_view()
+        elif tab_name == DetailsPanel.statistics_tab_name and self.statistics_view is None:
+            self.build_statistics_view()
+        elif tab_name == DetailsPanel.comparison_tab_name and self.comparison_view is None:
+            self.build_comparison_view()
+
+    def build_timeline_view(self) -> None:
+        # Imported here, since the timeline plot imports matplotlib.
+        from Src.TimelineView import TimelineView
+
+        self.timeline_view = TimelineView(master=self.timeline_tabview)
         self.timeline_view.grid(row=0, column=0, stick="nsew")
 
-        self.statistics_view: StatisticsView = StatisticsView(master=self.statistics_tabview)
+        if self.sel_frame_info:
+            self.timeline_view.on_frame_info_received(self.sel_frame_info)
+
+    def build_statistics_view(self) -> None:
+        self.statistics_view = StatisticsView(master=self.statistics_tabview)
+        # Catches up on every frame recorded so far on its first refresh.
         self.statistics_view.grid(row=0, column=0, sticky="nsew")
 
-    def on_frame_info_received(self, frame_info: FrameInfo, selected: bool = False) -> None:
-        if selected:
-            self.hierarchy_view.on_frame_info_received(frame_info)
+    def build_comparison_view(self) -> None:
+        from Src.ComparisonView import ComparisonView
+
+        self.comparison_view = ComparisonView(master=self.comparison_tabview)
+        self.comparison_view.grid(row=0, column=0, sticky="nsew")
+
+    def on_frame_info_received(self, frame_info: FrameView, selected: bool = False) -> None:
+        # Statistics view reads new frames from the frame store on its own refresh timer, so only the selected frame
+        # is shown here.
+        if not selected:
+            return
+
+        self.sel_frame_info = frame_info
+        self.hierarchy_view.on_frame_info_received(frame_info)
+        if self.timeline_view:
             self.timeline_view.on_frame_info_received(frame_info)
 
-        self.statistics_view.on_frame_info_received(frame_info)
+    def on_frames_imported(self, frame_store: FrameStore, first_frame_idx: int) -> None:
+        # Selected frame is shown separately, through on_frame_info_received.
+        if self.statistics_view:
+            self.statistics_view.on_frames_imported(frame_store, first_frame_idx)
 
     def on_frame_info_cleared(self) -> None:
+        self.sel_frame_info = None
+
         self.hierarchy_view.on_frame_info_cleared()
-        self.timeline_view.on_frame_info_cleared()
-        self.statistics_view.on_frame_info_cleared()
+        if self.timeline_view:
+            self.timeline_view.on_frame_info_cleared()
+        if self.statistics_view:
+            self.statistics_view.on_frame_info_cleared()
+        if self.comparison_view:
+            self.comparison_view.on_frame_info_cleared()
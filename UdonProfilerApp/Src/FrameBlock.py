@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class FrameBlock:
+    """
+    Columnar parse result for a single frame block.
+    Samples use FrameStore.sample_dtype with time offsets relative to this block's times array.
+    """
+
+    frame_time: float
+    max_depth: int
+    samples: np.ndarray
+    times: np.ndarray
+
+    def __init__(self, frame_time: float, max_depth: int, samples: np.ndarray, times: np.ndarray) -> None:
+        self.frame_time = frame_time
+        self.max_depth = max_depth
+        self.samples = samples
+        self.times = times
+
+    def __len__(self) -> int:
+        return len(self.samples)
@@ -1,33 +1,58 @@
-from collections import deque
-from typing import Any, Dict, Iterable, List, Tuple
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Tuple, TYPE_CHECKING
 
 import customtkinter as ctk
 import numpy as np
 
-from Widgets.AnimatedLinePlot.AnimatedLinePlotWidget import AnimatedLinePlotWidget
-from Src.FrameInfo import FrameInfo
+from Src.FrameView import FrameView
+from Utils.MinMaxPyramid import MinMaxPyramid
+
+if TYPE_CHECKING:
+    from Src.FrameStore import FrameStore
+    from Widgets.AnimatedLinePlot.AnimatedLinePlotWidget import AnimatedLinePlotWidget
 
 
 class FrameChart(ctk.CTkFrame):
+    """
+    Frame times of the whole recording. Shows the latest frames until it's zoomed (mouse wheel), scrolled or clicked.
+    Frame times are kept in a min/max pyramid, so any zoom level is drawn with about one point per pixel, and frame
+    time spikes stay visible however far it's zoomed out.
+    """
+
+    # Frames shown at startup, and the narrowest zoom.
+    default_view_frames: int = 300
+    min_view_frames: int = 10
+    # Change of the frames shown per mouse wheel step.
+    zoom_factor: float = 1.25
+
     def __init__(self, master) -> None:
         super().__init__(master)
 
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=0)
         self.grid_rowconfigure(1, weight=1)
+        self.grid_rowconfigure(2, weight=0)
 
         title: str = "Frame Chart"
         self.title = ctk.CTkLabel(self, text=title, fg_color="gray30", corner_radius=6)
         self.title.grid(row=0, column=0, sticky="ew")
 
+        # Frame index of the selected frame.
         self.sel_frame: int = -1
 
-        # See: https://stackoverflow.com/a/65135081
-        self.data: deque = deque([], maxlen=300)
-        for i in range(0, 300):
-            self.data.append(0)
+        self.frame_times: MinMaxPyramid = MinMaxPyramid()
+        self.first_frame_number: int = -1
 
-        self.frame_slice: Tuple[int, int] = (-1, -1)
+        # Frames in view. View follows the latest frame until it's moved.
+        self.view_start: float = 0
+        self.view_frames: float = FrameChart.default_view_frames
+        self.follow_latest: bool = True
+        # Pyramid level drawn last, so that clicks map to the block under the mouse.
+        self.view_level: int = 0
+
+        # Imported here so that matplotlib is only loaded once the chart is created, not when the app is imported.
+        from Widgets.AnimatedLinePlot.AnimatedLinePlotWidget import AnimatedLinePlotWidget
 
         self.graph: AnimatedLinePlotWidget = AnimatedLinePlotWidget(
             self,
@@ -35,49 +60,72 @@ class FrameChart(ctk.CTkFrame):
             animate_cb=self.on_animate,
             mouse_motion_cb=lambda event: self.on_mouse_moved(event),
             mouse_press_cb=lambda event: self.on_mouse_clicked(event),
+            mouse_scroll_cb=lambda event, step: self.on_mouse_scrolled(event, step),
             animation_interval=25,
-            x_range=(0, 300),
-            y_range=(0, 70),
-            max_points=300
+            x_range=(0, FrameChart.default_view_frames),
+            y_range=(0, 70)
         )
         self.graph.grid(row=1, column=0, sticky="nsew")
 
+        self.scrollbar: ctk.CTkScrollbar = ctk.CTkScrollbar(self, orientation="horizontal",
+                                                            command=self.on_scrollbar_moved)
+        self.scrollbar.grid(row=2, column=0, sticky="ew")
+
         param_dict: Dict[str, Any] = dict()
         # param_dict["linestyle"] = "--"
-        self.graph.add_line("frame time", np.arange(0, 300, 1), [0] * 300, param_dict=param_dict)
+        self.graph.add_line("frame time", np.zeros(1), np.zeros(1), param_dict=param_dict)
+        self.graph.fill_line("frame time", 0, 0.5)
+
+        # Labels stay at the left edge of the chart wherever it's scrolled to.
+        text_params: Dict[str, Any] = dict()
+        text_params["transform"] = self.graph.axes.get_yaxis_transform()
 
         self.graph.add_line("1ms line", y_data=1)
-        self.graph.add_text("1ms text", (0, 2), "1ms (1000FPS)")
+        self.graph.add_text("1ms text", (0.005, 2), "1ms (1000FPS)", text_params)
 
         self.graph.add_line("4ms line", y_data=4)
-        self.graph.add_text("4ms text", (0, 5), "4ms (250FPS)")
+        self.graph.add_text("4ms text", (0.005, 5), "4ms (250FPS)", text_params)
 
         self.graph.add_line("5ms line", y_data=5)
-        self.graph.add_text("5ms text", (0, 6), "5ms (200FPS)")
+        self.graph.add_text("5ms text", (0.005, 6), "5ms (200FPS)", text_params)
 
         self.graph.add_line("10ms line", y_data=10)
-        self.graph.add_text("10ms text", (0, 11), "10ms (100FPS)")
+        self.graph.add_text("10ms text", (0.005, 11), "10ms (100FPS)", text_params)
 
         self.graph.add_line("16ms line", y_data=16)
-        self.graph.add_text("16ms text", (0, 17), "16ms (60FPS)")
+        self.graph.add_text("16ms text", (0.005, 17), "16ms (60FPS)", text_params)
 
         self.graph.add_line("22ms line", y_data=22)
-        self.graph.add_text("22ms text", (0, 23), "22ms (45FPS)")
+        self.graph.add_text("22ms text", (0.005, 23), "22ms (45FPS)", text_params)
 
         self.graph.add_line("33ms line", y_data=33)
-        self.graph.add_text("33ms text", (0, 34), "33ms (30FPS)")
+        self.graph.add_text("33ms text", (0.005, 34), "33ms (30FPS)", text_params)
 
         self.graph.add_line("66ms line", y_data=66)
-        self.graph.add_text("66ms text", (0, 67), "66ms (15FPS)")
+        self.graph.add_text("66ms text", (0.005, 67), "66ms (15FPS)", text_params)
 
         self.graph.add_line("selected frame", x_data=self.sel_frame)
 
     def on_animate(self) -> Iterable[str]:
-        self.graph.update_line("frame time", y_data=list(self.data))
+        view_start, view_stop = self.get_view_range()
+
+        # One block per pixel at most. Each block is drawn as a vertical stroke from its minimum to its maximum.
+        max_blocks: int = max(1, int(self.graph.axes.bbox.width))
+        level, block_starts, block_mins, block_maxs = self.frame_times.get_range(view_start, view_stop, max_blocks)
+        self.view_level = level
+
+        x_data: np.ndarray = np.zeros(1)
+        y_data: np.ndarray = np.zeros(1)
+        if len(block_starts) > 0:
+            x_data = np.repeat(block_starts + ((1 << level) - 1) / 2, 2)
+            y_data = np.column_stack((block_mins, block_maxs)).ravel()
+
+        self.graph.update_line("frame time", x_data=x_data, y_data=y_data)
         self.graph.update_line("selected frame", x_data=self.sel_frame)
-        self.graph.fill_line("frame time", 0, 0.5)
-        y_max: float = max(self.data) + 2
-        self.graph.update_plot_range(y_range=(0, y_max))
+        y_max: float = float(y_data.max()) + 2
+        self.graph.update_plot_range(x_range=(view_stop - self.view_frames - 0.5, view_stop - 0.5),
+                                     y_range=(0, y_max))
+        self.update_scrollbar(view_start, view_stop)
 
         updated_items: List[str] = list()
         updated_items.append("frame time")
@@ -128,44 +176,112 @@ class FrameChart(ctk.CTkFrame):
 
         return iter(updated_items)
 
+    def get_view_range(self) -> Tuple[int, int]:
+        """
+        :return: First and one past the last frame index in view.
+        """
+
+        num_frames: int = len(self.frame_times)
+        view_frames: int = int(np.ceil(self.view_frames))
+        if self.follow_latest:
+            return max(0, num_frames - view_frames), num_frames
+
+        view_start: int = int(np.clip(np.floor(self.view_start), 0, max(0, num_frames - view_frames)))
+        return view_start, min(view_start + view_frames, num_frames)
+
+    def set_view(self, view_start: float, view_frames: float) -> None:
+        num_frames: int = len(self.frame_times)
+        self.view_frames = float(np.clip(view_frames, FrameChart.min_view_frames,
+                                         max(FrameChart.default_view_frames, num_frames)))
+        self.view_start = float(np.clip(view_start, 0, max(0, num_frames - self.view_frames)))
+        # Moving the view to the end follows the latest frame again.
+        self.follow_latest = self.view_start + self.view_frames >= num_frames
+        self.graph.request_update()
+
+    def update_scrollbar(self, view_start: int, view_stop: int) -> None:
+        num_frames: int = len(self.frame_times)
+        if num_frames == 0:
+            self.scrollbar.set(0, 1)
+            return
+
+        self.scrollbar.set(view_start / num_frames, view_stop / num_frames)
+
+    def find_frame(self, x: float) -> int:
+        """
+        :return: Index of the frame drawn at x. If x is in a block of several frames, the block's slowest frame.
+        """
+
+        frame_idx: int = int(np.clip(round(x), 0, len(self.frame_times) - 1))
+        return self.frame_times.find_max(self.view_level, frame_idx >> self.view_level)
+
     def on_mouse_moved(self, coord: Tuple[float, float]) -> None:
         pass
 
     def on_mouse_clicked(self, coord: Tuple[float, float]) -> None:
-        # Range = [0, 299].
-        frame_offset: int = int(coord[0])
-
-        # Always update selected frame so that the chart displays vertical bar on mouse click position.
-        self.sel_frame = frame_offset
-
-        if self.frame_slice[1] is -1:
+        # Clicks outside the plot have no data coordinates.
+        if coord[0] is None or len(self.frame_times) == 0:
             return
 
-        # Chart is half-full.
-        if self.frame_slice[1] < 299:
-            # Selection made before chart start position.
-            if frame_offset < 299 - self.frame_slice[1]:
-                return
+        # Selected frame stays in view.
+        view_start, view_stop = self.get_view_range()
+        self.view_start = view_start
+        self.follow_latest = False
 
-            frame_offset = abs((299 - self.frame_slice[1]) - frame_offset)
+        # Always update selected frame so that the chart displays vertical bar on mouse click position.
+        self.sel_frame = self.find_frame(coord[0])
+        self.graph.request_update()
 
         root: Any = self.winfo_toplevel()
-        frame_num: int = self.frame_slice[0] + frame_offset
-        root.control_panel.on_frame_selected_from_chart(frame_num)
+        root.control_panel.on_frame_selected_from_chart(self.sel_frame)
+
+    def on_mouse_scrolled(self, coord: Tuple[float, float], step: float) -> None:
+        # Zooms around the mouse, so the frame under it stays where it is.
+        view_start, view_stop = self.get_view_range()
+        anchor: float = coord[0] if coord[0] is not None else (view_start + view_stop) / 2
+        view_frames: float = self.view_frames * FrameChart.zoom_factor ** -step
+        view_start = view_stop - self.view_frames
+        self.set_view(anchor - (anchor - view_start) * view_frames / self.view_frames, view_frames)
+
+    def on_scrollbar_moved(self, *args) -> None:
+        # See: https://tkdocs.com/shipman/scrollbar-callback.html
+        if args[0] == "moveto":
+            self.set_view(float(args[1]) * len(self.frame_times), self.view_frames)
+        elif args[0] == "scroll":
+            step: float = float(args[1]) * self.view_frames / 10
+            if args[2] == "pages":
+                step = float(args[1]) * self.view_frames
+            self.set_view(self.get_view_range()[0] + step, self.view_frames)
+
+    def on_frame_info_received(self, frame_info: FrameView, selected: bool = False) -> None:
+        if selected:
+            self.sel_frame = frame_info.frame_number - self.first_frame_number
+
+            # Scrolls to frames selected elsewhere, e.g. with the playback buttons.
+            view_start, view_stop = self.get_view_range()
+            if not view_start <= self.sel_frame < view_stop:
+                self.set_view(self.sel_frame - self.view_frames / 2, self.view_frames)
+        else:
+            if len(self.frame_times) == 0:
+                self.first_frame_number = frame_info.frame_number
+            self.frame_times.append(frame_info.frame_time)
+
+        self.graph.request_update()
+
+    def on_frames_imported(self, frame_store: FrameStore, first_frame_idx: int) -> None:
+        if len(self.frame_times) == 0:
+            self.first_frame_number = frame_store.get_frame_number(first_frame_idx)
 
-    def on_frame_info_received(self, frame_info: FrameInfo, selected: bool = False) -> None:
-        # Don't update graph when selecting individual frames. Prevents frame shifting on click.
-        if not selected:
-            self.data.append(frame_info.frame_time)
-            self.frame_slice = (max(frame_info.frame_number - min(self.frame_slice[1], 299), 0),
-                                frame_info.frame_number)
+        self.frame_times.extend(frame_store.frames.get(first_frame_idx, len(frame_store))["frame_time"])
+        self.graph.request_update()
 
     def on_frame_info_cleared(self) -> None:
-        self.data.clear()
-        for i in range(0, 300):
-            self.data.append(0)
+        self.frame_times.clear()
+        self.first_frame_number = -1
 
-        self.frame_slice = (-1, -1)
+        self.view_start = 0
+        self.view_frames = FrameChart.default_view_frames
+        self.follow_latest = True
 
         self.graph.clear()
         self.sel_frame = -1
+        self.graph.request_update()
@@ -0,0 +1,75 @@
+from typing import Tuple
+
+import numpy as np
+
+from Src.FrameStore import FrameStore
+
+comparison_dtype: np.dtype = np.dtype([
+    ("path_id", np.int32),
+    ("base_total_time_ms", np.float64),
+    ("other_total_time_ms", np.float64),
+    ("base_self_time_ms", np.float64),
+    ("other_self_time_ms", np.float64),
+    ("base_num_calls", np.float64),
+    ("other_num_calls", np.float64),
+])
+
+
+def sum_by_path(frame_store: FrameStore, start_frame_idx: int,
+                stop_frame_idx: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Totals of every sample path over a range of stored frames, indexed by path id.
+    :param start_frame_idx: Index of the first frame in the range.
+    :param stop_frame_idx: Index one past the last frame in the range. Clamped to the number of frames.
+    :return: Number of samples, total ms, self ms and calls of each path id.
+    """
+
+    num_paths: int = len(frame_store.path_table)
+    start_frame_idx = max(0, start_frame_idx)
+    stop_frame_idx = min(stop_frame_idx, len(frame_store))
+    if start_frame_idx >= stop_frame_idx:
+        return np.zeros(num_paths, dtype=np.int64), np.zeros(num_paths), np.zeros(num_paths), np.zeros(num_paths)
+
+    # Frames' samples are stored back to back, so a frame range is one slice of the sample table.
+    sample_start, _ = frame_store.get_sample_range(start_frame_idx)
+    _, sample_stop = frame_store.get_sample_range(stop_frame_idx - 1)
+    samples: np.ndarray = frame_store.get_samples(sample_start, sample_stop)
+
+    # Path ids are dense, so bincount aligns every path without sorting or hashing.
+    path_ids: np.ndarray = samples["path_id"]
+    counts: np.ndarray = np.bincount(path_ids, minlength=num_paths)
+    total_times: np.ndarray = np.bincount(path_ids, weights=samples["total_time_ms"], minlength=num_paths)
+    self_times: np.ndarray = np.bincount(path_ids, weights=samples["self_time_ms"], minlength=num_paths)
+    num_calls: np.ndarray = np.bincount(path_ids, weights=samples["num_calls"], minlength=num_paths)
+
+    return counts, total_times, self_times, num_calls
+
+
+def compare_frame_ranges(frame_store: FrameStore, base_range: Tuple[int, int],
+                         other_range: Tuple[int, int]) -> np.ndarray:
+    """
+    Aligns two frames, or two frame ranges, by sample path.
+    Ranges can differ in length, so times and calls are averaged per frame. A single frame is a range of one frame.
+    :param base_range: Start and stop frame index of the frames compared against.
+    :param other_range: Start and stop frame index of the frames compared.
+    :return: Records in comparison_dtype, in path id order, for every path sampled in either range. Paths missing
+             from one range have zero times and calls there.
+    """
+
+    base_counts, base_total_times, base_self_times, base_num_calls = sum_by_path(frame_store, *base_range)
+    other_counts, other_total_times, other_self_times, other_num_calls = sum_by_path(frame_store, *other_range)
+
+    base_num_frames: int = max(1, min(base_range[1], len(frame_store)) - max(base_range[0], 0))
+    other_num_frames: int = max(1, min(other_range[1], len(frame_store)) - max(other_range[0], 0))
+
+    path_ids: np.ndarray = np.flatnonzero((base_counts > 0) | (other_counts > 0))
+    comparison: np.ndarray = np.empty(len(path_ids), dtype=comparison_dtype)
+    comparison["path_id"] = path_ids
+    comparison["base_total_time_ms"] = base_total_times[path_ids] / base_num_frames
+    comparison["other_total_time_ms"] = other_total_times[path_ids] / other_num_frames
+    comparison["base_self_time_ms"] = base_self_times[path_ids] / base_num_frames
+    comparison["other_self_time_ms"] = other_self_times[path_ids] / other_num_frames
+    comparison["base_num_calls"] = base_num_calls[path_ids] / base_num_frames
+    comparison["other_num_calls"] = other_num_calls[path_ids] / other_num_frames
+
+    return comparison
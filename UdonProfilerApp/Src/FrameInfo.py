@@ -18,9 +18,12 @@ class FrameInfo:
         self.max_depth = 0
 
     def add_sample(self, sample: Sample) -> None:
-        if self.frame_time < 0 and sample.path_name == "/UdonBehaviour":
+        depth: int = sample.depth
+
+        # Frame root (/UdonBehaviour) is the only sample without a parent.
+        if self.frame_time < 0 and depth == 0:
             self.frame_time = sample.total_time_ms
 
         self.samples.append(sample)
 
-        self.max_depth = max(self.max_depth, sample.depth)
+        self.max_depth = max(self.max_depth, depth)
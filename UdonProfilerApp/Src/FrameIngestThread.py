@@ -0,0 +1,109 @@
+import os
+import queue
+import threading
+import time
+from typing import Iterator, List, TextIO
+
+from Src.FrameBlock import FrameBlock
+from Src.FrameParser import parse_frame_block
+
+
+class FrameIngestThread(threading.Thread):
+    """
+    Tails the Unity log file on a background thread and parses frame blocks into columnar frame blocks.
+    Finished frames are handed to the GUI through a bounded queue, which the GUI drains on a timer.
+    """
+
+    frame_begin_symbol: str = "##FRAME_INFO_BEGIN##"
+    frame_end_symbol: str = "##FRAME_INFO_END##"
+
+    def __init__(self, logfile_name: str, frame_queue: queue.Queue, poll_interval: float = 0.005) -> None:
+        super().__init__(name="FrameIngestThread", daemon=True)
+
+        self.logfile_name: str = logfile_name
+        self.frame_queue: queue.Queue = frame_queue
+        self.poll_interval: float = poll_interval
+
+        # Frames are only parsed while recording. Read from both threads, so use events instead of plain flags.
+        self.recording: threading.Event = threading.Event()
+        self.stopping: threading.Event = threading.Event()
+
+    def run(self) -> None:
+        reading_frame: bool = False
+        frame_lines: List[str] = list()
+
+        with open(self.logfile_name, "r") as logfile:
+            for line in self.tail(logfile):
+                # Discard any frames read while recording is paused.
+                if not self.recording.is_set():
+                    # Clear any frame info that may have been being processed when pause button hit.
+                    reading_frame = False
+                    frame_lines.clear()
+                    continue
+
+                # Start reading frame info.
+                if FrameIngestThread.frame_begin_symbol in line:
+                    reading_frame = True
+                    frame_lines.clear()
+                    continue
+
+                # Collect remaining frame info.
+                if reading_frame:
+                    # Stop reading frame info and parse the whole block at once.
+                    if FrameIngestThread.frame_end_symbol in line:
+                        reading_frame = False
+
+                        try:
+                            frame_block: FrameBlock = parse_frame_block(frame_lines)
+                        except ValueError:
+                            # Truncated or interleaved output. Skip the frame rather than stop reading the log.
+                            continue
+                        finally:
+                            frame_lines.clear()
+
+                        self.put_frame(frame_block)
+
+                    else:
+                        frame_lines.append(line)
+
+    def tail(self, file: TextIO) -> Iterator[str]:
+        """
+        Generator function that yields new lines in a file.
+        Partial lines are held back until the writer has finished them.
+        """
+
+        # Seek the end of the file.
+        file.seek(0, os.SEEK_END)
+
+        partial_line: str = ""
+        while not self.stopping.is_set():
+            line: str = file.readline()
+            if not line:
+                # Wait for the file to be updated.
+                time.sleep(self.poll_interval)
+                continue
+
+            if not line.endswith("\n"):
+                partial_line += line
+                continue
+
+            yield partial_line + line
+            partial_line = ""
+
+    def put_frame(self, frame_block: FrameBlock) -> None:
+        # Block while the GUI catches up, but keep checking whether the application has exited.
+        while not self.stopping.is_set():
+            try:
+                self.frame_queue.put(frame_block, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def record(self) -> None:
+        self.recording.set()
+
+    def pause(self) -> None:
+        self.recording.clear()
+
+    def stop(self) -> None:
+        self.stopping.set()
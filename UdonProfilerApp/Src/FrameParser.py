@@ -0,0 +1,131 @@
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from Src.FrameBlock import FrameBlock
+from Src.FrameStore import FrameStore
+from Src.PathTable import PathTable, path_table
+
+# Sample line layout written by Sample.Encode in the Unity package:
+#   path;parent path;total %;self %;calls;total ms;self ms;start,times,...;end,times,...
+fields_per_line: int = 9
+path_name_idx: int = 0
+parent_path_name_idx: int = 1
+total_time_percent_idx: int = 2
+self_time_percent_idx: int = 3
+num_calls_idx: int = 4
+total_time_ms_idx: int = 5
+self_time_ms_idx: int = 6
+start_times_idx: int = 7
+end_times_idx: int = 8
+
+arg_delimiter: str = ";"
+time_delimiter: str = ","
+
+# Numeric line fields and the sample record fields they are stored in.
+numeric_fields: List[Tuple[int, str]] = [
+    (total_time_percent_idx, "total_time_percent"),
+    (self_time_percent_idx, "self_time_percent"),
+    (num_calls_idx, "num_calls"),
+    (total_time_ms_idx, "total_time_ms"),
+    (self_time_ms_idx, "self_time_ms"),
+]
+
+
+def parse_frame_block(lines: List[str], table: PathTable = path_table) -> FrameBlock:
+    """
+    Parses every sample line of a frame block at once.
+    Lines are split together and numeric columns are converted in bulk, instead of one Sample per line.
+    :param lines: Sample lines between the frame begin and end symbols.
+    :param table: Path table to intern sample paths into.
+    :return: Columnar frame block.
+    :raises ValueError: If a line is malformed, e.g. truncated or with a field that isn't a number.
+    """
+
+    num_samples: int = len(lines)
+    samples: np.ndarray = np.zeros(num_samples, dtype=FrameStore.sample_dtype)
+    if num_samples == 0:
+        return FrameBlock(-1, 0, samples, np.zeros(0, dtype=FrameStore.time_dtype))
+
+    # Last field keeps its line ending. NumPy ignores the extra whitespace when converting.
+    tokens: List[str] = arg_delimiter.join(lines).split(arg_delimiter)
+    if len(tokens) != num_samples * fields_per_line:
+        raise ValueError("malformed frame block", len(tokens), num_samples)
+
+    path_names: List[str] = tokens[path_name_idx::fields_per_line]
+    parent_path_names: List[str] = tokens[parent_path_name_idx::fields_per_line]
+    # Nearly every path has been seen before, so try a plain lookup before interning.
+    path_ids: List[Union[int, None]] = [table.path_ids.get(p) for p in path_names]
+    if None in path_ids:
+        path_ids = [table.intern(p, q) for p, q in zip(path_names, parent_path_names)]
+    samples["path_id"] = path_ids
+
+    # Convert all numeric columns with a single call, one column after another.
+    numeric_tokens: List[str] = list()
+    for field_idx, _ in numeric_fields:
+        numeric_tokens += tokens[field_idx::fields_per_line]
+    numeric: np.ndarray = np.array(numeric_tokens, dtype=np.float64).reshape(len(numeric_fields), num_samples)
+    for row, (_, field_name) in enumerate(numeric_fields):
+        samples[field_name] = numeric[row]
+
+    start_times, start_counts = parse_time_fields(tokens[start_times_idx::fields_per_line])
+    end_times, end_counts = parse_time_fields(tokens[end_times_idx::fields_per_line])
+
+    times: np.ndarray
+    num_times: np.ndarray
+    if np.array_equal(start_counts, end_counts):
+        num_times = start_counts
+        times = np.empty(len(start_times), dtype=FrameStore.time_dtype)
+        times["start_time"] = start_times
+        times["end_time"] = end_times
+    else:
+        # Profiler always pairs start and end times. Drop unpaired times rather than misalign the rest.
+        num_times = np.minimum(start_counts, end_counts)
+        start_offsets: np.ndarray = np.cumsum(start_counts) - start_counts
+        end_offsets: np.ndarray = np.cumsum(end_counts) - end_counts
+        times = np.empty(num_times.sum(), dtype=FrameStore.time_dtype)
+        time_offset: int = 0
+        for i in range(0, num_samples):
+            count: int = int(num_times[i])
+            times["start_time"][time_offset:time_offset + count] = \
+                start_times[start_offsets[i]:start_offsets[i] + count]
+            times["end_time"][time_offset:time_offset + count] = end_times[end_offsets[i]:end_offsets[i] + count]
+            time_offset += count
+
+    samples["num_times"] = num_times
+    samples["time_offset"] = np.cumsum(num_times) - num_times
+
+    # Frame root (/UdonBehaviour) is the only sample without a parent.
+    depths: List[int] = [table.depths[i] for i in path_ids]
+    frame_time: float = -1
+    if 0 in depths:
+        frame_time = float(samples["total_time_ms"][depths.index(0)])
+
+    return FrameBlock(frame_time, max(depths), samples, times)
+
+
+def parse_time_fields(fields: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parses the comma separated time lists of all samples in a frame.
+    :param fields: One time list per sample.
+    :return: All times, flattened, and the number of times per sample.
+    :raises ValueError: If a time list is empty or has a time that isn't a number.
+    """
+
+    # Every time list has at least one time, so an empty time means the line was truncated or malformed. Checked
+    # before counting, since an empty list has no delimiters to count.
+    joined: str = arg_delimiter.join(fields)
+    time_tokens: List[str] = joined.replace(arg_delimiter, time_delimiter).split(time_delimiter)
+    if "" in time_tokens:
+        raise ValueError("malformed frame block times - empty time")
+
+    # Raises ValueError for any token that isn't a number, rather than stopping at it.
+    times: np.ndarray = np.array(time_tokens, dtype=np.float64)
+
+    # Count delimiters per field from the raw bytes instead of calling str.count on every field.
+    raw: np.ndarray = np.frombuffer(joined.encode("utf-8"), dtype=np.uint8)
+    delimiter_counts: np.ndarray = np.cumsum(raw == ord(time_delimiter))
+    field_ends: np.ndarray = np.append(np.flatnonzero(raw == ord(arg_delimiter)), len(raw) - 1)
+    counts: np.ndarray = np.diff(delimiter_counts[field_ends], prepend=0) + 1
+
+    return times, counts
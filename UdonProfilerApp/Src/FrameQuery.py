@@ -0,0 +1,112 @@
+import re
+from typing import Dict, List, Union
+
+import numpy as np
+
+from Src.PathTable import PathTable, path_table
+from Src.QueryCondition import QueryCondition, query_columns, query_operators
+from Src.SampleSeries import SampleSeries
+
+# Conditions are joined with "and". A condition without a path applies to the path of the condition before it, e.g.
+# Update/Physics total_ms > 2 and calls > 40
+condition_separator: re.Pattern = re.compile(r"\s+and\s+", re.IGNORECASE)
+condition_pattern: re.Pattern = re.compile(
+    r"^(?:(?P<path>.+?)\s+)?"
+    rf"(?P<column>{'|'.join(query_columns)})\s*"
+    rf"(?P<operator>{'|'.join(re.escape(operator) for operator in query_operators)})\s*"
+    r"(?P<value>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)$"
+)
+
+
+def parse_query(query: str) -> List[QueryCondition]:
+    """
+    Parses conditions such as "Update/Physics total_ms > 2 and calls > 40".
+    :raises ValueError: If a condition can't be parsed.
+    """
+
+    conditions: List[QueryCondition] = list()
+    path: Union[str, None] = None
+    for condition_text in condition_separator.split(query.strip()):
+        match: Union[re.Match, None] = condition_pattern.match(condition_text.strip())
+        if not match:
+            raise ValueError(f"can't parse condition '{condition_text}' - expected <path> <column> <operator> "
+                             f"<value>, e.g. Update/Physics total_ms > 2")
+
+        path = match.group("path") or path
+        if path is None:
+            raise ValueError(f"can't parse condition '{condition_text}' - first condition needs a path")
+
+        conditions.append(QueryCondition(path, match.group("column"), match.group("operator"),
+                                         float(match.group("value"))))
+
+    return conditions
+
+
+def find_path_ids(path: str) -> List[int]:
+    """
+    :return: Id of the sample path, or if there's no such path, ids of every path ending with it. Update/Physics
+             matches /UdonBehaviour/Update/Physics and any other Physics sample under an Update sample.
+    """
+
+    path_id: Union[int, None] = path_table.path_ids.get(path)
+    if path_id is not None:
+        return [path_id]
+
+    suffix: str = PathTable.path_delimiter + path.strip(PathTable.path_delimiter)
+    return [path_id for path_id, path_name in enumerate(path_table.path_names) if path_name.endswith(suffix)]
+
+
+def run_query(sample_series: SampleSeries, conditions: List[QueryCondition]) -> np.ndarray:
+    """
+    Finds the frames that meet every condition. Conditions on the same path have to be met by the same sample, and a
+    frame can only meet a condition on a path that was sampled in it.
+    Only the series of the paths queried are read, so once they're loaded, cost depends on how often those paths
+    were sampled, not on the size of the frames.
+    :return: Indexes of the matching frames, in ascending order.
+    :raises ValueError: If there's no sample path for a condition.
+    """
+
+    # Conditions grouped by path, in query order.
+    path_conditions: Dict[str, List[QueryCondition]] = dict()
+    for condition in conditions:
+        path_conditions.setdefault(condition.path, list()).append(condition)
+
+    # Series of every path queried are loaded in one pass over the frames.
+    path_ids_of_paths: Dict[str, List[int]] = dict()
+    for path in path_conditions.keys():
+        path_ids_of_paths[path] = find_path_ids(path)
+        if not path_ids_of_paths[path]:
+            raise ValueError(f"can't query {path} - no sample path matches it")
+
+    sample_series.load([path_id for path_ids in path_ids_of_paths.values() for path_id in path_ids])
+
+    frame_idxs: Union[np.ndarray, None] = None
+    for path, conditions_of_path in path_conditions.items():
+        path_ids: List[int] = path_ids_of_paths[path]
+
+        # A path name can match several paths. A frame matches if any of them meets the conditions.
+        path_frame_idxs: List[np.ndarray] = list()
+        for path_id in path_ids:
+            records: np.ndarray = sample_series.get(path_id)
+            mask: np.ndarray = np.ones(len(records), dtype=bool)
+            for condition in conditions_of_path:
+                mask &= condition.evaluate(records)
+            path_frame_idxs.append(records["frame_idx"][mask])
+
+        matches: np.ndarray = np.unique(np.concatenate(path_frame_idxs)).astype(np.int64)
+        frame_idxs = matches if frame_idxs is None else np.intersect1d(frame_idxs, matches, assume_unique=True)
+
+    if frame_idxs is None:
+        return np.zeros(0, dtype=np.int64)
+
+    return frame_idxs
+
+
+def query_frames(sample_series: SampleSeries, query: str) -> np.ndarray:
+    """
+    Parses and runs a query.
+    :return: Indexes of the matching frames, in ascending order.
+    :raises ValueError: If the query can't be parsed, or names a path that doesn't exist.
+    """
+
+    return run_query(sample_series, parse_query(query))
@@ -0,0 +1,243 @@
+from typing import BinaryIO, List, Tuple, Union
+
+import numpy as np
+
+from Src.FrameBlock import FrameBlock
+from Src.FrameView import FrameView
+from Src.PathTable import PathTable, path_table
+from Utils.SpillArray import SpillArray
+
+
+class FrameStore:
+    """
+    Columnar storage for recorded frames.
+    Frames index into a flat sample table, and samples index into flat start/end time arrays, so a frame costs a
+    few fixed-width records instead of one dataclass, three strings and two lists per sample.
+    With a retention limit, only the newest frames are kept in memory. Older frames are spilled to disk, and are
+    paged back in when they're read, so memory use stays flat however long the recording is.
+    """
+
+    frame_dtype: np.dtype = np.dtype([
+        ("sample_offset", np.int64),
+        ("num_samples", np.int64),
+        ("frame_time", np.float64),
+        ("max_depth", np.int64),
+    ])
+
+    sample_dtype: np.dtype = np.dtype([
+        ("path_id", np.int32),
+        ("num_calls", np.int32),
+        ("total_time_percent", np.float64),
+        ("self_time_percent", np.float64),
+        ("total_time_ms", np.float64),
+        ("self_time_ms", np.float64),
+        ("time_offset", np.int64),
+        ("num_times", np.int64),
+    ])
+
+    # Profiler pairs every start time with an end time, so both share the same offsets.
+    time_dtype: np.dtype = np.dtype([
+        ("start_time", np.float64),
+        ("end_time", np.float64),
+    ])
+
+    # Spilling stops once memory use is this fraction of the limit, so frames are spilled in batches rather than one
+    # at a time.
+    spill_ratio: float = 0.75
+
+    # Samples translated at once when writing samples whose path ids are translated on read.
+    write_chunk_samples: int = 65536
+
+    def __init__(self, first_frame_number: int = 1,
+                 frames: Union[np.ndarray, None] = None,
+                 samples: Union[np.ndarray, None] = None,
+                 times: Union[np.ndarray, None] = None,
+                 path_id_map: Union[np.ndarray, None] = None) -> None:
+        """
+        :param first_frame_number: Frame number of the first stored frame.
+        :param frames: Existing frame records to wrap without copying, e.g. a memory-mapped capture.
+        :param samples: Existing sample records, indexed by frames.
+        :param times: Existing time records, indexed by samples.
+        :param path_id_map: Path id in the shared path table of each path id in the existing samples, if they differ,
+                            e.g. for a capture written in another session. Applied when samples are read, so existing
+                            samples are never rewritten.
+        """
+
+        self.first_frame_number: int = first_frame_number
+
+        self.path_table: PathTable = path_table
+        self.frames: SpillArray = SpillArray(FrameStore.frame_dtype, initial_data=frames)
+        self.samples: SpillArray = SpillArray(FrameStore.sample_dtype, initial_data=samples)
+        self.times: SpillArray = SpillArray(FrameStore.time_dtype, initial_data=times)
+
+        # Existing samples are the first samples, so only samples before this index need their path ids translated.
+        self.path_id_map: Union[np.ndarray, None] = path_id_map
+        self.num_mapped_samples: int = len(samples) if samples is not None and path_id_map is not None else 0
+
+        # Limits of the frames kept in memory. No limit if None.
+        self.max_frames: Union[int, None] = None
+        self.max_bytes: Union[int, None] = None
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        :return: Size of the records in memory. Spilled and mapped records aren't included.
+        """
+
+        return self.frames.nbytes + self.samples.nbytes + self.times.nbytes
+
+    def set_retention(self, max_frames: Union[int, None], max_bytes: Union[int, None] = None) -> None:
+        """
+        Limits the frames kept in memory. Frames past either limit are spilled to disk, oldest first. Frames of an
+        opened capture stay mapped from its file, so they aren't spilled or counted toward either limit.
+        :param max_frames: Number of frames to keep in memory.
+        :param max_bytes: Size of the records to keep in memory.
+        """
+
+        self.max_frames = max_frames
+        self.max_bytes = max_bytes
+        self.apply_retention()
+
+    def append(self, frame_block: FrameBlock) -> int:
+        """
+        Copies a parsed frame into the store.
+        :param frame_block: Frame to store.
+        :return: Index of the stored frame.
+        """
+
+        time_offset: int = self.times.extend(frame_block.times)
+        sample_offset: int = self.samples.extend(frame_block.samples)
+
+        # Block time offsets are relative to the block. New samples are in memory, so this updates them in place.
+        self.samples.get(sample_offset, len(self.samples))["time_offset"] += time_offset
+
+        frame_idx: int = self.frames.append((sample_offset, len(frame_block), frame_block.frame_time,
+                                             frame_block.max_depth))
+        self.apply_retention()
+
+        return frame_idx
+
+    def apply_retention(self) -> None:
+        num_frames: int = len(self.frames.memory)
+        if num_frames <= 1:
+            return
+
+        num_spilled_frames: int = 0
+        if self.max_frames is not None and num_frames > self.max_frames:
+            num_spilled_frames = num_frames - max(1, int(self.max_frames * FrameStore.spill_ratio))
+
+        if self.max_bytes is not None and self.nbytes > self.max_bytes:
+            # Memory left after spilling the first k frames in memory, for every k.
+            sample_offsets: np.ndarray = self.frames.memory.data["sample_offset"]
+            time_offsets: np.ndarray = np.append(self.samples.memory.data["time_offset"], len(self.times))
+            remaining_bytes: np.ndarray = (
+                (num_frames - np.arange(num_frames)) * FrameStore.frame_dtype.itemsize +
+                (len(self.samples) - sample_offsets) * FrameStore.sample_dtype.itemsize +
+                (len(self.times) - time_offsets[sample_offsets - self.samples.memory_start]) *
+                FrameStore.time_dtype.itemsize
+            )
+
+            # Newest frame is always kept, even if it's over the limit on its own.
+            fits: np.ndarray = remaining_bytes <= self.max_bytes * FrameStore.spill_ratio
+            num_spilled_frames = max(num_spilled_frames, int(np.argmax(fits)) if fits.any() else num_frames - 1)
+
+        if num_spilled_frames > 0:
+            self.spill_frames(num_spilled_frames)
+
+    def spill_frames(self, num_frames: int) -> None:
+        """
+        Moves the oldest frames in memory, and their samples and times, to disk.
+        """
+
+        # Frames' samples and samples' times are stored back to back, so the first frame left in memory marks where
+        # its samples and times start.
+        first_sample_idx: int = int(self.frames[self.frames.memory_start + num_frames]["sample_offset"])
+        first_time_idx: int = len(self.times)
+        if first_sample_idx < len(self.samples):
+            first_time_idx = int(self.samples[first_sample_idx]["time_offset"])
+
+        self.frames.spill(num_frames)
+        self.samples.spill(first_sample_idx - self.samples.memory_start)
+        self.times.spill(first_time_idx - self.times.memory_start)
+
+    def get_frame(self, frame_idx: int) -> FrameView:
+        if frame_idx < 0 or frame_idx >= len(self.frames):
+            raise IndexError(f"can't get frame {frame_idx} - out of range")
+
+        return FrameView(self, frame_idx)
+
+    def get_frame_number(self, frame_idx: int) -> int:
+        return self.first_frame_number + frame_idx
+
+    def get_sample_range(self, frame_idx: int) -> Tuple[int, int]:
+        frame: np.void = self.frames[frame_idx]
+        sample_offset: int = int(frame["sample_offset"])
+
+        return sample_offset, sample_offset + int(frame["num_samples"])
+
+    def get_samples(self, start: int, stop: int, fields: Union[List[str], None] = None) -> np.ndarray:
+        """
+        Reads sample records with path ids of the shared path table. Use instead of samples.get wherever path ids
+        are read.
+        :param fields: Fields to read. Only these are copied, e.g. path ids to find the samples of a path. Every
+                       field if None.
+        :return: Samples from start up to stop. Same as samples.get, but a copy if any path ids were translated or
+                 fields were picked.
+        """
+
+        samples: np.ndarray = self.samples.get(start, stop)
+        if fields is not None:
+            field_samples: np.ndarray = np.empty(len(samples), dtype=[(field, FrameStore.sample_dtype.fields[field][0])
+                                                                      for field in fields])
+            for field in fields:
+                field_samples[field] = samples[field]
+            samples = field_samples
+
+        num_mapped: int = min(self.num_mapped_samples, stop) - max(0, start)
+        if num_mapped <= 0 or "path_id" not in samples.dtype.names:
+            return samples
+
+        if fields is None:
+            samples = samples.copy()
+        samples["path_id"][:num_mapped] = self.path_id_map[samples["path_id"][:num_mapped]]
+
+        return samples
+
+    def take_samples(self, sample_idxs: np.ndarray, fields: Union[List[str], None] = None) -> np.ndarray:
+        """
+        Reads sample records at any selection of indexes, with path ids of the shared path table.
+        :param fields: Fields to read, see SpillArray.take. Every field if None.
+        """
+
+        sample_idxs = np.asarray(sample_idxs, dtype=np.int64)
+        samples: np.ndarray = self.samples.take(sample_idxs, fields)
+        if self.num_mapped_samples == 0 or "path_id" not in samples.dtype.names:
+            return samples
+
+        mapped: np.ndarray = sample_idxs < self.num_mapped_samples
+        samples["path_id"][mapped] = self.path_id_map[samples["path_id"][mapped]]
+
+        return samples
+
+    def write_samples_to(self, file: BinaryIO) -> None:
+        """
+        Writes every sample record to a file, with path ids of the shared path table.
+        """
+
+        if self.num_mapped_samples == 0:
+            self.samples.write_to(file)
+            return
+
+        # Translated in chunks, so the samples aren't read into memory at once.
+        for start in range(0, len(self.samples), FrameStore.write_chunk_samples):
+            file.write(self.get_samples(start, start + FrameStore.write_chunk_samples).tobytes())
+
+    def clear(self) -> None:
+        self.path_id_map = None
+        self.num_mapped_samples = 0
+        self.frames.clear()
+        self.samples.clear()
+        self.times.clear()
@@ -0,0 +1,123 @@
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from Src.FrameStore import FrameStore
+from Src.PathTable import path_table
+from Src.SampleStatistics import SampleStatistics
+
+summary_percentiles: Tuple[int, ...] = (50, 95, 99)
+# Samples listed for each of the worst frames, by self time.
+worst_frame_samples: int = 5
+
+
+def summarize_times(times: np.ndarray) -> Dict[str, float]:
+    """
+    :param times: Times in ms, sorted ascending.
+    """
+
+    summary: Dict[str, float] = {
+        "min": float(times[0]),
+        "max": float(times[-1]),
+        "avg": float(times.mean()),
+    }
+    for percentile, value in zip(summary_percentiles, np.percentile(times, summary_percentiles)):
+        summary[f"p{percentile}"] = float(value)
+
+    return summary
+
+
+def summarize_frames(frame_store: FrameStore, num_worst_frames: int = 10) -> Dict[str, Any]:
+    """
+    Aggregates a whole recording without building frame or sample views, for headless use.
+    :param frame_store: Recorded frames.
+    :param num_worst_frames: Number of slowest frames to list.
+    :return: JSON serializable summary with frame time statistics, per sample name statistics (combined over every
+             path the name is reached from, same as the statistics view) and the slowest frames.
+    """
+
+    frames: np.ndarray = frame_store.frames.get(0, len(frame_store.frames))
+    samples: np.ndarray = frame_store.get_samples(0, len(frame_store.samples))
+
+    summary: Dict[str, Any] = {
+        "num_frames": len(frames),
+        "first_frame_number": frame_store.first_frame_number,
+        "frame_time_ms": dict(),
+        "samples": list(),
+        "worst_frames": list(),
+    }
+    if len(frames) == 0:
+        return summary
+
+    summary["frame_time_ms"] = summarize_times(np.sort(frames["frame_time"]))
+
+    # Sort samples by name, then time, so each name is one contiguous, sorted run.
+    name_ids: np.ndarray = np.asarray(path_table.name_ids, dtype=np.int64)[samples["path_id"]]
+    order: np.ndarray = np.lexsort((samples["total_time_ms"], name_ids))
+    sorted_name_ids: np.ndarray = name_ids[order]
+    sorted_times: np.ndarray = samples["total_time_ms"][order]
+    run_starts: np.ndarray = np.flatnonzero(np.diff(sorted_name_ids, prepend=-1))
+    run_stops: np.ndarray = np.append(run_starts[1:], len(sorted_name_ids))
+
+    sample_summaries: List[Dict[str, Any]] = list()
+    for start, stop in zip(run_starts.tolist(), run_stops.tolist()):
+        times: np.ndarray = sorted_times[start:stop]
+
+        statistics: SampleStatistics = SampleStatistics(path_table.unique_names[sorted_name_ids[start]])
+        statistics.add_statistics(times)
+
+        sample_summary: Dict[str, Any] = {
+            "name": statistics.name,
+            "num_samples": statistics.num_samples,
+            "total_time_ms": statistics.total_time,
+        }
+        sample_summary.update(summarize_times(times))
+        sample_summary["std"] = statistics.std_time
+        sample_summaries.append(sample_summary)
+
+    # Most expensive samples first.
+    sample_summaries.sort(key=lambda s: s["total_time_ms"], reverse=True)
+    summary["samples"] = sample_summaries
+
+    worst_frame_idxs: np.ndarray = np.argsort(-frames["frame_time"], kind="stable")[:num_worst_frames]
+    for frame_idx in worst_frame_idxs.tolist():
+        sample_start, sample_stop = frame_store.get_sample_range(frame_idx)
+        frame_samples: np.ndarray = samples[sample_start:sample_stop]
+        top: np.ndarray = np.argsort(-frame_samples["self_time_ms"], kind="stable")[:worst_frame_samples]
+
+        summary["worst_frames"].append({
+            "frame_number": frame_store.get_frame_number(frame_idx),
+            "frame_time_ms": float(frames[frame_idx]["frame_time"]),
+            "top_samples": [{"path": path_table.path_names[int(frame_samples[i]["path_id"])],
+                             "self_time_ms": float(frame_samples[i]["self_time_ms"])}
+                            for i in top.tolist()],
+        })
+
+    return summary
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    lines: List[str] = [f"Frames: {summary['num_frames']}"]
+    if summary["num_frames"] == 0:
+        return lines[0]
+
+    stat_names: List[str] = ["min", "max", "avg"] + [f"p{p}" for p in summary_percentiles]
+
+    frame_time: Dict[str, float] = summary["frame_time_ms"]
+    lines.append("Frame time (ms): " + "  ".join(f"{s} {frame_time[s]:.2f}" for s in stat_names))
+
+    stat_names.append("std")
+
+    lines.append("")
+    lines.append(f"{'Sample':<40} {'Count':>8} " + " ".join(f"{s:>8}" for s in stat_names))
+    for sample in summary["samples"]:
+        lines.append(f"{sample['name'][:40]:<40} {sample['num_samples']:>8} " +
+                     " ".join(f"{sample[s]:>8.3f}" for s in stat_names))
+
+    lines.append("")
+    lines.append("Worst frames:")
+    for frame in summary["worst_frames"]:
+        top: str = ", ".join(f"{s['path']} {s['self_time_ms']:.3f}" for s in frame["top_samples"])
+        lines.append(f"  #{frame['frame_number']}  {frame['frame_time_ms']:.2f} ms  ({top})")
+
+    return "\n".join(lines)
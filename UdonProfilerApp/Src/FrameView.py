@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, TYPE_CHECKING
+
+import numpy as np
+
+from Src.SampleView import SampleView
+
+if TYPE_CHECKING:
+    from Src.FrameStore import FrameStore
+
+
+@dataclass
+class FrameView:
+    """
+    Frame read back from a frame store. Mirrors the fields of FrameInfo.
+    Only built for frames that are being displayed, so the per-sample objects are short-lived.
+    """
+
+    frame_number: int
+    frame_time: float
+    samples: List[SampleView]
+    max_depth: int
+
+    def __init__(self, store: FrameStore, frame_idx: int) -> None:
+        record: np.void = store.frames[frame_idx]
+
+        self.frame_number = store.get_frame_number(frame_idx)
+        self.frame_time = float(record["frame_time"])
+        self.max_depth = int(record["max_depth"])
+
+        sample_offset: int = int(record["sample_offset"])
+        sample_records: np.ndarray = store.get_samples(sample_offset, sample_offset + int(record["num_samples"]))
+        self.samples = [SampleView(store, sample_record) for sample_record in sample_records]
@@ -1,10 +1,12 @@
-from typing import Any, Dict, List, Union
+from typing import Any, Hashable, List, Set, Union
 
 import customtkinter as ctk
 
 from Widgets.Tree.TreeWidget import TreeWidget, TreeColumnConfig
-from Src.Sample import Sample
-from Src.FrameInfo import FrameInfo
+from Widgets.Tree.TreeBody import TreeBody
+from Src.SampleView import SampleView
+from Src.FrameView import FrameView
+from Src.PathTable import PathTable, path_table
 
 
 class HierarchyView(ctk.CTkFrame):
@@ -14,7 +16,8 @@ class HierarchyView(ctk.CTkFrame):
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=1)
 
-        self.tree: TreeWidget = TreeWidget(self)
+        # Frames can have hundreds of samples, so only create entry widgets for the rows on screen.
+        self.tree: TreeWidget = TreeWidget(self, virtualized=True, expand_all_btn=True)
         self.tree.grid(row=0, column=0, sticky="nsew")
 
         overview_col_config: TreeColumnConfig = TreeColumnConfig(
@@ -63,11 +66,12 @@ class HierarchyView(ctk.CTkFrame):
 
         self.tree.config_tree(cols_config)
 
-        self.samples_expand_state: Dict[str, bool] = dict()
+        # Path ids of the samples in the tree.
+        self.path_ids: Set[int] = set()
         self.sel_sample_name: Union[str, None] = None
 
         root: Any = self.winfo_toplevel()
-        info: Union[FrameInfo, None] = root.get_selected_frame_info()
+        info: Union[FrameView, None] = root.get_selected_frame_info()
         # if not info:
         #     info = FrameInfo(0)
         #     info.add_sample(Sample("/UdonBehaviour;;100.00;0.00;1;5.00;0.00;0.00,1.00;1.00,2.00"))
@@ -82,58 +86,64 @@ class HierarchyView(ctk.CTkFrame):
 
         self.tree.render_tree()
 
-    def add_item(self, item: Sample, selected: bool = False) -> None:
-        if item.path_name not in self.samples_expand_state:
-            self.samples_expand_state[item.path_name] = False
+    def add_item(self, item: SampleView, selected: bool = False) -> None:
+        parent_id: int = path_table.parent_ids[item.path_id]
+        parent_name: Hashable = TreeBody.root_name
+        if parent_id != PathTable.no_parent_id:
+            parent_name = parent_id
 
+        # Tree keeps the expand state of paths that were removed, so a path that comes back opens the same way.
         self.tree.add_entry(
-            item.path_name,
+            item.path_id,
             item.depth,
-            [
-                item.name,
-                item.total_time_percent,
-                item.self_time_percent,
-                item.num_calls,
-                item.total_time_ms,
-                item.self_time_ms
-            ],
-            item.parent_path_name,
-            default_expand=self.samples_expand_state[item.path_name],
+            HierarchyView.get_item_data(item),
+            parent_name,
+            default_expand=self.tree.get_expand_states().get(item.path_id, False),
             default_select=selected
         )
 
-    def on_frame_info_received(self, frame_info: FrameInfo) -> None:
-        # Save previous frame expand states.
-        if not self.tree.body:
-            raise RuntimeError("Tree body reference lost")
-
-        for k in self.tree.body.entry_expand_states.keys():
-            # This can happen if application cleared frame infos.
-            if k.entry_config.name not in self.samples_expand_state:
-                self.samples_expand_state[k.entry_config.name] = False
-
-            self.samples_expand_state[k.entry_config.name] = self.tree.body.entry_expand_states[k]
-
-        # Save previous frame selected entry.
-        sel_entry_name: Union[str, None] = None
-        if self.tree.body.sel_entry:
-            sel_entry_name = self.tree.body.sel_entry.entry_config.name
-
-        self.tree.clear_tree()
-        self.tree.body.sel_entry = None
-
-        # Add new entries to tree.
-        for i in range(0, len(frame_info.samples)):
-            selected: bool = False
-            if sel_entry_name and frame_info.samples[i].path_name == sel_entry_name:
-                selected = True
-
-            self.add_item(frame_info.samples[i], selected)
-
+    @staticmethod
+    def get_item_data(item: SampleView) -> List[Any]:
+        return [
+            item.name,
+            item.total_time_percent,
+            item.self_time_percent,
+            item.num_calls,
+            item.total_time_ms,
+            item.self_time_ms
+        ]
+
+    def on_frame_info_received(self, frame_info: FrameView) -> None:
+        """
+        Updates the tree to show another frame. Only rows whose path isn't in both frames are added or removed.
+        Rows in both frames are updated in place, and keep their expand and selection state.
+        """
+
+        samples: List[SampleView] = frame_info.samples
+        path_ids: Set[int] = {sample.path_id for sample in samples}
+
+        # Removing a row also removes its descendants, so some of these may already be gone.
+        for path_id in self.path_ids - path_ids:
+            self.tree.remove_entry(path_id)
+
+        # Samples are listed parents first, so a new row's parent is always in the tree by the time it's added.
+        rows_added: bool = False
+        for sample in samples:
+            if sample.path_id in self.path_ids:
+                self.tree.update_entry(sample.path_id, HierarchyView.get_item_data(sample))
+            else:
+                self.add_item(sample)
+                rows_added = True
+
+        # New rows are added after their siblings, so they're moved to where their samples are in the frame.
+        if rows_added:
+            self.tree.order_entries([sample.path_id for sample in samples])
+
+        self.path_ids = path_ids
         self.tree.render_tree()
 
     def on_frame_info_cleared(self) -> None:
-        self.samples_expand_state.clear()
+        self.path_ids.clear()
         self.sel_sample_name = None
         self.tree.clear_tree()
         self.tree.render_tree()
@@ -0,0 +1,242 @@
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Deque, List, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from Utils.GrowableArray import GrowableArray
+
+
+class HitchDetector:
+    """
+    Streaming detector for hitches, i.e. frames that take much longer than the frames before them.
+    A frame is a hitch if its frame time is more than k scaled median absolute deviations (MAD) above the median of
+    the previous frames in a rolling window, or above a fixed budget if one is set. The median and MAD are robust, so
+    the hitches themselves barely move the threshold.
+    Cost per frame depends on the window size, not on the number of frames, and hitch indexes are kept sorted as
+    they're found.
+    See: https://en.wikipedia.org/wiki/Median_absolute_deviation
+    """
+
+    window_size: int = 120
+    threshold_mads: float = 5.0
+    # Frames needed before hitches are flagged, so the first few frames don't set the threshold on their own.
+    min_window_size: int = 30
+    # Lower bound of the MAD, so steady frame times don't make every small jitter a hitch.
+    min_mad_ms: float = 0.25
+    # Makes the MAD comparable to the standard deviation of normally distributed frame times.
+    mad_scale: float = 1.4826
+    # Frames checked at once when adding a batch, which bounds the sorted windows to a few MB.
+    chunk_frames: int = 4096
+
+    def __init__(self, window_size: int = window_size, threshold_mads: float = threshold_mads,
+                 budget_ms: Union[float, None] = None) -> None:
+        """
+        :param window_size: Number of previous frames the median and MAD are taken over.
+        :param threshold_mads: Number of scaled MADs above the median a hitch takes at least.
+        :param budget_ms: Fixed frame time budget. Replaces the rolling threshold if set.
+        """
+
+        if window_size < 1:
+            raise ValueError(f"can't detect hitches over {window_size} frames - window needs at least one frame")
+
+        self.window_size: int = window_size
+        self.threshold_mads: float = threshold_mads
+        self.budget_ms: Union[float, None] = budget_ms
+
+        # Frame times in the window, in arrival order and sorted.
+        self.window: Deque[float] = deque()
+        self.sorted_window: List[float] = list()
+
+        # Indexes of hitch frames, in ascending order.
+        self.hitch_idxs: GrowableArray = GrowableArray(np.int64)
+        self.num_frames: int = 0
+
+    def __len__(self) -> int:
+        return self.num_frames
+
+    @property
+    def num_hitches(self) -> int:
+        return len(self.hitch_idxs)
+
+    def add(self, frame_time: float) -> bool:
+        """
+        Checks the next frame against the frames before it, then adds it to the window.
+        :return: True if the frame is a hitch.
+        """
+
+        is_hitch: bool = frame_time > self.get_threshold()
+        if is_hitch:
+            self.hitch_idxs.append(self.num_frames)
+        self.num_frames += 1
+
+        if len(self.window) == self.window_size:
+            del self.sorted_window[bisect_left(self.sorted_window, self.window.popleft())]
+        self.window.append(frame_time)
+        insort(self.sorted_window, frame_time)
+
+        return is_hitch
+
+    def extend(self, frame_times: np.ndarray) -> None:
+        """
+        Adds a batch of frames, e.g. an imported log or an opened capture. Finds the same hitches as adding the
+        frames one at a time, but takes the median and MAD of every full window with NumPy, a chunk of frames at a
+        time.
+        """
+
+        frame_times = np.asarray(frame_times, dtype=np.float64)
+
+        # Frames without a full window before them are only the first few of a recording, so they're added one at a
+        # time.
+        num_partial_frames: int = min(len(frame_times), max(0, self.window_size - len(self.window)))
+        for frame_time in frame_times[:num_partial_frames].tolist():
+            self.add(frame_time)
+
+        frame_times = frame_times[num_partial_frames:]
+        if len(frame_times) == 0:
+            return
+
+        # Window of each frame is the window_size frames before it, so windows are rows of a sliding view over the
+        # frames in the window and the new frames.
+        history: np.ndarray = np.concatenate((np.asarray(self.window, dtype=np.float64), frame_times))
+        windows: np.ndarray = sliding_window_view(history[:-1], self.window_size)
+
+        is_hitch: np.ndarray = np.empty(len(frame_times), dtype=bool)
+        for start in range(0, len(frame_times), HitchDetector.chunk_frames):
+            stop: int = min(start + HitchDetector.chunk_frames, len(frame_times))
+            is_hitch[start:stop] = self.find_hitches(windows[start:stop], frame_times[start:stop])
+
+        self.hitch_idxs.extend(np.flatnonzero(is_hitch) + self.num_frames)
+        self.num_frames += len(frame_times)
+
+        # Frames added after the batch continue from its last frames.
+        self.window = deque(history[-self.window_size:].tolist())
+        self.sorted_window = sorted(self.window)
+
+    def find_hitches(self, windows: np.ndarray, frame_times: np.ndarray) -> np.ndarray:
+        """
+        :param windows: Frame times of the window of each frame, one full window per row.
+        :return: Mask of the frames that are hitches.
+        """
+
+        if self.budget_ms is not None:
+            return frame_times > self.budget_ms
+
+        # Sorting short rows is faster than partitioning them, and leaves the median in the middle of each row.
+        sorted_windows: np.ndarray = np.sort(windows, axis=1)
+        medians: np.ndarray = HitchDetector.get_row_medians(sorted_windows)
+        mad_threshold: float = self.threshold_mads * HitchDetector.mad_scale
+
+        # A frame below the threshold of the smallest MAD can't be a hitch, so the MAD is only taken for the few
+        # frames above it.
+        is_hitch: np.ndarray = frame_times > medians + mad_threshold * HitchDetector.min_mad_ms
+        candidates: np.ndarray = np.flatnonzero(is_hitch)
+        if len(candidates) > 0:
+            deviations: np.ndarray = np.sort(np.abs(sorted_windows[candidates] - medians[candidates, np.newaxis]),
+                                             axis=1)
+            mads: np.ndarray = np.maximum(HitchDetector.get_row_medians(deviations), HitchDetector.min_mad_ms)
+            is_hitch[candidates] = frame_times[candidates] > medians[candidates] + mad_threshold * mads
+
+        return is_hitch
+
+    @staticmethod
+    def get_row_medians(sorted_rows: np.ndarray) -> np.ndarray:
+        mid: int = sorted_rows.shape[1] // 2
+        if sorted_rows.shape[1] % 2 == 1:
+            return sorted_rows[:, mid]
+
+        return (sorted_rows[:, mid - 1] + sorted_rows[:, mid]) / 2
+
+    def get_threshold(self) -> float:
+        """
+        :return: Frame time the next frame needs to exceed to be a hitch. Infinite until the window has enough frames.
+        """
+
+        if self.budget_ms is not None:
+            return self.budget_ms
+
+        if len(self.sorted_window) < min(HitchDetector.min_window_size, self.window_size):
+            return np.inf
+
+        median: float = self.get_median()
+        mad: float = max(self.get_mad(median), HitchDetector.min_mad_ms)
+
+        return median + self.threshold_mads * HitchDetector.mad_scale * mad
+
+    def get_median(self) -> float:
+        num_values: int = len(self.sorted_window)
+        mid: int = num_values // 2
+        if num_values % 2 == 1:
+            return self.sorted_window[mid]
+
+        return (self.sorted_window[mid - 1] + self.sorted_window[mid]) / 2
+
+    def get_mad(self, median: float) -> float:
+        """
+        :return: Median of the absolute deviations of the window from its median. O(log n) in the window size.
+        """
+
+        num_values: int = len(self.sorted_window)
+        mid: int = num_values // 2
+        if num_values % 2 == 1:
+            return self.get_deviation(median, mid)
+
+        return (self.get_deviation(median, mid - 1) + self.get_deviation(median, mid)) / 2
+
+    def get_deviation(self, median: float, k: int) -> float:
+        """
+        :return: k-th smallest absolute deviation from the median, counting from zero.
+        """
+
+        # Deviations of values below the median, read from the median down, and of values from the median up, are
+        # two sorted lists. The k-th smallest of both is found by binary search over how many come from the first.
+        values: List[float] = self.sorted_window
+        split: int = bisect_left(values, median)
+        num_below: int = split
+        num_above: int = len(values) - split
+
+        lo: int = max(0, k + 1 - num_above)
+        hi: int = min(k + 1, num_below)
+        while lo < hi:
+            # Take num_taken deviations from below, and k + 1 - num_taken from above.
+            num_taken: int = (lo + hi) // 2
+            if median - values[split - 1 - num_taken] < values[split + k - num_taken] - median:
+                lo = num_taken + 1
+            else:
+                hi = num_taken
+
+        below_max: float = median - values[split - lo] if lo > 0 else -np.inf
+        above_max: float = values[split + k - lo] - median if k - lo >= 0 else -np.inf
+
+        return max(below_max, above_max)
+
+    def get_next_hitch(self, frame_idx: int) -> Union[int, None]:
+        """
+        :return: Index of the first hitch after a frame, or None if there's none. O(log n) in the number of hitches.
+        """
+
+        hitch_idxs: np.ndarray = self.hitch_idxs.data
+        idx: int = int(np.searchsorted(hitch_idxs, frame_idx, side="right"))
+        if idx == len(hitch_idxs):
+            return None
+
+        return int(hitch_idxs[idx])
+
+    def get_prev_hitch(self, frame_idx: int) -> Union[int, None]:
+        """
+        :return: Index of the last hitch before a frame, or None if there's none. O(log n) in the number of hitches.
+        """
+
+        hitch_idxs: np.ndarray = self.hitch_idxs.data
+        idx: int = int(np.searchsorted(hitch_idxs, frame_idx, side="left")) - 1
+        if idx < 0:
+            return None
+
+        return int(hitch_idxs[idx])
+
+    def clear(self) -> None:
+        self.window.clear()
+        self.sorted_window.clear()
+        self.hitch_idxs.clear()
+        self.num_frames = 0
@@ -0,0 +1,31 @@
+import threading
+from typing import List, Tuple, Union
+
+from Src.FrameBlock import FrameBlock
+from Src.LogImporter import import_log
+
+
+class LogImportThread(threading.Thread):
+    """
+    Runs a log import off the GUI thread. The GUI polls progress and picks up the result once the thread finishes.
+    """
+
+    def __init__(self, logfile_name: str) -> None:
+        super().__init__(name="LogImportThread", daemon=True)
+
+        self.logfile_name: str = logfile_name
+
+        # Frames parsed, total frames.
+        self.progress: Tuple[int, int] = (0, 0)
+        self.frame_blocks: List[FrameBlock] = list()
+        self.error: Union[Exception, None] = None
+
+    def run(self) -> None:
+        try:
+            self.frame_blocks = import_log(self.logfile_name, progress_cb=self.on_progress)
+        except Exception as e:
+            # Anything that stops the import, e.g. a parse error or a broken process pool, is reported by the GUI.
+            self.error = e
+
+    def on_progress(self, num_parsed: int, num_total: int) -> None:
+        self.progress = (num_parsed, num_total)
@@ -0,0 +1,141 @@
+import mmap
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Tuple, Union
+
+import numpy as np
+
+from Src.FrameBlock import FrameBlock
+from Src.FrameParser import parse_frame_block
+from Src.PathTable import PathTable, path_table
+
+frame_begin_symbol: bytes = b"##FRAME_INFO_BEGIN##"
+frame_end_symbol: bytes = b"##FRAME_INFO_END##"
+
+# Below this many frames a process pool costs more to start than it saves.
+min_frames_for_pool: int = 2000
+chunks_per_worker: int = 4
+
+
+def find_frame_blocks(buffer: Union[bytes, mmap.mmap]) -> List[Tuple[int, int]]:
+    """
+    Finds the sample lines of every complete frame block in a log.
+    :param buffer: Log contents, typically memory-mapped.
+    :return: Start and end byte offsets of each block's sample lines, in log order.
+    """
+
+    ranges: List[Tuple[int, int]] = list()
+
+    pos: int = buffer.find(frame_begin_symbol)
+    while pos != -1:
+        end: int = buffer.find(frame_end_symbol, pos)
+        if end == -1:
+            # Log was cut off mid-frame.
+            break
+
+        # Frames cut off by a crash are followed by a new begin symbol before the next end symbol.
+        begin: int = buffer.rfind(frame_begin_symbol, pos, end)
+
+        # Sample lines start on the line after the begin symbol.
+        lines_start: int = buffer.find(b"\n", begin, end)
+        if lines_start != -1:
+            ranges.append((lines_start + 1, end))
+
+        pos = buffer.find(frame_begin_symbol, end)
+
+    return ranges
+
+
+def parse_frame_blocks(buffer: Union[bytes, mmap.mmap], ranges: List[Tuple[int, int]],
+                       table: PathTable) -> List[FrameBlock]:
+    frame_blocks: List[FrameBlock] = list()
+    for start, end in ranges:
+        lines: List[str] = buffer[start:end].decode("utf-8", errors="replace").splitlines()
+        try:
+            frame_blocks.append(parse_frame_block(lines, table))
+        except ValueError:
+            # Skip malformed frames, same as when tailing the log.
+            continue
+
+    return frame_blocks
+
+
+def parse_log_chunk(logfile_name: str,
+                    ranges: List[Tuple[int, int]]) -> Tuple[List[str], List[str], List[FrameBlock]]:
+    """
+    Worker process entry point. Maps the log itself so only byte offsets have to be sent to the worker.
+    :return: Worker path table (path names and parent path names), and frame blocks using its path ids.
+    """
+
+    table: PathTable = PathTable()
+    with open(logfile_name, "rb") as logfile:
+        with mmap.mmap(logfile.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            frame_blocks: List[FrameBlock] = parse_frame_blocks(buffer, ranges, table)
+
+    parent_path_names: List[str] = [table.parent_path_name(i) for i in range(0, len(table))]
+
+    return table.path_names, parent_path_names, frame_blocks
+
+
+def remap_path_ids(path_names: List[str], parent_path_names: List[str], frame_blocks: List[FrameBlock]) -> None:
+    # Worker tables list parents before children, so interning in order keeps parent ids valid.
+    path_ids: np.ndarray = np.array([path_table.intern(p, q) for p, q in zip(path_names, parent_path_names)],
+                                    dtype=np.int32)
+
+    for frame_block in frame_blocks:
+        frame_block.samples["path_id"] = path_ids[frame_block.samples["path_id"]]
+
+
+def import_log(logfile_name: str,
+               progress_cb: Union[Callable[[int, int], None], None] = None,
+               max_workers: Union[int, None] = None) -> List[FrameBlock]:
+    """
+    Bulk-loads every frame already written to a log file.
+    Block boundaries are found with a byte search over the memory-mapped file, then blocks are parsed in parallel.
+    :param logfile_name: Unity editor or player log.
+    :param progress_cb: Called with (frames parsed, total frames) as chunks finish.
+    :param max_workers: Process pool size. Defaults to the CPU count.
+    :return: Frame blocks in log order, using the shared path table.
+    """
+
+    if os.path.getsize(logfile_name) == 0:
+        return list()
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    with open(logfile_name, "rb") as logfile:
+        with mmap.mmap(logfile.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            ranges: List[Tuple[int, int]] = find_frame_blocks(buffer)
+
+            if progress_cb:
+                progress_cb(0, len(ranges))
+
+            if len(ranges) < min_frames_for_pool or max_workers < 2:
+                frame_blocks: List[FrameBlock] = parse_frame_blocks(buffer, ranges, path_table)
+                if progress_cb:
+                    progress_cb(len(ranges), len(ranges))
+
+                return frame_blocks
+
+    num_chunks: int = max_workers * chunks_per_worker
+    chunk_size: int = (len(ranges) + num_chunks - 1) // num_chunks
+    chunks: List[List[Tuple[int, int]]] = [ranges[i:i + chunk_size] for i in range(0, len(ranges), chunk_size)]
+
+    chunk_results: List[List[FrameBlock]] = [list() for _ in chunks]
+    num_parsed: int = 0
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures: Dict[Future, int] = {pool.submit(parse_log_chunk, logfile_name, chunk): i
+                                      for i, chunk in enumerate(chunks)}
+
+        for future in as_completed(futures):
+            chunk_idx: int = futures[future]
+            path_names, parent_path_names, frame_blocks = future.result()
+            remap_path_ids(path_names, parent_path_names, frame_blocks)
+            chunk_results[chunk_idx] = frame_blocks
+
+            num_parsed += len(chunks[chunk_idx])
+            if progress_cb:
+                progress_cb(num_parsed, len(ranges))
+
+    return [frame_block for chunk in chunk_results for frame_block in chunk]
@@ -0,0 +1,108 @@
+import threading
+from typing import Dict, List, Union
+
+
+class PathTable:
+    """
+    Interns sample path names (e.g. /UdonBehaviour/Update/Func) to small integer ids.
+    Leaf name, depth and parent id are computed once per unique path instead of once per sample.
+    """
+
+    path_delimiter: str = "/"
+    no_parent_id: int = -1
+
+    def __init__(self) -> None:
+        self.path_ids: Dict[str, int] = dict()
+        self.path_names: List[str] = list()
+        self.names: List[str] = list()
+        self.depths: List[int] = list()
+        self.parent_ids: List[int] = list()
+
+        # Same sample name can be reached from several paths. Statistics are combined by name.
+        self.name_ids: List[int] = list()
+        self.unique_name_ids: Dict[str, int] = dict()
+        self.unique_names: List[str] = list()
+
+        # Lookups are lock-free. Only adding a new path takes the lock.
+        self.lock: threading.RLock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.path_names)
+
+    def intern(self, path_name: str, parent_path_name: str = "") -> int:
+        path_id: Union[int, None] = self.path_ids.get(path_name)
+        if path_id is not None:
+            return path_id
+
+        with self.lock:
+            return self.add_path(path_name, parent_path_name)
+
+    def add_path(self, path_name: str, parent_path_name: str) -> int:
+        # Another thread may have added the path while we waited for the lock.
+        path_id: Union[int, None] = self.path_ids.get(path_name)
+        if path_id is not None:
+            return path_id
+
+        if parent_path_name == path_name:
+            raise ValueError(f"can't add path {path_name} - it's its own parent")
+
+        # Profiler encodes parents before their children, so the parent is normally interned already.
+        parent_id: int = PathTable.no_parent_id
+        if parent_path_name:
+            parent_id = self.path_ids.get(parent_path_name, PathTable.no_parent_id)
+            if parent_id == PathTable.no_parent_id:
+                # A parent without a delimiter has no parent of its own.
+                grandparent_path_name: str = ""
+                if PathTable.path_delimiter in parent_path_name:
+                    grandparent_path_name = parent_path_name.rsplit(PathTable.path_delimiter, 1)[0]
+                parent_id = self.intern(parent_path_name, grandparent_path_name)
+
+        # Profiler builds child paths as parent path + delimiter + name, so the name may itself contain delimiters.
+        name: str
+        if parent_path_name and path_name.startswith(parent_path_name + PathTable.path_delimiter):
+            name = path_name[len(parent_path_name) + 1:]
+        else:
+            name = path_name.split(PathTable.path_delimiter)[-1]
+
+        depth: int = 0
+        if parent_id != PathTable.no_parent_id:
+            depth = self.depths[parent_id] + 1
+
+        name_id: Union[int, None] = self.unique_name_ids.get(name)
+        if name_id is None:
+            name_id = len(self.unique_names)
+            self.unique_name_ids[name] = name_id
+            self.unique_names.append(name)
+
+        # Append to the lookup lists before publishing the id, since other threads may read them.
+        path_id = len(self.path_names)
+        self.path_names.append(path_name)
+        self.names.append(name)
+        self.depths.append(depth)
+        self.parent_ids.append(parent_id)
+        self.name_ids.append(name_id)
+        self.path_ids[path_name] = path_id
+
+        return path_id
+
+    def parent_path_name(self, path_id: int) -> str:
+        parent_id: int = self.parent_ids[path_id]
+        if parent_id == PathTable.no_parent_id:
+            return ""
+
+        return self.path_names[parent_id]
+
+    def clear(self) -> None:
+        self.path_ids.clear()
+        self.path_names.clear()
+        self.names.clear()
+        self.depths.clear()
+        self.parent_ids.clear()
+        self.name_ids.clear()
+        self.unique_name_ids.clear()
+        self.unique_names.clear()
+
+
+# Shared by the whole pipeline so that ids stay valid between the ingest thread, the frame store and the views.
+# Ids are kept when frames are cleared.
+path_table: PathTable = PathTable()
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import math
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+
+class QuantileSketch:
+    """
+    Streaming quantile sketch with logarithmic buckets (DDSketch).
+    Every value lands in a bucket whose bounds are within relative_accuracy of each other, so any quantile is
+    estimated to within that relative error. The buckets are fixed, so memory doesn't grow with the number of values.
+    See: https://arxiv.org/abs/1908.10693
+    """
+
+    relative_accuracy: float = 0.01
+    # Times in ms. Values below the minimum are counted as zero, values above the maximum land in the last bucket.
+    min_value: float = 1e-4
+    max_value: float = 1e5
+
+    gamma: float = (1 + relative_accuracy) / (1 - relative_accuracy)
+    log_gamma: float = math.log(gamma)
+    num_buckets: int = int(math.ceil(math.log(max_value / min_value) / log_gamma)) + 1
+
+    def __init__(self) -> None:
+        self.counts: np.ndarray = np.zeros(QuantileSketch.num_buckets, dtype=np.int64)
+        self.zero_count: int = 0
+        self.count: int = 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value < QuantileSketch.min_value:
+            self.zero_count += 1
+            return
+
+        idx: int = int(math.log(value / QuantileSketch.min_value) / QuantileSketch.log_gamma)
+        self.counts[min(idx, QuantileSketch.num_buckets - 1)] += 1
+
+    def add_many(self, values: np.ndarray) -> None:
+        idxs: np.ndarray = QuantileSketch.get_bucket_indexes(values)
+        nonzero_idxs: np.ndarray = idxs[idxs >= 0]
+
+        self.add_counts(np.bincount(nonzero_idxs, minlength=QuantileSketch.num_buckets),
+                        len(values) - len(nonzero_idxs))
+
+    def add_counts(self, counts: np.ndarray, zero_count: int) -> None:
+        """
+        Adds values that were already counted into buckets, e.g. by get_bucket_indexes.
+        """
+
+        self.counts += counts
+        self.zero_count += zero_count
+        self.count += int(counts.sum()) + zero_count
+
+    @staticmethod
+    def get_bucket_indexes(values: np.ndarray) -> np.ndarray:
+        """
+        :return: Bucket index of each value, or -1 for values counted as zero.
+        """
+
+        # Values below the minimum are clamped to it rather than masked out, so every step is one pass over the values.
+        idxs: np.ndarray = (np.log(np.maximum(values, QuantileSketch.min_value) / QuantileSketch.min_value) /
+                            QuantileSketch.log_gamma).astype(np.int64)
+        np.minimum(idxs, QuantileSketch.num_buckets - 1, out=idxs)
+        idxs[values < QuantileSketch.min_value] = -1
+
+        return idxs
+
+    def merge(self, other: QuantileSketch) -> None:
+        self.add_counts(other.counts, other.zero_count)
+
+    @staticmethod
+    def bucket_value(idx: int) -> float:
+        # Midpoint in relative terms, so the error is at most relative_accuracy either side.
+        lower: float = QuantileSketch.min_value * QuantileSketch.gamma ** idx
+        return 2 * lower * QuantileSketch.gamma / (QuantileSketch.gamma + 1)
+
+    def get_quantiles(self, quantiles: Sequence[float]) -> List[float]:
+        """
+        :param quantiles: Quantiles between 0 and 1, e.g. 0.95 for p95.
+        :return: Estimated value of each quantile, or NaN if the sketch is empty.
+        """
+
+        if self.count == 0:
+            return [float("nan")] * len(quantiles)
+
+        cumulative_counts: np.ndarray = np.cumsum(self.counts)
+
+        values: List[float] = list()
+        for quantile in quantiles:
+            rank: float = quantile * (self.count - 1)
+            if rank < self.zero_count:
+                values.append(0.0)
+                continue
+
+            idx: int = int(np.searchsorted(cumulative_counts, rank - self.zero_count, side="right"))
+            values.append(QuantileSketch.bucket_value(min(idx, QuantileSketch.num_buckets - 1)))
+
+        return values
+
+    def get_histogram(self, max_bins: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :param max_bins: Most bins to return. Neighbouring buckets are combined into one bin to stay within it.
+        :return: Bin edges and counts between the lowest and highest non-empty bucket. Values counted as zero aren't
+                 included.
+        """
+
+        nonzero: np.ndarray = np.flatnonzero(self.counts)
+        if len(nonzero) == 0:
+            return np.zeros(0), np.zeros(0, dtype=np.int64)
+
+        first: int = int(nonzero[0])
+        bucket_counts: np.ndarray = self.counts[first:int(nonzero[-1]) + 1]
+
+        buckets_per_bin: int = -(-len(bucket_counts) // max(1, max_bins))
+        num_bins: int = -(-len(bucket_counts) // buckets_per_bin)
+        bin_counts: np.ndarray = np.zeros(num_bins * buckets_per_bin, dtype=np.int64)
+        bin_counts[:len(bucket_counts)] = bucket_counts
+        bin_counts = bin_counts.reshape(num_bins, buckets_per_bin).sum(axis=1)
+
+        edges: np.ndarray = QuantileSketch.min_value * QuantileSketch.gamma ** (
+            first + buckets_per_bin * np.arange(num_bins + 1))
+
+        return edges, bin_counts
+
+    def clear(self) -> None:
+        self.counts.fill(0)
+        self.zero_count = 0
+        self.count = 0
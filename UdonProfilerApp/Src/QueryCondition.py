@@ -0,0 +1,64 @@
+from dataclasses import dataclass
+from typing import Callable, Dict
+
+import numpy as np
+
+# Query column names, and the SampleSeries fields they read.
+query_columns: Dict[str, str] = {
+    "total_ms": "total_time_ms",
+    "self_ms": "self_time_ms",
+    "calls": "num_calls",
+    "percent": "total_time_percent",
+}
+
+# Two character operators first, so that a parser trying them in order doesn't read <= as <.
+query_operators: Dict[str, Callable[[np.ndarray, float], np.ndarray]] = {
+    "<=": np.less_equal,
+    ">=": np.greater_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+    "<": np.less,
+    ">": np.greater,
+}
+
+
+@dataclass
+class QueryCondition:
+    """
+    Comparison of one column of a sample path's series with a value, e.g. Update/Physics total_ms > 2.
+    """
+
+    path: str
+    column: str
+    operator: str
+    value: float
+
+    def __init__(self, path: str, column: str, operator: str, value: float) -> None:
+        if column not in query_columns:
+            raise ValueError(f"can't query column {column} - expected one of {', '.join(query_columns)}")
+        if operator not in query_operators:
+            raise ValueError(f"can't compare with {operator} - expected one of {' '.join(query_operators)}")
+
+        self.path = path
+        self.column = column
+        self.operator = operator
+        self.value = value
+
+    def __str__(self) -> str:
+        return f"{self.path} {self.column} {self.operator} {self.value:g}"
+
+    def evaluate(self, records: np.ndarray) -> np.ndarray:
+        """
+        :param records: Records in SampleSeries.series_dtype.
+        :return: Mask of the records that meet the condition.
+        """
+
+        values: np.ndarray = records[query_columns[self.column]]
+
+        # Percentages are stored in single precision. Compared at that precision, a percentage typed as shown compares
+        # equal to the stored value.
+        value: float = self.value
+        if values.dtype == np.float32:
+            value = np.float32(value)
+
+        return query_operators[self.operator](values, value)
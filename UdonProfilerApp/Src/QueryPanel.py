@@ -0,0 +1,129 @@
+from typing import Any
+
+import customtkinter as ctk
+import numpy as np
+
+
+class QueryPanel(ctk.CTkFrame):
+    """
+    Filter box that finds the frames meeting a query, e.g. Update/Physics total_ms > 2 and calls > 40, and steps
+    through them.
+    """
+
+    prev_match_text: str = "\u25c2 match"
+    next_match_text: str = "match \u25b8"
+    placeholder_text: str = "filter frames, e.g. Update/Physics total_ms > 2 and calls > 40"
+
+    def __init__(self, master) -> None:
+        super().__init__(master)
+
+        self.profiler: Any = master
+
+        # Indexes of the frames that met the last query, in ascending order.
+        self.match_frame_idxs: np.ndarray = np.zeros(0, dtype=np.int64)
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_columnconfigure((1, 4), weight=0)
+
+        self.query_entry: ctk.CTkEntry = ctk.CTkEntry(self, placeholder_text=QueryPanel.placeholder_text)
+        self.query_entry.grid(row=0, column=0, padx=(5, 0), pady=5, sticky="ew")
+        self.query_entry.bind("<Return>", lambda _: self.on_filter_btn_clicked())
+
+        self.filter_btn: ctk.CTkButton = ctk.CTkButton(self, text="filter", width=20,
+                                                       fg_color="transparent",
+                                                       hover=False,
+                                                       command=self.on_filter_btn_clicked)
+        self.filter_btn.grid(row=0, column=1, padx=(5, 0))
+
+        self.prev_match_btn: ctk.CTkButton = ctk.CTkButton(self, text=QueryPanel.prev_match_text, width=20,
+                                                           fg_color="transparent",
+                                                           hover=False,
+                                                           command=self.on_prev_match_btn_clicked)
+        self.prev_match_btn.grid(row=0, column=2)
+
+        self.next_match_btn: ctk.CTkButton = ctk.CTkButton(self, text=QueryPanel.next_match_text, width=20,
+                                                           fg_color="transparent",
+                                                           hover=False,
+                                                           command=self.on_next_match_btn_clicked)
+        self.next_match_btn.grid(row=0, column=3)
+
+        self.matches_label: ctk.CTkLabel = ctk.CTkLabel(self, text="Matches: -", width=150)
+        self.matches_label.grid(row=0, column=4, padx=5)
+
+        # Query errors are shown below the filter box, since they don't fit next to it.
+        self.error_label: ctk.CTkLabel = ctk.CTkLabel(self, text="", text_color="#EE4B2B", anchor="w")
+
+        self.set_matches(self.match_frame_idxs)
+
+    def on_filter_btn_clicked(self) -> None:
+        query: str = self.query_entry.get().strip()
+        if not query:
+            self.set_matches(np.zeros(0, dtype=np.int64))
+            return
+
+        try:
+            match_frame_idxs: np.ndarray = self.profiler.query_frames(query)
+        except ValueError as error:
+            self.set_matches(np.zeros(0, dtype=np.int64), str(error))
+            return
+
+        self.set_matches(match_frame_idxs)
+
+        # Show the first match after the selected frame, or the first one if the selected frame is past every match.
+        if len(match_frame_idxs) > 0:
+            frame_idx: int = self.get_next_match()
+            self.goto_match(frame_idx if frame_idx >= 0 else int(match_frame_idxs[0]))
+
+    def on_prev_match_btn_clicked(self) -> None:
+        frame_idx: int = self.get_prev_match()
+        if frame_idx >= 0:
+            self.goto_match(frame_idx)
+
+    def on_next_match_btn_clicked(self) -> None:
+        frame_idx: int = self.get_next_match()
+        if frame_idx >= 0:
+            self.goto_match(frame_idx)
+
+    def get_prev_match(self) -> int:
+        """
+        :return: Index of the last matching frame before the selected frame, or -1 if there's none.
+        """
+
+        idx: int = int(np.searchsorted(self.match_frame_idxs, self.profiler.get_selected_frame_idx(),
+                                       side="left")) - 1
+
+        return int(self.match_frame_idxs[idx]) if idx >= 0 else -1
+
+    def get_next_match(self) -> int:
+        """
+        :return: Index of the first matching frame after the selected frame, or -1 if there's none.
+        """
+
+        idx: int = int(np.searchsorted(self.match_frame_idxs, self.profiler.get_selected_frame_idx(), side="right"))
+
+        return int(self.match_frame_idxs[idx]) if idx < len(self.match_frame_idxs) else -1
+
+    def goto_match(self, frame_idx: int) -> None:
+        self.profiler.control_panel.goto_frame(frame_idx)
+
+        match_num: int = int(np.searchsorted(self.match_frame_idxs, frame_idx)) + 1
+        self.matches_label.configure(text=f"Matches: {match_num}/{len(self.match_frame_idxs)}")
+
+    def set_matches(self, match_frame_idxs: np.ndarray, error: str = "") -> None:
+        self.match_frame_idxs = match_frame_idxs
+
+        state: str = "normal" if len(match_frame_idxs) > 0 else "disabled"
+        self.prev_match_btn.configure(state=state)
+        self.next_match_btn.configure(state=state)
+
+        if error:
+            self.matches_label.configure(text="Matches: -")
+            self.error_label.configure(text=error)
+            self.error_label.grid(row=1, column=0, columnspan=5, padx=5, pady=(0, 5), sticky="ew")
+        else:
+            self.matches_label.configure(text=f"Matches: {len(match_frame_idxs)}" if self.query_entry.get().strip()
+                                         else "Matches: -")
+            self.error_label.grid_remove()
+
+    def on_frame_info_cleared(self) -> None:
+        self.set_matches(np.zeros(0, dtype=np.int64))
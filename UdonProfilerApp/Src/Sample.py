@@ -1,13 +1,12 @@
 from dataclasses import dataclass
 from typing import List
 
+from Src.PathTable import path_table
+
 
 @dataclass
 class Sample:
-    name: str
-    path_name: str
-    parent_path_name: str
-    depth: int
+    path_id: int
     total_time_percent: float
     self_time_percent: float
     num_calls: int
@@ -29,14 +28,11 @@ class Sample:
 
         arg_delimiter: str = ";"
         time_delimiter: str = ","
-        path_delimiter: str = "/"
 
         args: List[str] = raw_line.split(arg_delimiter)
 
-        self.path_name = args[path_name_idx]
-        self.name = self.path_name.split(path_delimiter)[-1]
-        self.parent_path_name = args[parent_path_name_idx]
-        self.depth = self.path_name.count(path_delimiter) - 1
+        # Name, depth and parent are looked up from the path table instead of being split out of every line.
+        self.path_id = path_table.intern(args[path_name_idx], args[parent_path_name_idx])
         self.total_time_percent = float(args[total_time_percent_idx])
         self.self_time_percent = float(args[self_time_percent_idx])
         self.num_calls = int(args[num_calls_idx])
@@ -49,3 +45,19 @@ class Sample:
 
         end_times_raw: List[str] = args[end_times_idx].split(time_delimiter)
         self.end_times = [float(t) for t in end_times_raw]
+
+    @property
+    def name(self) -> str:
+        return path_table.names[self.path_id]
+
+    @property
+    def path_name(self) -> str:
+        return path_table.path_names[self.path_id]
+
+    @property
+    def parent_path_name(self) -> str:
+        return path_table.parent_path_name(self.path_id)
+
+    @property
+    def depth(self) -> int:
+        return path_table.depths[self.path_id]
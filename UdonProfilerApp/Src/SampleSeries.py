@@ -0,0 +1,149 @@
+from collections import OrderedDict
+from typing import List, Union
+
+import numpy as np
+
+from Src.FrameStore import FrameStore
+from Utils.GrowableArray import GrowableArray
+
+
+class SampleSeries:
+    """
+    Time series of sample paths, i.e. the frames a path was sampled in and its times and calls there.
+    Series are built from the frame store when their path is first queried, and brought up to date with the frames
+    stored since on later queries, so a query on a path only reads that path's records instead of every sample of
+    every frame. Recording or opening frames doesn't build any series.
+    Only the series of recently queried paths are kept, up to a size limit. Series of other paths are dropped, and
+    built again if they're queried again.
+    """
+
+    series_dtype: np.dtype = np.dtype([
+        ("frame_idx", np.int32),
+        ("num_calls", np.int32),
+        ("total_time_ms", np.float64),
+        ("self_time_ms", np.float64),
+        # Parsed from two decimals, so single precision keeps every value.
+        ("total_time_percent", np.float32),
+    ])
+
+    # Sample fields read for the series records.
+    sample_fields: List[str] = ["path_id", "num_calls", "total_time_ms", "self_time_ms", "total_time_percent"]
+
+    # Most paths are sampled in few frames, so series start small.
+    initial_capacity: int = 16
+    # Frames read from the store at once when building series, which bounds the temporary arrays.
+    chunk_frames: int = 65536
+    # Size of the series kept, if no other limit is given.
+    max_bytes: int = 64 * 1024 * 1024
+
+    def __init__(self, frame_store: FrameStore, max_bytes: Union[int, None] = max_bytes) -> None:
+        """
+        :param frame_store: Frames the series are built from.
+        :param max_bytes: Size of the series to keep. Series of the least recently queried paths are dropped past it.
+                          No limit if None.
+        """
+
+        self.frame_store: FrameStore = frame_store
+        self.max_bytes: Union[int, None] = max_bytes
+
+        # Series by path id, least recently queried first. Every series covers the first num_frames frames.
+        self.series: OrderedDict[int, GrowableArray] = OrderedDict()
+        self.num_frames: int = 0
+
+    def __len__(self) -> int:
+        return self.num_frames
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(series) for series in self.series.values()) * SampleSeries.series_dtype.itemsize
+
+    def load(self, path_ids: List[int]) -> None:
+        """
+        Builds the series of paths that don't have one, and brings every series up to the last stored frame.
+        Series of the paths are kept even if they're over max_bytes on their own.
+        """
+
+        path_ids = list(dict.fromkeys(path_ids))
+        new_path_ids: List[int] = [path_id for path_id in path_ids if path_id not in self.series]
+        for path_id in new_path_ids:
+            self.series[path_id] = GrowableArray(SampleSeries.series_dtype, capacity=SampleSeries.initial_capacity)
+
+        # New series catch up to the others first, so that every series can then be extended from the same frame.
+        self.add_frames(new_path_ids, 0, self.num_frames)
+        self.add_frames(list(self.series.keys()), self.num_frames, len(self.frame_store))
+        self.num_frames = len(self.frame_store)
+
+        for path_id in path_ids:
+            self.series.move_to_end(path_id)
+        self.drop_series(len(path_ids))
+
+    def add_frames(self, path_ids: List[int], start_frame_idx: int, stop_frame_idx: int) -> None:
+        """
+        Appends the samples of some paths in a range of stored frames to their series.
+        """
+
+        if not path_ids:
+            return
+
+        for chunk_start in range(start_frame_idx, stop_frame_idx, SampleSeries.chunk_frames):
+            chunk_stop: int = min(chunk_start + SampleSeries.chunk_frames, stop_frame_idx)
+            frames: np.ndarray = self.frame_store.frames.get(chunk_start, chunk_stop)
+
+            # Frames' samples are stored back to back, so a chunk of frames is one slice of the sample table. Only
+            # its path ids are read to find the samples of the paths, then only those samples.
+            sample_start: int = int(frames[0]["sample_offset"])
+            sample_stop: int = int(frames[-1]["sample_offset"] + frames[-1]["num_samples"])
+            sample_path_ids: np.ndarray = self.frame_store.get_samples(sample_start, sample_stop,
+                                                                       ["path_id"])["path_id"]
+            sample_idxs: np.ndarray = np.flatnonzero(np.isin(sample_path_ids, path_ids))
+            if len(sample_idxs) == 0:
+                continue
+
+            frame_idxs: np.ndarray = np.repeat(np.arange(chunk_start, chunk_stop, dtype=np.int32),
+                                               frames["num_samples"])
+            samples: np.ndarray = self.frame_store.take_samples(sample_idxs + sample_start,
+                                                                SampleSeries.sample_fields)
+            records: np.ndarray = SampleSeries.make_records(frame_idxs[sample_idxs], samples)
+
+            for path_id in path_ids:
+                self.series[path_id].extend(records[samples["path_id"] == path_id])
+
+    def drop_series(self, num_kept: int) -> None:
+        """
+        Drops the series of the least recently queried paths until the series fit in max_bytes. The num_kept series
+        queried last are always kept.
+        """
+
+        if self.max_bytes is None:
+            return
+
+        nbytes: int = self.nbytes
+        while nbytes > self.max_bytes and len(self.series) > num_kept:
+            _, series = self.series.popitem(last=False)
+            nbytes -= len(series) * SampleSeries.series_dtype.itemsize
+
+    @staticmethod
+    def make_records(frame_idxs: np.ndarray, samples: np.ndarray) -> np.ndarray:
+        records: np.ndarray = np.empty(len(samples), dtype=SampleSeries.series_dtype)
+        records["frame_idx"] = frame_idxs
+        records["num_calls"] = samples["num_calls"]
+        records["total_time_ms"] = samples["total_time_ms"]
+        records["self_time_ms"] = samples["self_time_ms"]
+        records["total_time_percent"] = samples["total_time_percent"]
+
+        return records
+
+    def get(self, path_id: int) -> np.ndarray:
+        """
+        :return: Records of a path in series_dtype, in frame order, up to the last stored frame. View, only valid
+                 until the series are next loaded.
+        """
+
+        if path_id not in self.series or self.num_frames != len(self.frame_store):
+            self.load([path_id])
+
+        return self.series[path_id].data
+
+    def clear(self) -> None:
+        self.series.clear()
+        self.num_frames = 0
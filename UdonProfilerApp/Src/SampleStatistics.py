@@ -1,4 +1,11 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+
+from Src.QuantileSketch import QuantileSketch
 
 
 @dataclass
@@ -9,6 +16,11 @@ class SampleStatistics:
     avg_time: float
     total_time: float
     num_samples: int
+    # Sum of squared differences from the mean, for Welford's variance.
+    # See: https://en.wikipedia.org/wiki/Algorithms_for_calculating_variance#Welford's_online_algorithm
+    sum_sq_diff: float
+    # Distribution of times, for percentiles. Fixed size, so memory stays constant however long the recording is.
+    sketch: QuantileSketch
 
     def __init__(self, name: str) -> None:
         self.name = name
@@ -17,10 +29,82 @@ class SampleStatistics:
         self.avg_time = float("inf")
         self.total_time = 0
         self.num_samples = 0
+        self.sum_sq_diff = 0
+        self.sketch = QuantileSketch()
 
     def add_statistic(self, time: float) -> None:
         self.min_time = min(time, self.min_time)
         self.max_time = max(time, self.max_time)
         self.total_time += time
         self.num_samples += 1
+
+        prev_avg_time: float = self.avg_time if self.num_samples > 1 else 0
+        self.avg_time = prev_avg_time + (time - prev_avg_time) / self.num_samples
+        self.sum_sq_diff += (time - prev_avg_time) * (time - self.avg_time)
+
+        self.sketch.add(time)
+
+    def add_statistics(self, times: np.ndarray) -> None:
+        """
+        Adds a batch of times at once, e.g. every time of this sample in a batch of imported frames.
+        """
+
+        if len(times) == 0:
+            return
+
+        avg_time: float = float(times.mean())
+        idxs: np.ndarray = QuantileSketch.get_bucket_indexes(times)
+        nonzero_idxs: np.ndarray = idxs[idxs >= 0]
+
+        self.add_aggregates(len(times), float(times.min()), float(times.max()), float(times.sum()),
+                            float(np.square(times - avg_time).sum()),
+                            np.bincount(nonzero_idxs, minlength=QuantileSketch.num_buckets),
+                            len(times) - len(nonzero_idxs))
+
+    def merge(self, other: SampleStatistics) -> None:
+        self.add_aggregates(other.num_samples, other.min_time, other.max_time, other.total_time, other.sum_sq_diff,
+                            other.sketch.counts, other.sketch.zero_count)
+
+    def add_aggregates(self, num_samples: int, min_time: float, max_time: float, total_time: float,
+                       sum_sq_diff: float, bucket_counts: np.ndarray, zero_count: int) -> None:
+        """
+        Merges statistics of a batch of times that were aggregated elsewhere, e.g. by a vectorized group-by.
+        :param sum_sq_diff: Sum of squared differences of the batch's times from the batch's mean.
+        :param bucket_counts: Batch's times counted into QuantileSketch buckets.
+        :param zero_count: Batch's times counted as zero by QuantileSketch.
+        """
+
+        if num_samples == 0:
+            return
+
+        # Combine the batch's mean and squared differences with ours.
+        # See: https://en.wikipedia.org/wiki/Algorithms_for_calculating_variance#Parallel_algorithm
+        prev_avg_time: float = self.avg_time if self.num_samples > 0 else 0
+        total_samples: int = self.num_samples + num_samples
+        delta: float = total_time / num_samples - prev_avg_time
+        self.sum_sq_diff += sum_sq_diff + delta * delta * self.num_samples * num_samples / total_samples
+
+        self.min_time = min(min_time, self.min_time)
+        self.max_time = max(max_time, self.max_time)
+        self.total_time += total_time
+        self.num_samples = total_samples
         self.avg_time = self.total_time / self.num_samples
+
+        self.sketch.add_counts(bucket_counts, zero_count)
+
+    @property
+    def std_time(self) -> float:
+        if self.num_samples < 2:
+            return 0
+
+        return (self.sum_sq_diff / (self.num_samples - 1)) ** 0.5
+
+    def get_percentiles(self, percentiles: Sequence[float]) -> List[float]:
+        """
+        :param percentiles: Percentiles between 0 and 100.
+        :return: Estimated time of each percentile, within the sketch's relative accuracy and clamped to the
+                 recorded min and max.
+        """
+
+        times: List[float] = self.sketch.get_quantiles([p / 100 for p in percentiles])
+        return [min(max(t, self.min_time), self.max_time) for t in times]
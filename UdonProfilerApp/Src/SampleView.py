@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from Src.FrameStore import FrameStore
+
+
+@dataclass
+class SampleView:
+    """
+    Sample read back from a frame store. Mirrors the fields of Sample.
+    Start and end times are views into the store's time arrays rather than copies.
+    """
+
+    path_id: int
+    name: str
+    path_name: str
+    parent_path_name: str
+    depth: int
+    total_time_percent: float
+    self_time_percent: float
+    num_calls: int
+    total_time_ms: float
+    self_time_ms: float
+    start_times: np.ndarray
+    end_times: np.ndarray
+
+    def __init__(self, store: FrameStore, record: np.void) -> None:
+        """
+        :param record: Sample record in FrameStore.sample_dtype.
+        """
+
+        self.path_id = int(record["path_id"])
+
+        self.name = store.path_table.names[self.path_id]
+        self.path_name = store.path_table.path_names[self.path_id]
+        self.parent_path_name = store.path_table.parent_path_name(self.path_id)
+        self.depth = store.path_table.depths[self.path_id]
+        self.total_time_percent = float(record["total_time_percent"])
+        self.self_time_percent = float(record["self_time_percent"])
+        self.num_calls = int(record["num_calls"])
+        self.total_time_ms = float(record["total_time_ms"])
+        self.self_time_ms = float(record["self_time_ms"])
+
+        time_offset: int = int(record["time_offset"])
+        times: np.ndarray = store.times.get(time_offset, time_offset + int(record["num_times"]))
+        self.start_times = times["start_time"]
+        self.end_times = times["end_time"]
@@ -0,0 +1,104 @@
+from typing import Dict
+
+import numpy as np
+
+from Src.FrameStore import FrameStore
+from Src.PathTable import PathTable, path_table
+from Src.QuantileSketch import QuantileSketch
+from Src.SampleStatistics import SampleStatistics
+
+
+def aggregate_samples(samples: np.ndarray, table: PathTable = path_table) -> Dict[int, SampleStatistics]:
+    """
+    Computes per-sample-name statistics for a batch of stored samples with NumPy reductions grouped by name.
+    :param samples: Records in FrameStore.sample_dtype, or with only its path_id and total_time_ms fields.
+    :param table: Path table the samples' path ids refer to.
+    :return: Statistics by sample name id, for every name in the batch.
+    """
+
+    statistics: Dict[int, SampleStatistics] = dict()
+    if len(samples) == 0:
+        return statistics
+
+    # Every reduction is a bincount or a ufunc.at over name ids, so there's no sort and cost is linear in samples.
+    num_names: int = len(table.unique_names)
+    name_ids: np.ndarray = np.asarray(table.name_ids, dtype=np.int64)[samples["path_id"]]
+    # Contiguous copy, since every reduction below would otherwise copy the strided record field itself.
+    times: np.ndarray = np.ascontiguousarray(samples["total_time_ms"])
+
+    counts: np.ndarray = np.bincount(name_ids, minlength=num_names)
+    totals: np.ndarray = np.bincount(name_ids, weights=times, minlength=num_names)
+    sums_sq: np.ndarray = np.bincount(name_ids, weights=np.square(times), minlength=num_names)
+
+    min_times: np.ndarray = np.full(num_names, np.inf)
+    max_times: np.ndarray = np.full(num_names, -np.inf)
+    np.minimum.at(min_times, name_ids, times)
+    np.maximum.at(max_times, name_ids, times)
+
+    # Only names in the batch get statistics. Their ids are packed into consecutive group indexes, so the sketch
+    # counts are sized by the names in the batch rather than by every name.
+    group_name_ids: np.ndarray = np.flatnonzero(counts)
+    num_groups: int = len(group_name_ids)
+    name_groups: np.ndarray = np.zeros(num_names, dtype=np.int64)
+    name_groups[group_name_ids] = np.arange(num_groups)
+    group_idxs: np.ndarray = name_groups[name_ids]
+
+    counts = counts[group_name_ids]
+    totals = totals[group_name_ids]
+    # Sum of squared differences from the mean, from the sums of squares. Rounding can leave it slightly negative.
+    sum_sq_diffs: np.ndarray = np.maximum(sums_sq[group_name_ids] - np.square(totals) / counts, 0)
+
+    # Count every group's sketch buckets with one bincount over (group, bucket) pairs. Values counted as zero have
+    # bucket index -1, so they're counted in an extra first bucket.
+    num_buckets: int = QuantileSketch.num_buckets + 1
+    bucket_counts: np.ndarray = np.bincount(group_idxs * num_buckets + (QuantileSketch.get_bucket_indexes(times) + 1),
+                                            minlength=num_groups * num_buckets).reshape(num_groups, num_buckets)
+    zero_counts: np.ndarray = bucket_counts[:, 0]
+    bucket_counts = bucket_counts[:, 1:]
+
+    for i, name_id in enumerate(group_name_ids.tolist()):
+        sample_statistics: SampleStatistics = SampleStatistics(table.unique_names[name_id])
+        sample_statistics.add_aggregates(int(counts[i]), float(min_times[name_id]), float(max_times[name_id]),
+                                         float(totals[i]), float(sum_sq_diffs[i]), bucket_counts[i],
+                                         int(zero_counts[i]))
+        statistics[name_id] = sample_statistics
+
+    return statistics
+
+
+def aggregate_frame_range(frame_store: FrameStore, start_frame_idx: int,
+                          stop_frame_idx: int) -> Dict[int, SampleStatistics]:
+    """
+    Computes per-sample-name statistics over a range of stored frames.
+    :param start_frame_idx: Index of the first frame in the range.
+    :param stop_frame_idx: Index one past the last frame in the range. Clamped to the number of frames.
+    """
+
+    start_frame_idx = max(0, start_frame_idx)
+    stop_frame_idx = min(stop_frame_idx, len(frame_store))
+    if start_frame_idx >= stop_frame_idx:
+        return dict()
+
+    # Frames' samples are stored back to back, so a frame range is one slice of the sample table.
+    sample_start, _ = frame_store.get_sample_range(start_frame_idx)
+    _, sample_stop = frame_store.get_sample_range(stop_frame_idx - 1)
+
+    return aggregate_samples(frame_store.get_samples(sample_start, sample_stop), frame_store.path_table)
+
+
+def aggregate_frames(frame_store: FrameStore, frame_idxs: np.ndarray) -> Dict[int, SampleStatistics]:
+    """
+    Computes per-sample-name statistics over any selection of stored frames, e.g. every frame over a budget.
+    :param frame_idxs: Indexes of the selected frames.
+    """
+
+    frames: np.ndarray = frame_store.frames.take(frame_idxs)
+    sample_offsets: np.ndarray = frames["sample_offset"]
+    num_samples: np.ndarray = frames["num_samples"]
+
+    # Concatenate every selected frame's sample range without a Python loop.
+    run_starts: np.ndarray = np.cumsum(num_samples) - num_samples
+    sample_idxs: np.ndarray = np.arange(int(num_samples.sum())) + np.repeat(sample_offsets - run_starts, num_samples)
+
+    return aggregate_samples(frame_store.take_samples(sample_idxs, ["path_id", "total_time_ms"]),
+                             frame_store.path_table)
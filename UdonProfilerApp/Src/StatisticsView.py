@@ -1,23 +1,88 @@
-from typing import Dict, List, Union
+from typing import Any, Dict, Hashable, List, Set, Tuple, Union
 
 import customtkinter as ctk
+import numpy as np
 
 from Widgets.Tree.TreeWidget import TreeWidget, TreeColumnConfig
-from Src.FrameInfo import FrameInfo
+from Src.FrameStore import FrameStore
 from Src.SampleStatistics import SampleStatistics
+from Src.StatisticsAggregation import aggregate_frame_range
 
 
 class StatisticsView(ctk.CTkFrame):
-    def __init__(self, master, **kwargs) -> None:
+    percentiles: Tuple[int, ...] = (50, 95, 99)
+    # Rows are refreshed at most this often (4 Hz), however fast frames arrive.
+    refresh_interval_ms: int = 250
+    # Frames aggregated per refresh at most. An opened capture is aggregated over several refreshes instead of all
+    # at once, so the window stays responsive however large the capture is.
+    max_refresh_frames: int = 16384
+    # Bins of the selected sample's time distribution.
+    histogram_bins: int = 60
+
+    def __init__(self, master, refresh_interval_ms: int = refresh_interval_ms, **kwargs) -> None:
         super().__init__(master, **kwargs)
 
+        self.refresh_interval_ms: int = refresh_interval_ms
+
         self.grid_columnconfigure(0, weight=1)
-        self.grid_rowconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=0)
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_rowconfigure(2, weight=0)
+
+        # Keyed by sample name id, so samples reached from different paths are combined.
+        self.sample_statistics: Dict[int, SampleStatistics] = dict()
+        # Frames in the frame store that are already in sample_statistics.
+        self.num_aggregated_frames: int = 0
+        # Names whose statistics changed since their rows were last updated.
+        self.changed_name_ids: Set[int] = set()
+        # Data shown in each row, so rows whose values didn't change aren't touched.
+        self.item_data: Dict[int, List[Any]] = dict()
+
+        # Statistics over the frame range picked in the range selector, shown instead of the running statistics.
+        self.frame_range: Union[Tuple[int, int], None] = None
+        self.range_statistics: Dict[int, SampleStatistics] = dict()
+        # Pending refresh timer callback, if the timer is running.
+        self.refresh_after_id: Union[str, None] = None
+        # Name id of the selected row, whose time distribution is shown below the rows.
+        self.sel_name_id: Union[int, None] = None
+
+        # Layout:
+        # Frames [first] - [last] apply all
+        self.range_frame: ctk.CTkFrame = ctk.CTkFrame(self, fg_color="transparent")
+        self.range_frame.grid(row=0, column=0, padx=5, pady=(5, 0), sticky="w")
+
+        self.range_lbl: ctk.CTkLabel = ctk.CTkLabel(self.range_frame, text="Frames")
+        self.range_lbl.grid(row=0, column=0, padx=(0, 5))
+
+        self.first_frame_entry: ctk.CTkEntry = ctk.CTkEntry(self.range_frame, width=80, placeholder_text="first")
+        self.first_frame_entry.grid(row=0, column=1)
+
+        self.range_separator_lbl: ctk.CTkLabel = ctk.CTkLabel(self.range_frame, text="-")
+        self.range_separator_lbl.grid(row=0, column=2, padx=5)
 
-        self.sample_statistics: Dict[str, SampleStatistics] = dict()
+        self.last_frame_entry: ctk.CTkEntry = ctk.CTkEntry(self.range_frame, width=80, placeholder_text="last")
+        self.last_frame_entry.grid(row=0, column=3)
 
-        self.tree: TreeWidget = TreeWidget(self)
-        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.apply_range_btn: ctk.CTkButton = ctk.CTkButton(self.range_frame, text="apply", width=20,
+                                                            fg_color="transparent",
+                                                            hover=False,
+                                                            command=self.on_apply_range_btn_clicked)
+        self.apply_range_btn.grid(row=0, column=4, padx=(5, 0))
+
+        self.all_frames_btn: ctk.CTkButton = ctk.CTkButton(self.range_frame, text="all", width=20,
+                                                           fg_color="transparent",
+                                                           hover=False,
+                                                           command=self.on_all_frames_btn_clicked)
+        self.all_frames_btn.grid(row=0, column=5)
+
+        self.tree: TreeWidget = TreeWidget(self, virtualized=True, select_cb=self.on_row_selected)
+        self.tree.grid(row=1, column=0, sticky="nsew")
+
+        # Imported here so that matplotlib is only loaded once the view is created, not when the app is imported.
+        from Widgets.HistogramPlot.HistogramPlotWidget import HistogramPlotWidget
+
+        self.histogram: HistogramPlotWidget = HistogramPlotWidget(self, height=150, x_label="Time (ms)")
+        self.histogram.grid(row=2, column=0, padx=5, pady=(0, 5), sticky="ew")
 
         overview_col_config: TreeColumnConfig = TreeColumnConfig(
             name="Overview",
@@ -34,19 +99,29 @@ class StatisticsView(ctk.CTkFrame):
         min_time_col_config: TreeColumnConfig = TreeColumnConfig(
             name="Min Time (ms)",
             minsize=100,
-            weight=0
+            weight=0,
+            fmt="{:.2f}"
         )
 
         max_time_col_config: TreeColumnConfig = TreeColumnConfig(
             name="Max Time (ms)",
             minsize=100,
-            weight=0
+            weight=0,
+            fmt="{:.2f}"
         )
 
         avg_time_col_config: TreeColumnConfig = TreeColumnConfig(
             name="Avg Time (ms)",
             minsize=100,
-            weight=0
+            weight=0,
+            fmt="{:.2f}"
+        )
+
+        std_time_col_config: TreeColumnConfig = TreeColumnConfig(
+            name="Std Dev (ms)",
+            minsize=100,
+            weight=0,
+            fmt="{:.2f}"
         )
 
         cols_config: List[TreeColumnConfig] = list()
@@ -55,6 +130,14 @@ class StatisticsView(ctk.CTkFrame):
         cols_config.append(min_time_col_config)
         cols_config.append(max_time_col_config)
         cols_config.append(avg_time_col_config)
+        cols_config.append(std_time_col_config)
+        for percentile in StatisticsView.percentiles:
+            cols_config.append(TreeColumnConfig(
+                name=f"P{percentile} (ms)",
+                minsize=100,
+                weight=0,
+                fmt="{:.2f}"
+            ))
 
         self.tree.config_tree(cols_config)
 
@@ -62,7 +145,7 @@ class StatisticsView(ctk.CTkFrame):
 
         """
         root: Any = self.winfo_toplevel()
-        info: Union[FrameInfo, None] = root.get_selected_frame_info()
+        info: Union[FrameView, None] = root.get_selected_frame_info()
         if not info:
             info = FrameInfo(0)
             info.add_sample(Sample("/UdonBehaviour,,0,0.400"))
@@ -78,63 +161,214 @@ class StatisticsView(ctk.CTkFrame):
 
         self.tree.render_tree()
 
-    def update_statistics(self, frame_info: FrameInfo) -> None:
-        for sample in frame_info.samples:
-            name: str = sample.path_name.split("/")[-1]
+        # Statistics are read from the frame store on a timer instead of per received frame, so a burst of frames
+        # costs one batched aggregation and one tree update. Timer only runs while the view is shown, e.g. not while
+        # another tab is selected, and the view catches up on the frames recorded meanwhile once it's shown again.
+        self.bind("<Map>", lambda _: self.on_mapped(), add="+")
+        self.bind("<Unmap>", lambda _: self.stop_refresh_timer(), add="+")
+
+    def on_mapped(self) -> None:
+        self.refresh_statistics()
+        self.start_refresh_timer()
+
+    def start_refresh_timer(self) -> None:
+        if self.refresh_after_id is None:
+            self.refresh_after_id = self.after(self.refresh_interval_ms, self.on_refresh_timer)
+
+    def stop_refresh_timer(self) -> None:
+        if self.refresh_after_id is not None:
+            self.after_cancel(self.refresh_after_id)
+            self.refresh_after_id = None
+
+    def on_refresh_timer(self) -> None:
+        self.refresh_after_id = None
+        if not self.winfo_ismapped():
+            return
+
+        self.refresh_statistics()
+        self.start_refresh_timer()
+
+    def refresh_statistics(self) -> None:
+        """
+        Folds frames recorded since the last refresh into the statistics, then updates the rows whose values changed.
+        Frames past max_refresh_frames are left to the next refreshes.
+        Does nothing while the view is hidden. Frames recorded meanwhile are folded in once it's shown again.
+        """
+
+        if not self.winfo_ismapped():
+            return
+
+        root: Any = self.winfo_toplevel()
+        frame_store: FrameStore = root.frame_store
+
+        # Every frame since the last refresh in one batch, instead of one frame at a time as they arrive.
+        num_frames: int = min(len(frame_store), self.num_aggregated_frames + StatisticsView.max_refresh_frames)
+        if num_frames > self.num_aggregated_frames:
+            self.merge_statistics(aggregate_frame_range(frame_store, self.num_aggregated_frames, num_frames))
+            self.num_aggregated_frames = num_frames
+
+        # Range statistics don't change as frames arrive.
+        if self.frame_range:
+            return
 
-            if name not in self.sample_statistics:
-                self.sample_statistics[name] = SampleStatistics(name)
+        self.update_changed_items()
 
-            self.sample_statistics[name].add_statistic(sample.total_time_ms)
+    def merge_statistics(self, batch_statistics: Dict[int, SampleStatistics]) -> None:
+        for name_id, statistics in batch_statistics.items():
+            prev_statistics: Union[SampleStatistics, None] = self.sample_statistics.get(name_id)
+            if prev_statistics is None:
+                self.sample_statistics[name_id] = statistics
+            else:
+                prev_statistics.merge(statistics)
 
-    def add_items(self) -> None:
-        for name in self.sample_statistics.keys():
-            self.add_item(self.sample_statistics[name])
+            self.changed_name_ids.add(name_id)
 
-    def add_item(self, item: SampleStatistics, selected: bool = False) -> None:
+    def update_changed_items(self) -> None:
+        if self.sel_name_id in self.changed_name_ids:
+            self.update_histogram()
+
+        entries_changed: bool = False
+        for name_id in self.changed_name_ids:
+            data: List[Any] = StatisticsView.get_item_data(self.sample_statistics[name_id])
+            if self.item_data.get(name_id) == data:
+                continue
+
+            self.add_item(name_id, data)
+            entries_changed = True
+
+        self.changed_name_ids.clear()
+
+        if entries_changed:
+            self.tree.render_tree()
+
+    def on_row_selected(self, name_id: Union[int, None]) -> None:
+        self.sel_name_id = name_id
+        self.update_histogram()
+
+    def update_histogram(self) -> None:
+        """
+        Shows the time distribution of the selected row's sample, from its quantile sketch.
+        """
+
+        statistics: Union[SampleStatistics, None] = None
+        if self.sel_name_id is not None:
+            statistics = self.get_shown_statistics().get(self.sel_name_id)
+
+        if statistics is None:
+            self.histogram.set_histogram(np.zeros(0), np.zeros(0, dtype=np.int64))
+            return
+
+        edges, counts = statistics.sketch.get_histogram(StatisticsView.histogram_bins)
+        self.histogram.set_histogram(edges, counts, f"{statistics.name} ({statistics.num_samples} samples)")
+
+    def get_shown_statistics(self) -> Dict[int, SampleStatistics]:
+        if self.frame_range:
+            return self.range_statistics
+
+        return self.sample_statistics
+
+    @staticmethod
+    def get_item_data(item: SampleStatistics) -> List[Any]:
+        # Values stay numbers, so columns sort numerically. Tree columns format them.
+        data: List[Any] = [item.name,
+                           item.num_samples,
+                           item.min_time,
+                           item.max_time,
+                           item.avg_time,
+                           item.std_time]
+        data.extend(item.get_percentiles(StatisticsView.percentiles))
+
+        return data
+
+    def add_item(self, name_id: int, data: List[Any], selected: bool = False) -> None:
         # Clearing tree and re-adding entries freezes application.
-        if self.tree.contains_entry(item.name):
-            self.tree.update_entry(item.name,
-                                   [item.name,
-                                    f"{item.num_samples}",
-                                    f"{item.min_time:.2f}",
-                                    f"{item.max_time:.2f}",
-                                    f"{item.avg_time:.2f}"])
+        if self.tree.contains_entry(name_id):
+            self.tree.update_entry(name_id, data)
         else:
-            self.tree.add_entry(item.name,
+            self.tree.add_entry(name_id,
                                 0,
-                                [item.name,
-                                 f"{item.num_samples}",
-                                 f"{item.min_time:.2f}",
-                                 f"{item.max_time:.2f}",
-                                 f"{item.avg_time:.2f}"],
+                                data,
                                 "",
                                 default_expand=False,
                                 default_select=selected)
 
-    def on_frame_info_received(self, frame_info: FrameInfo) -> None:
-        # Save previous frame expand states.
-        if not self.tree.body:
-            raise RuntimeError("Tree body reference lost")
+        self.item_data[name_id] = data
+
+    def on_frames_imported(self, frame_store: FrameStore, first_frame_idx: int) -> None:
+        # Show the first imported frames right away rather than on the next refresh. Later refreshes fold in the rest.
+        self.refresh_statistics()
+
+    def show_frame_range(self, first_frame_num: int, last_frame_num: int) -> None:
+        """
+        Shows statistics over a range of frames instead of every frame, until show_all_frames is called.
+        :param first_frame_num: Number of the first frame in the range.
+        :param last_frame_num: Number of the last frame in the range, inclusive.
+        """
+
+        root: Any = self.winfo_toplevel()
+        frame_store: FrameStore = root.frame_store
 
-        # Save previous frame selected entry.
-        sel_entry_name: Union[str, None] = None
-        if self.tree.body.sel_entry:
-            sel_entry_name = self.tree.body.sel_entry.entry_config.name
+        self.frame_range = (first_frame_num, last_frame_num)
+        self.range_statistics = aggregate_frame_range(frame_store,
+                                                      first_frame_num - frame_store.first_frame_number,
+                                                      last_frame_num - frame_store.first_frame_number + 1)
+        self.refresh_items()
 
-        self.update_statistics(frame_info)
+    def show_all_frames(self) -> None:
+        self.frame_range = None
+        self.range_statistics = dict()
+        self.refresh_items()
 
-        # Add new entries to tree.
-        for name in self.sample_statistics.keys():
-            selected: bool = False
-            if sel_entry_name and name == sel_entry_name:
-                selected = True
-            self.add_item(self.sample_statistics[name], selected=selected)
+    def refresh_items(self) -> None:
+        # Different set of statistics, so rebuild the tree instead of updating it.
+        sel_entry_name: Union[Hashable, None] = self.tree.get_selected_name()
+        self.tree.clear_tree()
+        self.item_data.clear()
+        self.changed_name_ids.clear()
+
+        statistics: Dict[int, SampleStatistics] = self.get_shown_statistics()
+        for name_id in statistics.keys():
+            self.add_item(name_id, StatisticsView.get_item_data(statistics[name_id]),
+                          selected=name_id == sel_entry_name)
 
         self.tree.render_tree()
+        self.update_histogram()
+
+    def on_apply_range_btn_clicked(self) -> None:
+        try:
+            first_frame_num: int = int(self.first_frame_entry.get())
+            last_frame_num: int = int(self.last_frame_entry.get())
+        except ValueError:
+            return
+
+        if first_frame_num > last_frame_num:
+            first_frame_num, last_frame_num = last_frame_num, first_frame_num
+
+        self.show_frame_range(first_frame_num, last_frame_num)
+
+    def on_all_frames_btn_clicked(self) -> None:
+        self.first_frame_entry.delete(0, "end")
+        self.last_frame_entry.delete(0, "end")
+        self.show_all_frames()
 
     def on_frame_info_cleared(self) -> None:
+        # Pending refresh was for the old frames. Timer is restarted below if the view is shown.
+        self.stop_refresh_timer()
         self.sample_statistics.clear()
+        self.num_aggregated_frames = 0
+        self.changed_name_ids.clear()
+        self.item_data.clear()
+        self.frame_range = None
+        self.range_statistics = dict()
         self.sel_sample_name = None
+        self.sel_name_id = None
         self.tree.clear_tree()
         self.tree.render_tree()
+        self.update_histogram()
+
+        if self.winfo_ismapped():
+            self.start_refresh_timer()
+
+    def destroy(self) -> None:
+        self.stop_refresh_timer()
+        super().destroy()
@@ -1,8 +1,9 @@
 from typing import List
 
 import customtkinter as ctk
+import numpy as np
 
-from Src.FrameInfo import FrameInfo
+from Src.FrameView import FrameView
 
 from Widgets.TimelineBarPlot.TimelineBarPlotWidget import TimelineBarPlotWidget
 
@@ -28,34 +29,47 @@ class TimelineView(ctk.CTkFrame):
         #     self.timeline_plot.add_bar(f"VeryLongTextLabel #{i}", h, TimelineView.bar_height, 5, 15, c,
         #                                TimelineView.text_color, TimelineView.font_size)
 
-    def on_frame_info_received(self, frame_info: FrameInfo) -> None:
-        self.timeline_plot.clear()
+    def on_frame_info_received(self, frame_info: FrameView) -> None:
+        if not frame_info.samples:
+            self.timeline_plot.clear()
+            return
 
-        start = frame_info.samples[0].start_times[0]
+        names: List[str] = list()
+        depths: List[np.ndarray] = list()
+        starts: List[np.ndarray] = list()
+        ends: List[np.ndarray] = list()
         for sample in frame_info.samples:
+            sample_starts: np.ndarray = sample.start_times
+            sample_ends: np.ndarray = sample.end_times
+
             # Parent block covers entirety of child blocks.
             if sample.depth < frame_info.max_depth:
-                delta: float = sample.end_times[-1] - sample.start_times[0]
-                if delta <= 0:
-                    continue
-
-                self.timeline_plot.add_bar(sample.name, 1 - TimelineView.bar_height -
-                                           sample.depth * TimelineView.bar_height, TimelineView.bar_height,
-                                           sample.start_times[0] - start, sample.end_times[-1] - start,
-                                           TimelineView.colors[sample.depth % len(TimelineView.colors)],
-                                           TimelineView.text_color, TimelineView.font_size)
-            else:
-                for block in list(zip(sample.start_times, sample.end_times)):
-                    if block[1] - block[0] <= 0:
-                        continue
-
-                    self.timeline_plot.add_bar(sample.name, 1 - TimelineView.bar_height -
-                                               sample.depth * TimelineView.bar_height, TimelineView.bar_height,
-                                               block[0] - start, block[1] - start,
-                                               TimelineView.colors[sample.depth % len(TimelineView.colors)],
-                                               TimelineView.text_color, TimelineView.font_size)
-
-        self.winfo_toplevel().update()
+                sample_starts = sample_starts[:1]
+                sample_ends = sample_ends[-1:]
+
+            non_empty: np.ndarray = sample_ends > sample_starts
+            num_blocks: int = int(np.count_nonzero(non_empty))
+            if num_blocks == 0:
+                continue
+
+            names.extend([sample.name] * num_blocks)
+            depths.append(np.full(num_blocks, sample.depth))
+            starts.append(sample_starts[non_empty])
+            ends.append(sample_ends[non_empty])
+
+        if not names:
+            self.timeline_plot.clear()
+            return
+
+        start: float = float(frame_info.samples[0].start_times[0])
+        bar_depths: np.ndarray = np.concatenate(depths)
+        colors: List[str] = [TimelineView.colors[depth % len(TimelineView.colors)] for depth in bar_depths.tolist()]
+
+        # Every bar in one batch, so the plot is drawn once per frame instead of once per bar.
+        self.timeline_plot.set_bars(names, 1 - TimelineView.bar_height - bar_depths * TimelineView.bar_height,
+                                    TimelineView.bar_height, np.concatenate(starts) - start,
+                                    np.concatenate(ends) - start, colors, TimelineView.text_color,
+                                    TimelineView.font_size)
 
     def on_frame_info_cleared(self) -> None:
         self.timeline_plot.clear()
@@ -1,146 +1,239 @@
 from __future__ import annotations
 
-from typing import Iterator, List, TextIO, Tuple, Union
+from typing import List, Tuple, Union
 
-import os
+import queue
+
+import numpy as np
 
 import tkinter as tk
+from tkinter import messagebox
 import customtkinter as ctk
 
-from Src.Sample import Sample
-from Src.FrameInfo import FrameInfo
+from Src.FrameBlock import FrameBlock
+from Src.FrameView import FrameView
+from Src.FrameStore import FrameStore
+from Src.FrameIngestThread import FrameIngestThread
+from Src.HitchDetector import HitchDetector
+from Src.SampleSeries import SampleSeries
+from Src.FrameQuery import query_frames
+from Src.LogImportThread import LogImportThread
+from Src.CaptureFile import load_capture, save_capture
 from Src.FrameChart import FrameChart
 from Src.DetailsPanel import DetailsPanel
 from Src.ControlPanel import ControlPanel
+from Src.QueryPanel import QueryPanel
 from Utils.PathResolver import resource_path
 
 
 class UdonProfiler(ctk.CTk):
-    frame_begin_symbol: str = "##FRAME_INFO_BEGIN##"
-    frame_end_symbol: str = "##FRAME_INFO_END##"
     frame_min: int = 1
+    # Frames waiting to be shown. Ingest thread blocks when full instead of growing without bound.
+    frame_queue_size: int = 256
+    drain_interval_ms: int = 10
+    max_frames_per_drain: int = 32
+    import_poll_interval_ms: int = 100
+    # Frames kept in memory (about 10 minutes at 90 fps). Older frames are spilled to disk until they're cleared.
+    memory_frames: int = 54000
+
+    def __init__(self, logfile_name: str, memory_frames: Union[int, None] = memory_frames,
+                 memory_bytes: Union[int, None] = None) -> None:
+        """
+        :param memory_frames: Number of frames to keep in memory. No limit if None.
+        :param memory_bytes: Size of the frames to keep in memory. No limit if None.
+        """
 
-    def __init__(self, logfile_name: str) -> None:
         super().__init__()
         self.logfile_name: str = logfile_name
-
-        self.frame_infos: List[FrameInfo] = list()
+        self.memory_frames: Union[int, None] = memory_frames
+        self.memory_bytes: Union[int, None] = memory_bytes
+
+        self.frame_store: FrameStore = FrameStore(UdonProfiler.frame_min)
+        self.frame_store.set_retention(self.memory_frames, self.memory_bytes)
+        self.hitch_detector: HitchDetector = HitchDetector()
+        # Series of queried paths are kept within the same size limit as the frames in memory.
+        self.sample_series: SampleSeries = SampleSeries(self.frame_store, self.memory_bytes or SampleSeries.max_bytes)
         self.cur_frame_num: int = UdonProfiler.frame_min - 1
         self.sel_frame_num: int = UdonProfiler.frame_min - 1
         self.is_recording: bool = False
         self.is_running: bool = True
 
+        self.frame_queue: queue.Queue = queue.Queue(maxsize=UdonProfiler.frame_queue_size)
+        self.ingest_thread: FrameIngestThread = FrameIngestThread(self.logfile_name, self.frame_queue)
+        self.import_thread: Union[LogImportThread, None] = None
+
         self.title("Udon Profiler")
         self.geometry("950x950")
         self.iconbitmap(resource_path("Assets\\UdonProfiler.ico"))
 
         # Layout:
         #   Control Panel
+        #   Query Panel
         #   Frame Chart
         #   Details Panel
         self.grid_columnconfigure(0, weight=1)
-        self.grid_rowconfigure(0, weight=0)
-        self.grid_rowconfigure(1, weight=1)
-        self.grid_rowconfigure(2, weight=1, minsize=350)
+        self.grid_rowconfigure((0, 1), weight=0)
+        self.grid_rowconfigure(2, weight=1)
+        self.grid_rowconfigure(3, weight=1, minsize=350)
 
         self.control_panel: ControlPanel = ControlPanel(self)
-        self.control_panel.grid(row=0, column=0, padx=10, pady=10, sticky="ew")
+        self.control_panel.grid(row=0, column=0, padx=10, pady=(10, 5), sticky="ew")
+
+        self.query_panel: QueryPanel = QueryPanel(self)
+        self.query_panel.grid(row=1, column=0, padx=10, pady=(5, 10), sticky="ew")
 
         self.frame_chart: FrameChart = FrameChart(self)
-        self.frame_chart.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
+        self.frame_chart.grid(row=2, column=0, padx=10, pady=10, sticky="nsew")
 
         self.details_panel: DetailsPanel = DetailsPanel(self)
-        self.details_panel.grid(row=2, column=0, padx=10, pady=10, sticky="nsew")
+        self.details_panel.grid(row=3, column=0, padx=10, pady=10, sticky="nsew")
 
         # Clean exit.
         self.protocol("WM_DELETE_WINDOW", self.on_exit)
 
     def run(self) -> None:
-        reading_frame: bool = False
-        current_frame_info: Union[FrameInfo, None] = None
-
-        logfile: TextIO = open(self.logfile_name, "r")
-        lines: Iterator[str] = self.tail(logfile)
-        for line in lines:
-            # Discard any frames read while recording is paused.
-            if not self.is_recording:
-                # Clear any frame info that may have been being processed when pause button hit.
-                reading_frame = False
-                current_frame_info = None
-                continue
-
-            # Start reading frame info.
-            if UdonProfiler.frame_begin_symbol in line:
-                reading_frame = True
-
-                self.cur_frame_num += 1
-                current_frame_info = FrameInfo(self.cur_frame_num)
-                self.control_panel.on_cur_frame_num_changed(self.cur_frame_num)
-
-                # Initialize frame counter view since it's not set at startup.
-                if self.cur_frame_num == UdonProfiler.frame_min:
-                    self.control_panel.set_frame_details(UdonProfiler.frame_min, self.cur_frame_num)
-
-                continue
-
-            # Parse remaining frame info.
-            if reading_frame:
-                # Stop reading frame info.
-                if UdonProfiler.frame_end_symbol in line:
-                    reading_frame = False
-
-                    if current_frame_info:
-                        self.frame_infos.append(current_frame_info)
-                        self.frame_chart.on_frame_info_received(current_frame_info)
-                        self.details_panel.on_frame_info_received(current_frame_info, selected=False)
-
-                    # Populate frame views since they're empty at startup.
-                    if self.cur_frame_num == UdonProfiler.frame_min:
-                        self.sel_frame_num = self.cur_frame_num
-
-                        frame_info: Union[FrameInfo, None] = self.get_selected_frame_info()
-                        if frame_info:
-                            self.details_panel.on_frame_info_received(frame_info, selected=True)
-
-                # Read sample from frame info.
-                else:
-                    sample: Sample = Sample(line)
-
-                    if current_frame_info:
-                        current_frame_info.add_sample(sample)
-
-    def update_loop(self) -> None:
-        self.update_idletasks()
-        self.update()
+        self.ingest_thread.start()
+        self.after(UdonProfiler.drain_interval_ms, self.drain_frames)
+        self.mainloop()
 
-    def on_exit(self) -> None:
-        self.is_running = False
-        tk.Tk.quit(self)
+    def drain_frames(self) -> None:
+        """
+        Moves finished frames from the ingest thread into the GUI.
+        Limited per call so that a burst of frames can't starve the Tk event loop.
+        """
+
+        for _ in range(0, UdonProfiler.max_frames_per_drain):
+            try:
+                frame_block: FrameBlock = self.frame_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            self.on_frame_block_received(frame_block)
+
+        if self.is_running:
+            self.after(UdonProfiler.drain_interval_ms, self.drain_frames)
+
+    def on_frame_block_received(self, frame_block: FrameBlock) -> None:
+        self.cur_frame_num += 1
+        self.hitch_detector.add(frame_block.frame_time)
+        self.control_panel.on_cur_frame_num_changed(self.cur_frame_num)
+
+        # Initialize frame counter view since it's not set at startup.
+        if self.cur_frame_num == UdonProfiler.frame_min:
+            self.control_panel.set_frame_details(UdonProfiler.frame_min, self.cur_frame_num)
+
+        frame_view: FrameView = self.frame_store.get_frame(self.frame_store.append(frame_block))
+        self.frame_chart.on_frame_info_received(frame_view)
+        self.details_panel.on_frame_info_received(frame_view, selected=False)
+
+        # Populate frame views since they're empty at startup.
+        if self.cur_frame_num == UdonProfiler.frame_min:
+            self.sel_frame_num = self.cur_frame_num
+
+            selected_frame_info: Union[FrameView, None] = self.get_selected_frame_info()
+            if selected_frame_info:
+                self.details_panel.on_frame_info_received(selected_frame_info, selected=True)
+
+    def import_log(self, logfile_name: str) -> None:
+        """
+        Loads every frame already written to a log, replacing the current frames.
+        """
+
+        if self.import_thread and self.import_thread.is_alive():
+            return
+
+        # Live frames would interleave with the imported ones.
+        self.control_panel.stop_recording()
+        self.clear_frames()
+
+        self.import_thread = LogImportThread(logfile_name)
+        self.import_thread.start()
+        self.after(UdonProfiler.import_poll_interval_ms, self.poll_import)
+
+    def poll_import(self) -> None:
+        if not self.import_thread:
+            return
+
+        if self.import_thread.is_alive():
+            self.control_panel.set_import_progress(*self.import_thread.progress)
+            self.after(UdonProfiler.import_poll_interval_ms, self.poll_import)
+            return
+
+        import_thread: LogImportThread = self.import_thread
+        self.import_thread = None
+        self.control_panel.on_import_finished()
+
+        if import_thread.error:
+            # Raising here would only reach stderr, since this runs in a Tk callback.
+            messagebox.showerror("Import failed",
+                                 f"can't import log {import_thread.logfile_name}\n\n{import_thread.error}")
+            return
+
+        self.on_frame_blocks_imported(import_thread.frame_blocks)
 
-    def tail(self, file: TextIO) -> Iterator[str]:
+    def on_frame_blocks_imported(self, frame_blocks: List[FrameBlock]) -> None:
+        first_frame_idx: int = len(self.frame_store)
+        for frame_block in frame_blocks:
+            self.frame_store.append(frame_block)
+
+        self.on_frames_loaded(first_frame_idx)
+
+    def save_capture(self, filename: str) -> None:
+        try:
+            save_capture(self.frame_store, filename)
+        except OSError as error:
+            messagebox.showerror("Save failed", f"can't save capture {filename}\n\n{error}")
+
+    def load_capture(self, filename: str) -> None:
         """
-        generator function that yields new lines in a file
+        Opens a capture file, replacing the current frames. Frames stay memory-mapped until they're displayed.
         """
 
-        # seek the end of the file
-        file.seek(0, os.SEEK_END)
+        if self.import_thread and self.import_thread.is_alive():
+            return
+
+        # Current frames are only replaced once the capture has loaded, so a bad file doesn't lose them.
+        try:
+            frame_store: FrameStore = load_capture(filename)
+        except (ValueError, OSError) as error:
+            # Raising here would only reach stderr, since this runs in a Tk callback.
+            messagebox.showerror("Open failed", f"can't open capture {filename}\n\n{error}")
+            return
+
+        self.control_panel.stop_recording()
+        self.clear_frames()
+
+        self.frame_store = frame_store
+        self.frame_store.set_retention(self.memory_frames, self.memory_bytes)
+        self.sample_series = SampleSeries(self.frame_store, self.memory_bytes or SampleSeries.max_bytes)
+        self.on_frames_loaded(0)
+
+    def on_frames_loaded(self, first_frame_idx: int) -> None:
+        if first_frame_idx >= len(self.frame_store):
+            return
+
+        self.cur_frame_num = UdonProfiler.frame_min - 1 + len(self.frame_store)
+        self.hitch_detector.extend(self.frame_store.frames.get(first_frame_idx, len(self.frame_store))["frame_time"])
+        self.details_panel.on_frames_imported(self.frame_store, first_frame_idx)
 
-        # start infinite loop
-        while self.is_running:
-            # read last line of file
-            line: Union[str, None] = file.readline()
-            if not line:
-                # Run GUI loop if file has not been updated.
-                self.update_loop()
-                continue
+        self.frame_chart.on_frames_imported(self.frame_store, first_frame_idx)
 
-            yield line
+        sel_frame, cur_frame = self.cur_frame()
+        self.control_panel.set_frame_details(sel_frame, cur_frame)
+        self.control_panel.update_playback_btn_states(sel_frame, cur_frame)
+
+    def on_exit(self) -> None:
+        self.is_running = False
+        self.ingest_thread.stop()
+        tk.Tk.quit(self)
 
     def record(self) -> None:
         self.is_recording = True
+        self.ingest_thread.record()
 
     def pause(self) -> None:
         self.is_recording = False
+        self.ingest_thread.pause()
 
     def prev_frame(self) -> Tuple[int, int]:
         if self.sel_frame_num > UdonProfiler.frame_min:
@@ -149,44 +242,84 @@ class UdonProfiler(ctk.CTk):
         return self.change_frame()
 
     def next_frame(self) -> Tuple[int, int]:
-        if self.sel_frame_num < len(self.frame_infos):
+        if self.sel_frame_num < len(self.frame_store):
             self.sel_frame_num += 1
 
         return self.change_frame()
 
     def cur_frame(self) -> Tuple[int, int]:
-        self.sel_frame_num = len(self.frame_infos)
+        self.sel_frame_num = len(self.frame_store)
 
         return self.change_frame()
 
     def goto_frame(self, frame_num: int) -> Tuple[int, int]:
-        if frame_num < 0 or frame_num > len(self.frame_infos) - UdonProfiler.frame_min:
+        if frame_num < 0 or frame_num > len(self.frame_store) - UdonProfiler.frame_min:
             raise RuntimeError(f"can't go to frame {frame_num} - out of range")
 
         self.sel_frame_num = frame_num + UdonProfiler.frame_min
 
         return self.change_frame()
 
+    def get_next_hitch(self) -> Union[int, None]:
+        """
+        :return: Index of the first hitch after the selected frame, or None if there's none.
+        """
+
+        return self.hitch_detector.get_next_hitch(self.get_selected_frame_idx())
+
+    def get_prev_hitch(self) -> Union[int, None]:
+        """
+        :return: Index of the last hitch before the selected frame, or None if there's none.
+        """
+
+        return self.hitch_detector.get_prev_hitch(self.get_selected_frame_idx())
+
+    def query_frames(self, query: str) -> np.ndarray:
+        """
+        :param query: Conditions on sample paths, e.g. Update/Physics total_ms > 2 and calls > 40.
+        :return: Indexes of the frames that meet the query, in ascending order.
+        :raises ValueError: If the query can't be parsed, or names a path that doesn't exist.
+        """
+
+        return query_frames(self.sample_series, query)
+
     def change_frame(self) -> Tuple[int, int]:
-        frame_info: Union[FrameInfo, None] = self.get_selected_frame_info()
+        frame_info: Union[FrameView, None] = self.get_selected_frame_info()
         if frame_info:
             self.details_panel.on_frame_info_received(frame_info, selected=True)
             self.frame_chart.on_frame_info_received(frame_info, selected=True)
 
         return self.sel_frame_num, self.cur_frame_num
 
-    def get_selected_frame_info(self) -> Union[FrameInfo, None]:
+    def get_selected_frame_idx(self) -> int:
+        """
+        :return: Index of the selected frame, or -1 if there's none.
+        """
+
+        return self.sel_frame_num - UdonProfiler.frame_min
+
+    def get_selected_frame_info(self) -> Union[FrameView, None]:
         if self.sel_frame_num < UdonProfiler.frame_min:
             return None
 
-        return self.frame_infos[self.sel_frame_num - UdonProfiler.frame_min]
+        return self.frame_store.get_frame(self.sel_frame_num - UdonProfiler.frame_min)
 
     def clear_frames(self) -> None:
-        self.frame_infos.clear()
+        # Drop frames that were parsed but not shown yet.
+        while not self.frame_queue.empty():
+            try:
+                self.frame_queue.get_nowait()
+            except queue.Empty:
+                break
+
+        self.frame_store.clear()
+        self.hitch_detector.clear()
+        self.sample_series.clear()
         self.sel_frame_num = UdonProfiler.frame_min - 1
         self.cur_frame_num = UdonProfiler.frame_min - 1
         self.details_panel.on_frame_info_cleared()
         self.frame_chart.on_frame_info_cleared()
+        self.query_panel.on_frame_info_cleared()
 
 
 if __name__ == "__main__":
@@ -206,11 +339,33 @@ if __name__ == "__main__":
     # See: https://stackoverflow.com/a/13308493
     # See: https://stackoverflow.com/a/73069099
 
+    import argparse
+    import multiprocessing
     from os import path
 
+    # Log import uses a process pool, which needs this in frozen (PyInstaller) builds.
+    multiprocessing.freeze_support()
+
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Udon Profiler")
+    parser.add_argument("--import-log", metavar="LOG", help="load all frames already written to an editor or "
+                                                            "player log")
+    parser.add_argument("--load-capture", metavar="CAPTURE", help="open a saved .udoncap capture file")
+    parser.add_argument("--memory-frames", type=int, default=UdonProfiler.memory_frames,
+                        help="frames to keep in memory, older frames are spilled to disk (0 for no limit, "
+                             f"default: {UdonProfiler.memory_frames})")
+    parser.add_argument("--memory-mb", type=float, help="megabytes of frames to keep in memory, older frames are "
+                                                        "spilled to disk")
+    args: argparse.Namespace = parser.parse_args()
+
     # See: https://stackoverflow.com/a/52534405
     #      https://docs.unity3d.com/Manual/LogFiles.html
     log_file: str = path.expandvars(r"%LOCALAPPDATA%\Unity\Editor\Editor.log")
 
-    app: UdonProfiler = UdonProfiler(log_file)
+    app: UdonProfiler = UdonProfiler(log_file,
+                                     memory_frames=args.memory_frames or None,
+                                     memory_bytes=int(args.memory_mb * 1e6) if args.memory_mb else None)
+    if args.import_log:
+        app.after(0, lambda: app.import_log(args.import_log))
+    elif args.load_capture:
+        app.after(0, lambda: app.load_capture(args.load_capture))
     app.run()
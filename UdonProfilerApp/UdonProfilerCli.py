@@ -0,0 +1,173 @@
+from typing import Any, Dict, List, Union
+
+import json
+import queue
+import sys
+import time
+
+import numpy as np
+
+from Src.FrameBlock import FrameBlock
+from Src.FrameStore import FrameStore
+from Src.FrameIngestThread import FrameIngestThread
+from Src.LogImporter import import_log
+from Src.CaptureFile import capture_extension, load_capture, save_capture
+from Src.FrameSummary import format_summary, summarize_frames
+from Src.FrameQuery import query_frames
+from Src.SampleSeries import SampleSeries
+
+# Headless entry point. Only uses the parsing, storage and aggregation modules, so it runs without customtkinter,
+# matplotlib or a display (e.g. on a build box or in a soak test).
+
+# Without a GUI to keep up with, the queue only has to absorb short stalls while frames are stored.
+frame_queue_size: int = 4096
+
+
+def record_frames(logfile_name: str, max_frames: Union[int, None], duration: Union[float, None],
+                  memory_frames: Union[int, None] = None, memory_bytes: Union[int, None] = None) -> FrameStore:
+    """
+    Tails a log and stores new frames until interrupted, or until the frame or time limit is reached.
+    :param memory_frames: Number of frames to keep in memory, older frames are spilled to disk. No limit if None.
+    :param memory_bytes: Size of the frames to keep in memory. No limit if None.
+    """
+
+    frame_store: FrameStore = FrameStore()
+    frame_store.set_retention(memory_frames, memory_bytes)
+    frame_queue: queue.Queue = queue.Queue(maxsize=frame_queue_size)
+    ingest_thread: FrameIngestThread = FrameIngestThread(logfile_name, frame_queue)
+    ingest_thread.record()
+    ingest_thread.start()
+
+    deadline: Union[float, None] = time.monotonic() + duration if duration is not None else None
+    try:
+        while max_frames is None or len(frame_store) < max_frames:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+
+            try:
+                frame_block: FrameBlock = frame_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            frame_store.append(frame_block)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ingest_thread.stop()
+
+    return frame_store
+
+
+def read_frames(filename: str) -> FrameStore:
+    if filename.endswith(capture_extension):
+        return load_capture(filename)
+
+    frame_store: FrameStore = FrameStore()
+    for frame_block in import_log(filename):
+        frame_store.append(frame_block)
+
+    return frame_store
+
+
+def print_summary(frame_store: FrameStore, as_json: bool, num_worst_frames: int,
+                  output: Union[str, None] = None) -> None:
+    summary: Dict[str, Any] = summarize_frames(frame_store, num_worst_frames)
+    text: str = json.dumps(summary, indent=2) if as_json else format_summary(summary)
+
+    if output:
+        with open(output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+
+def capture(args: Any) -> None:
+    frame_store: FrameStore
+    if args.follow:
+        print(f"Recording {args.log}, press Ctrl+C to stop", file=sys.stderr)
+        frame_store = record_frames(args.log, args.max_frames, args.duration, args.memory_frames,
+                                    int(args.memory_mb * 1e6) if args.memory_mb else None)
+    else:
+        frame_store = read_frames(args.log)
+
+    save_capture(frame_store, args.output)
+    print(f"Wrote {len(frame_store)} frames to {args.output}", file=sys.stderr)
+
+    if args.summary:
+        print_summary(frame_store, args.json, args.worst)
+
+
+def summarize(args: Any) -> None:
+    print_summary(read_frames(args.input), args.json, args.worst, args.output)
+
+
+def query(args: Any) -> None:
+    frame_store: FrameStore = read_frames(args.input)
+    sample_series: SampleSeries = SampleSeries(frame_store)
+
+    try:
+        frame_idxs: np.ndarray = query_frames(sample_series, args.query)
+    except ValueError as error:
+        sys.exit(str(error))
+
+    frame_numbers: List[int] = (frame_idxs + frame_store.first_frame_number).tolist()
+    print(json.dumps(frame_numbers) if args.json else "\n".join(str(n) for n in frame_numbers))
+
+
+def main(argv: Union[List[str], None] = None) -> None:
+    import argparse
+    from os import path
+
+    # See: https://stackoverflow.com/a/52534405
+    #      https://docs.unity3d.com/Manual/LogFiles.html
+    default_log_file: str = path.expandvars(r"%LOCALAPPDATA%\Unity\Editor\Editor.log")
+
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Udon Profiler (headless)")
+    subparsers: Any = parser.add_subparsers(dest="command", required=True)
+
+    capture_parser: argparse.ArgumentParser = subparsers.add_parser(
+        "capture", help=f"record frames from a log into a {capture_extension} capture file")
+    capture_parser.add_argument("log", nargs="?", default=default_log_file,
+                                help="editor or player log (default: editor log)")
+    capture_parser.add_argument("-o", "--output", required=True, help="capture file to write")
+    capture_parser.add_argument("-f", "--follow", action="store_true",
+                                help="record new frames as they are written, instead of importing the frames "
+                                     "already in the log")
+    capture_parser.add_argument("--max-frames", type=int, help="stop following after this many frames")
+    capture_parser.add_argument("--duration", type=float, help="stop following after this many seconds")
+    capture_parser.add_argument("--memory-frames", type=int, help="frames to keep in memory while following, older "
+                                                                  "frames are spilled to disk")
+    capture_parser.add_argument("--memory-mb", type=float, help="megabytes of frames to keep in memory while "
+                                                                "following, older frames are spilled to disk")
+    capture_parser.add_argument("--summary", action="store_true", help="print a summary of the capture")
+    capture_parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    capture_parser.add_argument("--worst", type=int, default=10, help="number of slowest frames to list")
+    capture_parser.set_defaults(handler=capture)
+
+    summarize_parser: argparse.ArgumentParser = subparsers.add_parser(
+        "summarize", help=f"print per-sample statistics and the slowest frames of a log or {capture_extension} file")
+    summarize_parser.add_argument("input", help=f"editor or player log, or {capture_extension} capture file")
+    summarize_parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    summarize_parser.add_argument("--worst", type=int, default=10, help="number of slowest frames to list")
+    summarize_parser.add_argument("-o", "--output", help="write the summary to a file instead of stdout")
+    summarize_parser.set_defaults(handler=summarize)
+
+    query_parser: argparse.ArgumentParser = subparsers.add_parser(
+        "query", help=f"print the numbers of the frames of a log or {capture_extension} file that meet a query")
+    query_parser.add_argument("input", help=f"editor or player log, or {capture_extension} capture file")
+    query_parser.add_argument("query", help="conditions joined with 'and', e.g. "
+                                            "'Update/Physics total_ms > 2 and calls > 40'")
+    query_parser.add_argument("--json", action="store_true", help="print the frame numbers as a JSON list")
+    query_parser.set_defaults(handler=query)
+
+    args: argparse.Namespace = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    import multiprocessing
+
+    # Log import uses a process pool, which needs this in frozen (PyInstaller) builds.
+    multiprocessing.freeze_support()
+
+    main()
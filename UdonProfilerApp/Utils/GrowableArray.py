@@ -0,0 +1,74 @@
+from typing import Any
+
+import numpy as np
+
+
+class GrowableArray:
+    """
+    Append-only NumPy array with amortized O(1) appends.
+    Capacity doubles when full, so the backing buffer is only reallocated O(log n) times.
+    """
+
+    def __init__(self, dtype: Any, capacity: int = 1024) -> None:
+        self.dtype: np.dtype = np.dtype(dtype)
+        self.buffer: np.ndarray = np.empty(max(capacity, 1), dtype=self.dtype)
+        self.size: int = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def data(self) -> np.ndarray:
+        # View, not a copy. Only valid until the next append.
+        return self.buffer[:self.size]
+
+    def reserve(self, capacity: int) -> None:
+        if capacity <= len(self.buffer):
+            return
+
+        new_capacity: int = len(self.buffer)
+        while new_capacity < capacity:
+            new_capacity *= 2
+
+        buffer: np.ndarray = np.empty(new_capacity, dtype=self.dtype)
+        buffer[:self.size] = self.buffer[:self.size]
+        self.buffer = buffer
+
+    def append(self, item: Any) -> int:
+        """
+        Appends a single item.
+        :param item: Scalar, or tuple for structured dtypes.
+        :return: Index of the appended item.
+        """
+
+        self.reserve(self.size + 1)
+        self.buffer[self.size] = item
+        self.size += 1
+
+        return self.size - 1
+
+    def extend(self, items: np.ndarray) -> int:
+        """
+        Appends a batch of items.
+        :param items: Array convertible to this array's dtype.
+        :return: Index of the first appended item.
+        """
+
+        offset: int = self.size
+        self.reserve(self.size + len(items))
+        self.buffer[offset:offset + len(items)] = items
+        self.size += len(items)
+
+        return offset
+
+    def drop_front(self, count: int) -> None:
+        """
+        Removes the first items. Capacity is kept, so appends after a drop don't reallocate.
+        """
+
+        count = min(count, self.size)
+        self.buffer[:self.size - count] = self.buffer[count:self.size]
+        self.size -= count
+
+    def clear(self) -> None:
+        self.size = 0
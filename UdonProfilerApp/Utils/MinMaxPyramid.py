@@ -0,0 +1,138 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from Utils.GrowableArray import GrowableArray
+
+
+class MinMaxPyramid:
+    """
+    Append-only series of values with the minimum and maximum of every block of 2^k values, for every level k.
+    Levels are updated incrementally as values arrive, so a range of any length can be drawn at about one point per
+    pixel without losing spikes, and without reading every value in the range.
+    """
+
+    def __init__(self) -> None:
+        # Level 0 is the values themselves. Level k holds one minimum and maximum per complete block of 2^k values.
+        self.mins: List[GrowableArray] = [GrowableArray(np.float64)]
+        self.maxs: List[GrowableArray] = [self.mins[0]]
+
+    def __len__(self) -> int:
+        return len(self.mins[0])
+
+    @property
+    def values(self) -> np.ndarray:
+        # View, not a copy. Only valid until the next append.
+        return self.mins[0].data
+
+    def append(self, value: float) -> None:
+        self.extend(np.array([value], dtype=np.float64))
+
+    def extend(self, values: np.ndarray) -> None:
+        """
+        Appends a batch of values. O(1) amortized per value.
+        """
+
+        self.mins[0].extend(values)
+
+        level: int = 1
+        while len(self.mins[level - 1]) >= 2:
+            if level == len(self.mins):
+                self.mins.append(GrowableArray(np.float64))
+                self.maxs.append(GrowableArray(np.float64))
+
+            # Only blocks that were completed by these values are added. Once a level gains no block, no level above
+            # it can either.
+            num_blocks: int = len(self.mins[level])
+            num_complete_blocks: int = len(self.mins[level - 1]) // 2
+            if num_complete_blocks == num_blocks:
+                break
+
+            lower_mins: np.ndarray = self.mins[level - 1].data[2 * num_blocks:2 * num_complete_blocks]
+            lower_maxs: np.ndarray = self.maxs[level - 1].data[2 * num_blocks:2 * num_complete_blocks]
+            self.mins[level].extend(lower_mins.reshape(-1, 2).min(axis=1))
+            self.maxs[level].extend(lower_maxs.reshape(-1, 2).max(axis=1))
+            level += 1
+
+    def clear(self) -> None:
+        self.mins = [GrowableArray(np.float64)]
+        self.maxs = [self.mins[0]]
+
+    def get_level(self, start: int, stop: int, max_blocks: int) -> int:
+        """
+        :return: Lowest level that covers values [start, stop) in at most max_blocks blocks.
+        """
+
+        level: int = 0
+        while level + 1 < len(self.mins) and ((stop - 1) >> level) - (start >> level) + 1 > max_blocks:
+            level += 1
+
+        return level
+
+    def get_range(self, start: int, stop: int, max_blocks: int) -> Tuple[int, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Minimum and maximum of every block that covers values [start, stop), at the lowest level that fits in
+        max_blocks. Cost depends on max_blocks, not on the length of the range.
+        :return: Level, and index of the first value, minimum and maximum of each block.
+        """
+
+        start = max(0, start)
+        stop = min(stop, len(self))
+        if start >= stop:
+            return 0, np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0)
+
+        level: int = self.get_level(start, stop, max_blocks)
+        first_block: int = start >> level
+        last_block: int = (stop - 1) >> level
+
+        num_complete_blocks: int = len(self.mins[level])
+        mins: np.ndarray = self.mins[level].data[first_block:min(last_block + 1, num_complete_blocks)]
+        maxs: np.ndarray = self.maxs[level].data[first_block:min(last_block + 1, num_complete_blocks)]
+        if last_block >= num_complete_blocks:
+            # Last values don't fill a block yet.
+            tail_min, tail_max = self.get_tail(level)
+            mins = np.append(mins, tail_min)
+            maxs = np.append(maxs, tail_max)
+
+        return level, np.arange(first_block, last_block + 1, dtype=np.int64) << level, mins, maxs
+
+    def get_tail(self, level: int) -> Tuple[float, float]:
+        """
+        :return: Minimum and maximum of the values after the last complete block of a level. O(level).
+        """
+
+        tail_min: float = np.inf
+        tail_max: float = -np.inf
+        for lower_level in range(0, level):
+            # Blocks of the lower level that aren't part of a complete block of the level above it.
+            first_block: int = 2 * len(self.mins[lower_level + 1])
+            lower_mins: np.ndarray = self.mins[lower_level].data[first_block:]
+            lower_maxs: np.ndarray = self.maxs[lower_level].data[first_block:]
+            if len(lower_mins) > 0:
+                tail_min = min(tail_min, float(lower_mins.min()))
+                tail_max = max(tail_max, float(lower_maxs.max()))
+
+        return tail_min, tail_max
+
+    def find_max(self, level: int, block: int) -> int:
+        """
+        :return: Index of the largest value in a block of a level. Cost depends on the level, not on the block size.
+        """
+
+        # Descends into the half of the block that holds its maximum. The last block of a level can be incomplete, in
+        # which case its second half is the tail of the level below.
+        for lower_level in range(level - 1, -1, -1):
+            block *= 2
+            if block >= len(self.maxs[lower_level]):
+                continue
+
+            second_half_max: float = -np.inf
+            if block + 1 < len(self.maxs[lower_level]):
+                second_half_max = float(self.maxs[lower_level].data[block + 1])
+            elif block + 1 << lower_level < len(self):
+                second_half_max = self.get_tail(lower_level)[1]
+
+            if second_half_max > self.maxs[lower_level].data[block]:
+                block += 1
+
+        return block
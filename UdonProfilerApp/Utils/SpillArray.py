@@ -0,0 +1,207 @@
+from typing import Any, BinaryIO, List, Tuple, Union
+
+import shutil
+import tempfile
+
+import numpy as np
+
+from Utils.GrowableArray import GrowableArray
+
+
+class SpillArray:
+    """
+    Append-only NumPy array that keeps its newest items in memory and can spill its oldest items to a temporary file.
+    Items are indexed the same way whether they're in memory or spilled. Spilled items are read through a memory map,
+    so they're paged in from disk when read, and the OS can drop them from memory again.
+    Existing items, e.g. a memory-mapped capture, can be wrapped as the first items. They're never copied, spilled or
+    counted as in memory, since the OS already pages them in and out of their file.
+    """
+
+    # Spilled and mapped items are copied in chunks of this many bytes when writing them to another file.
+    copy_chunk_size: int = 1 << 20
+
+    def __init__(self, dtype: Any, initial_data: Union[np.ndarray, None] = None) -> None:
+        """
+        :param initial_data: Existing items to wrap without copying, e.g. a read-only memory map.
+        """
+
+        self.dtype: np.dtype = np.dtype(dtype)
+        self.memory: GrowableArray = GrowableArray(self.dtype)
+
+        # Wrapped items are the first num_mapped items, spilled items the next num_spilled. Items in memory follow.
+        self.mapped: np.ndarray = initial_data if initial_data is not None else np.empty(0, dtype=self.dtype)
+        self.num_spilled: int = 0
+        self.spill_file: Union[BinaryIO, None] = None
+        # Rebuilt on first read after a spill, since a memory map can't grow.
+        self.spill_map: Union[np.ndarray, None] = None
+
+    def __len__(self) -> int:
+        return self.memory_start + len(self.memory)
+
+    def __getitem__(self, idx: int) -> np.void:
+        if idx < 0 or idx >= len(self):
+            raise IndexError(f"can't get item {idx} - out of range")
+
+        for first_idx, data in self.get_regions():
+            if idx < first_idx + len(data):
+                return data[idx - first_idx]
+
+        raise IndexError(f"can't get item {idx} - out of range")
+
+    @property
+    def num_mapped(self) -> int:
+        return len(self.mapped)
+
+    @property
+    def memory_start(self) -> int:
+        """
+        :return: Index of the first item in memory.
+        """
+
+        return self.num_mapped + self.num_spilled
+
+    @property
+    def nbytes(self) -> int:
+        """
+        :return: Size of the items in memory. Mapped and spilled items aren't included.
+        """
+
+        return len(self.memory) * self.dtype.itemsize
+
+    def append(self, item: Any) -> int:
+        """
+        :return: Index of the appended item.
+        """
+
+        return self.memory_start + self.memory.append(item)
+
+    def extend(self, items: np.ndarray) -> int:
+        """
+        :return: Index of the first appended item.
+        """
+
+        return self.memory_start + self.memory.extend(items)
+
+    def get_regions(self) -> List[Tuple[int, np.ndarray]]:
+        """
+        :return: Index of the first item and the items of each region that has any: mapped, spilled, in memory.
+        """
+
+        regions: List[Tuple[int, np.ndarray]] = list()
+        if self.num_mapped > 0:
+            regions.append((0, self.mapped))
+        if self.num_spilled > 0:
+            regions.append((self.num_mapped, self.get_spill_map()))
+        if len(self.memory) > 0:
+            regions.append((self.memory_start, self.memory.data))
+
+        return regions
+
+    def get(self, start: int, stop: int) -> np.ndarray:
+        """
+        :return: Items from start up to stop. A view if they're all in one region, e.g. all in memory, otherwise a
+                 copy.
+        """
+
+        start = max(0, start)
+        stop = min(stop, len(self))
+        if start >= stop:
+            return np.empty(0, dtype=self.dtype)
+
+        parts: List[np.ndarray] = [data[max(0, start - first_idx):stop - first_idx]
+                                   for first_idx, data in self.get_regions()
+                                   if first_idx < stop and first_idx + len(data) > start]
+        if len(parts) == 1:
+            return parts[0]
+
+        return np.concatenate(parts)
+
+    def take(self, idxs: np.ndarray, fields: Union[List[str], None] = None) -> np.ndarray:
+        """
+        :param fields: Fields to read, for structured dtypes. Reading only the fields needed is much faster than
+                       copying whole records. Every field if None.
+        :return: Items at any selection of indexes, e.g. every sample of a selection of frames.
+        """
+
+        idxs = np.asarray(idxs, dtype=np.int64)
+        regions: List[Tuple[int, np.ndarray]] = self.get_regions()
+
+        if fields is None:
+            if len(regions) == 1:
+                return regions[0][1][idxs - regions[0][0]]
+
+            items: np.ndarray = np.empty(len(idxs), dtype=self.dtype)
+            SpillArray.take_into(items, regions, idxs)
+
+            return items
+
+        field_items: np.ndarray = np.empty(len(idxs), dtype=[(field, self.dtype.fields[field][0]) for field in fields])
+        for field in fields:
+            SpillArray.take_into(field_items[field], [(first_idx, data[field]) for first_idx, data in regions], idxs)
+
+        return field_items
+
+    @staticmethod
+    def take_into(items: np.ndarray, regions: List[Tuple[int, np.ndarray]], idxs: np.ndarray) -> None:
+        if len(regions) == 1:
+            items[:] = regions[0][1][idxs - regions[0][0]]
+            return
+
+        for first_idx, data in regions:
+            in_region: np.ndarray = (idxs >= first_idx) & (idxs < first_idx + len(data))
+            items[in_region] = data[idxs[in_region] - first_idx]
+
+    def spill(self, count: int) -> None:
+        """
+        Moves the oldest items in memory to the spill file.
+        """
+
+        count = min(count, len(self.memory))
+        if count <= 0:
+            return
+
+        if not self.spill_file:
+            self.spill_file = tempfile.TemporaryFile(prefix="udonprofiler-", suffix=".spill")
+
+        self.spill_file.seek(0, 2)
+        self.spill_file.write(self.memory.data[:count].tobytes())
+        self.spill_file.flush()
+
+        self.memory.drop_front(count)
+        self.num_spilled += count
+        self.spill_map = None
+
+    def get_spill_map(self) -> np.ndarray:
+        if self.spill_map is None:
+            self.spill_map = np.memmap(self.spill_file, dtype=self.dtype, mode="r", shape=(self.num_spilled,))
+
+        return self.spill_map
+
+    def write_to(self, file: BinaryIO) -> None:
+        """
+        Writes every item to a file, mapped items first, then spilled items. Mapped and spilled items are copied in
+        chunks rather than read into memory at once.
+        """
+
+        chunk_items: int = max(1, SpillArray.copy_chunk_size // self.dtype.itemsize)
+        for start in range(0, self.num_mapped, chunk_items):
+            file.write(self.mapped[start:start + chunk_items].tobytes())
+
+        if self.spill_file:
+            self.spill_file.flush()
+            self.spill_file.seek(0)
+            shutil.copyfileobj(self.spill_file, file, SpillArray.copy_chunk_size)
+
+        file.write(self.memory.data.tobytes())
+
+    def clear(self) -> None:
+        self.memory.clear()
+        self.mapped = np.empty(0, dtype=self.dtype)
+        self.num_spilled = 0
+
+        # Views of the old spill map may still be alive (e.g. in displayed frames), so the file is closed rather than
+        # truncated. A temporary file is deleted once it's closed and no longer mapped.
+        self.spill_map = None
+        if self.spill_file:
+            self.spill_file.close()
+            self.spill_file = None
@@ -2,14 +2,16 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
 
 import customtkinter as ctk
 
 import matplotlib as mpl
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+import matplotlib.style
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.animation import FuncAnimation
+from matplotlib.collections import PolyCollection
 import numpy as np
 
 from Utils.PathResolver import resource_path
@@ -42,31 +44,37 @@ class AnimatedLinePlotWidget(ctk.CTkFrame):
                  animate_cb: Callable[[], Iterable[str]],
                  mouse_motion_cb: Callable[[Tuple[float, float]], None],
                  mouse_press_cb: Callable[[Tuple[float, float]], None],
+                 mouse_scroll_cb: Union[Callable[[Tuple[float, float], float], None], None] = None,
                  animation_interval: int = 100,
                  x_range: Tuple[float, float] = (0, 100),
                  y_range: Tuple[float, float] = (0, 100),
-                 max_points: int = 100,
                  **kwargs) -> None:
         super().__init__(*args, width=width, height=height, **kwargs)
 
         self.animate_cb: Callable[[], Iterable[str]] = animate_cb
         self.mouse_motion_cb: Callable[[Tuple[float, float]], None] = mouse_motion_cb
         self.mouse_press_cb: Callable[[Tuple[float, float]], None] = mouse_press_cb
+        self.mouse_scroll_cb: Union[Callable[[Tuple[float, float], float], None], None] = mouse_scroll_cb
         self.animation_interval: int = animation_interval
         self.x_range: Tuple[float, float] = x_range
         self.y_range: Tuple[float, float] = y_range
-        self.max_points: int = max_points
 
         self.plot_items: Dict[str, PlotItem] = dict()
+        # Animation only runs while there's something new to draw, so the plot doesn't use CPU while idle.
+        self.update_requested: bool = True
+        self.is_paused: bool = False
+        # Set while animate_cb runs.
+        self.is_animating: bool = False
+        self.drawn_artists: List[mpl.artist] = list()
 
         self.configure(fg_color=("gray78", "gray28"))
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(0, weight=1)
 
         mpl.use("TkAgg")
-        plt.style.use(resource_path("Assets\\dracula.mplstyle"))
+        mpl.style.use(resource_path("Assets\\dracula.mplstyle"))
 
-        self.figure: mpl.Figure = plt.figure(dpi=100)
+        self.figure: Figure = Figure(dpi=100)
 
         # Force graph to fill window.
         # Source: https://stackoverflow.com/a/42620544
@@ -74,11 +82,12 @@ class AnimatedLinePlotWidget(ctk.CTkFrame):
         self.axes.axis("off")
         self.axes.margins(0)
 
-        self.background = self.figure.canvas.copy_from_bbox(self.axes.bbox)
-
+        # Figure isn't managed by pyplot, so it only gets a drawable canvas here.
         self.canvas: FigureCanvasTkAgg = FigureCanvasTkAgg(self.figure, self)
         self.canvas.get_tk_widget().grid(row=0, column=0, sticky="nsew")
 
+        self.background = self.figure.canvas.copy_from_bbox(self.axes.bbox)
+
         self.animation: FuncAnimation = FuncAnimation(self.figure, self.animate,
                                                       interval=self.animation_interval, blit=True)
 
@@ -88,31 +97,73 @@ class AnimatedLinePlotWidget(ctk.CTkFrame):
             "button_press_event", lambda event: self.on_mouse_clicked(event))
         self.cid_motion: int = self.figure.canvas.mpl_connect(
             "motion_notify_event", lambda event: self.on_mouse_moved(event))
+        self.cid_scroll: int = self.figure.canvas.mpl_connect(
+            "scroll_event", lambda event: self.on_mouse_scrolled(event))
 
         self.update_plot_range()
 
     def animate(self, i: int) -> Iterable[mpl.artist]:
-        updated_artist_names: List[str] = list(self.animate_cb())
+        if not self.update_requested:
+            # Blitting clears the last frame's artists before every frame, so they're drawn once more as they were.
+            # Resumed by request_update.
+            self.pause()
+            return self.drawn_artists
+
+        self.update_requested = False
+
+        self.is_animating = True
+        try:
+            updated_artist_names: List[str] = list(self.animate_cb())
+        finally:
+            self.is_animating = False
+
         updated_artists: List[mpl.artist] = list()
         for artist_name in updated_artist_names:
             if artist_name in self.plot_items:
                 if self.plot_items[artist_name].item_type == PlotItemType.FILLED_LINE:
-                    # Redraw filled lines.
-                    # See: https://stackoverflow.com/a/44413638
-                    item: mpl.artist = self.plot_items[artist_name].item
-                    params: Dict[str, Any] = self.plot_items[artist_name].params
-                    p = self.axes.fill_between(
-                        item.get_xdata()[:self.max_points],
-                        [params["min_val"]] * self.max_points,
-                        item.get_ydata()[:self.max_points],
-                        facecolor=params["face_color"],
-                        alpha=params["opacity"])
-                    updated_artists.append(p)
+                    updated_artists.append(self.update_fill(self.plot_items[artist_name]))
 
                 updated_artists.append(self.plot_items[artist_name].item)
 
+        self.drawn_artists = updated_artists
         return updated_artists
 
+    def update_fill(self, plot_item: PlotItem) -> PolyCollection:
+        """
+        Moves the fill polygon of a filled line to the line's current points, in place.
+        The polygon is only reallocated when the number of points changes.
+        """
+
+        fill: PolyCollection = plot_item.params["fill"]
+        x_data: np.ndarray = np.asarray(plot_item.item.get_xdata(), dtype=np.float64)
+        y_data: np.ndarray = np.asarray(plot_item.item.get_ydata(), dtype=np.float64)
+        num_points: int = min(len(x_data), len(y_data))
+
+        # Polygon runs along the line, then back along the minimum value.
+        # See: https://stackoverflow.com/a/44413638
+        vertices: np.ndarray = fill.get_paths()[0].vertices
+        if len(vertices) != 2 * num_points:
+            vertices = np.empty((2 * num_points, 2))
+            fill.set_verts([vertices], closed=False)
+            vertices = fill.get_paths()[0].vertices
+
+        vertices[:num_points, 0] = x_data[:num_points]
+        vertices[num_points:, 0] = x_data[:num_points][::-1]
+        vertices[:num_points, 1] = y_data[:num_points]
+        vertices[num_points:, 1] = plot_item.params["min_val"]
+        fill.stale = True
+
+        return fill
+
+    def request_update(self) -> None:
+        """
+        Draws the next animation frame, e.g. when new data arrived. Animation stops again once nothing has changed.
+        """
+
+        self.update_requested = True
+        if self.is_paused:
+            self.resume()
+
     def on_mouse_moved(self, event) -> None:
         # See: https://stackoverflow.com/a/51349960
         x, y = event.xdata, event.ydata
@@ -122,6 +173,13 @@ class AnimatedLinePlotWidget(ctk.CTkFrame):
         x, y = event.xdata, event.ydata
         self.mouse_press_cb((x, y))
 
+    def on_mouse_scrolled(self, event) -> None:
+        # Step is positive when scrolling up.
+        # See: https://matplotlib.org/stable/api/backend_bases_api.html#matplotlib.backend_bases.MouseEvent
+        if self.mouse_scroll_cb is not None:
+            x, y = event.xdata, event.ydata
+            self.mouse_scroll_cb((x, y), event.step)
+
     def add_line(self, name: str,
                  x_data: Union[float, List[float], None] = None,
                  y_data: Union[float, List[float], None] = None,
@@ -146,20 +204,22 @@ class AnimatedLinePlotWidget(ctk.CTkFrame):
         else:
             return
 
+        # Items are only drawn in the animation frames that return them, never by a full redraw of the figure.
+        item.set_animated(True)
         self.plot_items[name] = PlotItem(item_type, item, item_params)
 
-    def update_line(self, name: str, x_data: Union[float, List[float], None] = None,
-                    y_data: Union[float, List[float], None] = None) -> None:
+    def update_line(self, name: str, x_data: Union[float, List[float], np.ndarray, None] = None,
+                    y_data: Union[float, List[float], np.ndarray, None] = None) -> None:
         if name not in self.plot_items:
             raise ValueError(f"can't update line {name} - does not exist")
 
         if self.plot_items[name].item_type == PlotItemType.TEXT:
             raise ValueError(f"can't update item {name} - not a line")
 
-        if x_data:
+        if x_data is not None:
             self.plot_items[name].item.set_xdata(x_data)
 
-        if y_data:
+        if y_data is not None:
             self.plot_items[name].item.set_ydata(y_data)
 
     def fill_line(self, name: str, min_val: float, opacity: float) -> None:
@@ -169,23 +229,27 @@ class AnimatedLinePlotWidget(ctk.CTkFrame):
         if self.plot_items[name].item_type == PlotItemType.TEXT:
             raise ValueError(f"can't update item {name} - not a line")
 
-        x_data: List[float] = self.plot_items[name].item.get_xdata()
-        y_data: List[float] = self.plot_items[name].item.get_ydata()
-
-        if len(x_data) < self.max_points or len(y_data) < self.max_points:
-            raise RuntimeError(f"can't fill line {name} - not enough points", len(x_data), len(y_data))
+        item_params: Dict[str, Any] = self.plot_items[name].params
+        item_params["min_val"] = min_val
 
-        # self.axes.fill_between(x_data[:100], [min_val] * 100, y_data[:100], alpha=opacity)
+        if self.plot_items[name].item_type == PlotItemType.FILLED_LINE:
+            item_params["fill"].set_alpha(opacity)
+            return
 
         item_type: PlotItemType = PlotItemType.FILLED_LINE
         item: mpl.artist = self.plot_items[name].item
-        item_params: Dict[str, Any] = self.plot_items[name].params
 
-        item_params["min_val"] = min_val
         item_params["face_color"] = "#8be9fd"
         item_params["opacity"] = opacity
 
+        # One polygon for the life of the line, whose vertices are updated in place on every animation frame.
+        item_params["fill"] = self.axes.add_collection(
+            PolyCollection([np.zeros((0, 2))], closed=False, facecolor=item_params["face_color"], alpha=opacity,
+                           animated=True),
+            autolim=False)
+
         self.plot_items[name] = PlotItem(item_type, item, item_params)
+        self.update_fill(self.plot_items[name])
 
     def remove_line(self, name: str) -> None:
         # See: https://stackoverflow.com/a/13575495
@@ -203,6 +267,7 @@ class AnimatedLinePlotWidget(ctk.CTkFrame):
 
         item_type: PlotItemType = PlotItemType.TEXT
         item: mpl.artist = self.axes.text(*pos, text, **param_dict)
+        item.set_animated(True)
         item_params: Dict[str, Any] = param_dict
 
         self.plot_items[name] = PlotItem(item_type, item, item_params)
@@ -222,8 +287,20 @@ class AnimatedLinePlotWidget(ctk.CTkFrame):
         if y_range is not None:
             self.y_range = y_range
 
+        view_limits: Tuple[Tuple[float, float], Tuple[float, float]] = (self.axes.get_xlim(), self.axes.get_ylim())
         self.axes.set_xlim(*self.x_range)
         self.axes.set_ylim(*self.y_range)
+        if view_limits == (self.axes.get_xlim(), self.axes.get_ylim()):
+            return
+
+        # Blitting restores a background cached for the current view, and the last frame's artists are still on the
+        # canvas when the view changes. A full redraw gives the new view a clean background. During an animation
+        # frame it's drawn right away, so the background the animation caches for the new view is the redrawn one.
+        if self.is_animating:
+            self.canvas.draw()
+        else:
+            self.canvas.draw_idle()
+            self.request_update()
 
     def clear(self) -> None:
         self.animation.new_frame_seq()
@@ -234,9 +311,11 @@ class AnimatedLinePlotWidget(ctk.CTkFrame):
 
     def pause(self) -> None:
         self.animation.pause()
+        self.is_paused = True
 
     def resume(self) -> None:
         self.animation.resume()
+        self.is_paused = False
 
 
 if __name__ == "__main__":
@@ -311,11 +390,13 @@ if __name__ == "__main__":
 
         def on_mouse_clicked(self, coord: Tuple[float, float]) -> None:
             self.sel_frame = int(coord[0])
+            self.graph.request_update()
 
         def run(self) -> None:
             while True:
                 val: float = random.randint(0, 20) * np.sin(self.x)
                 self.data.append(val)
+                self.graph.request_update()
                 self.x += 0.1
                 time.sleep(0.001)
                 self.update_idletasks()
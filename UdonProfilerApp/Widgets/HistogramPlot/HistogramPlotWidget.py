@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import customtkinter as ctk
+
+import matplotlib as mpl
+import matplotlib.style
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import numpy as np
+
+from Utils.PathResolver import resource_path
+
+
+class HistogramPlotWidget(ctk.CTkFrame):
+    """
+    Static histogram on a logarithmic x axis, e.g. of sample times. Only redrawn when its data is set.
+    """
+
+    def __init__(self, *args,
+                 width: int = 350,
+                 height: int = 150,
+                 x_label: str = "",
+                 **kwargs) -> None:
+        super().__init__(*args, width=width, height=height, **kwargs)
+
+        self.configure(fg_color=("gray78", "gray28"))
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        mpl.use("TkAgg")
+        mpl.style.use(resource_path("Assets\\dracula.mplstyle"))
+
+        self.figure: Figure = Figure(figsize=(width / 100, height / 100), dpi=100, layout="constrained")
+        self.axes: mpl.axes.Axes = self.figure.add_subplot()
+        self.axes.set_xlabel(x_label)
+
+        self.canvas: FigureCanvasTkAgg = FigureCanvasTkAgg(self.figure, self)
+        self.canvas.get_tk_widget().grid(row=0, column=0, sticky="nsew")
+
+        self.set_histogram(np.zeros(0), np.zeros(0, dtype=np.int64))
+
+    def set_histogram(self, edges: np.ndarray, counts: np.ndarray, title: str = "") -> None:
+        """
+        :param edges: Bin edges, one more than there are counts. Must be positive for the logarithmic axis.
+        :param counts: Count of each bin. Nothing is drawn if there are none.
+        """
+
+        for patch in list(self.axes.patches):
+            patch.remove()
+
+        self.axes.set_title(title, fontsize="small")
+        if len(counts) > 0:
+            self.axes.stairs(counts, edges, fill=True)
+            self.axes.set_xscale("log")
+            self.axes.set_xlim(edges[0], edges[-1])
+            self.axes.set_ylim(0, max(1, int(counts.max())) * 1.05)
+        else:
+            self.axes.set_xscale("linear")
+            self.axes.set_xlim(0, 1)
+            self.axes.set_ylim(0, 1)
+
+        self.canvas.draw_idle()
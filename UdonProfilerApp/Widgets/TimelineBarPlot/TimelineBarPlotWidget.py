@@ -1,18 +1,27 @@
-from typing import List, Tuple
+from typing import List, Sequence, Tuple, Union
 
 import customtkinter as ctk
+import numpy as np
 
 import matplotlib as mpl
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+import matplotlib.style
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.transforms import Bbox, TransformedBbox
-from matplotlib.collections import BrokenBarHCollection
+from matplotlib.collections import PolyCollection
+from matplotlib.text import Annotation
 
 from Widgets.NavigationToolbar.NavigationToolbar2CTk import NavigationToolbar2CTk
+from Widgets.TimelineBarPlot.TimelineBarRow import TimelineBarRow
 from Utils.PathResolver import resource_path
 
 
 class TimelineBarPlotWidget(ctk.CTkFrame):
+    # Bars narrower than this on screen are merged with their neighbours.
+    min_bar_px: float = 1.0
+    # Average label character width, relative to the font size.
+    label_char_width: float = 0.6
+
     # Create scrollable matplotlib frame. Doesn't work?
     # See: https://stackoverflow.com/a/74929672
     """
@@ -102,18 +111,16 @@ class TimelineBarPlotWidget(ctk.CTkFrame):
         self.grid_rowconfigure((1, 2), weight=0)
 
         mpl.use("TkAgg")
-        plt.style.use(resource_path("Assets\\dracula.mplstyle"))
+        mpl.style.use(resource_path("Assets\\dracula.mplstyle"))
 
         # TODO: Find a more permanent solution to graph size. Dpi of 74 is a temp fix.
-        self.figure: mpl.Figure = plt.figure(dpi=65)
+        self.figure: Figure = Figure(dpi=65)
 
         # Force graph to fill window.
         # Source: https://stackoverflow.com/a/42620544
         self.axes: mpl.axes.Axes = self.figure.add_axes([0.025, 0.00625, .95, 0.925])
         self.axes.margins(0)
 
-        self.background = self.figure.canvas.copy_from_bbox(self.axes.bbox)
-
         self.axes.set_ylim(0, 1)
         self.axes.set_xlim(0, 1)
         self.axes.set_yticks([])
@@ -124,14 +131,21 @@ class TimelineBarPlotWidget(ctk.CTkFrame):
         self.axes.xaxis.tick_top()
         self.axes.grid(True, axis="x", alpha=0.5)
 
-        self.bars = list()
-        self.annotations = list()
-        self.bar_names = dict()
-        self.bar_infos = dict()
+        # One row of bars per y start, i.e. per sample depth in the timeline view.
+        self.rows: List[TimelineBarRow] = list()
+        # Bottom of each row, ascending, for finding the row under the mouse.
+        self.row_y_starts: np.ndarray = np.zeros(0)
+        self.annotations: List[Annotation] = list()
+        self.bar_height: float = 0
+        self.textcolor: str = ""
+        self.fontsize: int = 0
 
+        # Figure isn't managed by pyplot, so it only gets a drawable canvas here.
         self.canvas: FigureCanvasTkAgg = FigureCanvasTkAgg(self.figure, self)
         self.canvas.get_tk_widget().grid(row=0, column=0, sticky="nsew")
 
+        self.background = self.figure.canvas.copy_from_bbox(self.axes.bbox)
+
         # Remove unnecessary toolbar buttons.
         # See: https://stackoverflow.com/a/59156387
         NavigationToolbar2CTk.toolitems = [t for t in NavigationToolbar2CTk.toolitems if t[0] not in
@@ -154,74 +168,171 @@ class TimelineBarPlotWidget(ctk.CTkFrame):
 
         # Tooltip setup.
         # See: https://stackoverflow.com/a/66501612
+        # Animated, so it's left out of full redraws and blitted over the bars instead of redrawing them on hover.
+        # See: https://matplotlib.org/stable/users/explain/animations/blitting.html
         self.tooltip = self.axes.annotate("", xy=(0, 0), xytext=(20, -20), textcoords="offset points", fontsize=12,
-                                          bbox=dict(boxstyle="round", fc="#282A36", ec="#F8F8F2", lw=2))
+                                          bbox=dict(boxstyle="round", fc="#282A36", ec="#F8F8F2", lw=2),
+                                          animated=True)
+        self.tooltip.set_visible(False)
+        self.bars_background = None
 
+        self.figure.canvas.mpl_connect("draw_event", lambda event: self.on_draw(event))
         self.figure.canvas.mpl_connect("motion_notify_event", lambda event: self.on_hover(event))
 
+        # Toolbar zoom and pan change the x limits, and resizing changes how wide a bar is on screen.
+        self.axes.callbacks.connect("xlim_changed", lambda axes: self.update_lod())
+        self.figure.canvas.mpl_connect("resize_event", lambda event: self.update_lod())
+
         self.canvas.draw()
 
-    def add_bar(self, name: str, y_start: float, height: float, start: float, end: float, facecolor: str,
-                textcolor: str, fontsize: int) -> None:
-        if start > end or (end - start) == 0:
-            raise RuntimeError("bar plot size is invalid", start, end)
-
-        bar = self.axes.broken_barh([(start, end - start)], (y_start, height), facecolors=facecolor, edgecolor="black")
-
-        # Store information for tooltip.
-        self.bar_names[bar] = name
-        if name not in self.bar_infos.keys():
-            self.bar_infos[name] = dict()
-            self.bar_infos[name]["instances"] = 1
-            self.bar_infos[name]["total_duration"] = end - start
-        else:
-            self.bar_infos[name]["instances"] += 1
-            self.bar_infos[name]["total_duration"] += end - start
-
-        self.bars.append(bar)
-
-        # Don't set y lim to allow vertical scrolling. Doing otherwise would force graph to fit all bars in single view.
-        # y_lim_old: Tuple[float, float] = self.axes.get_ylim()
-        # y_lim_new: Tuple[float, float] = (min(y_lim_old[0], y_start - height), max(y_lim_old[1], y_start + height))
-        # self.axes.set_ylim(y_lim_new)
-
-        x_lim_old: Tuple[float, float] = self.axes.get_xlim()
-        x_lim_new: Tuple[float, float] = (min(x_lim_old[0], start), max(x_lim_old[1], end))
-        self.axes.set_xlim(x_lim_new)
-
-        # Clip text within bar boundaries.
-        # See: https://stackoverflow.com/a/27746640
-        box: TransformedBbox = TransformedBbox(
-            Bbox(
-                [[max(start, x_lim_new[0]), y_start],
-                 [min(start + end, x_lim_new[1]), y_start + height]]
-            ),
-            self.axes.transData
-        )
-
-        # Center text within bar boundaries.
-        # See: https://stackoverflow.com/a/66837165
-        annotation = self.axes.annotate(name, xy=(start + (end - start) / 2, y_start + height / 2), color=textcolor,
-                                        ha="center", va="center", fontsize=fontsize, clip_box=box)
-        self.annotations.append(annotation)
-
-        # Force tkinter to update canvas.
+    def set_bars(self, names: Sequence[str], y_starts: np.ndarray, height: float, starts: np.ndarray,
+                 ends: np.ndarray, facecolors: Sequence[str], textcolor: str, fontsize: int) -> None:
+        """
+        Replaces every bar, and draws the plot once. Bars with the same y start share one collection.
+        Only bars in view are drawn, bars narrower than a pixel are merged, and only bars wide enough for their name
+        are labelled. This is redone whenever the view is zoomed, panned or resized.
+        :param names: Name of each bar, shown as its label and in its tooltip.
+        :param y_starts: Bottom of each bar.
+        :param height: Height of every bar.
+        :param starts: Left end of each bar.
+        :param ends: Right end of each bar.
+        :param facecolors: Color of each bar.
+        """
+
+        if np.any(starts >= ends):
+            raise RuntimeError("bar plot size is invalid", int(np.argmax(starts >= ends)))
+
+        self.remove_bars()
+
+        self.bar_height = height
+        self.textcolor = textcolor
+        self.fontsize = fontsize
+
+        if len(names) > 0:
+            bar_names: np.ndarray = np.array(names, dtype=object)
+            bar_facecolors: np.ndarray = np.array(facecolors, dtype=object)
+
+            # Tooltip totals of every name, looked up per bar when hovering.
+            name_idxs: np.ndarray
+            _, name_idxs = np.unique(bar_names, return_inverse=True)
+            instances: np.ndarray = np.bincount(name_idxs)[name_idxs]
+            total_durations: np.ndarray = np.bincount(name_idxs, weights=ends - starts)[name_idxs]
+
+            for y_start in np.unique(y_starts).tolist():
+                row_idxs: np.ndarray = np.flatnonzero(y_starts == y_start)
+                row_idxs = row_idxs[np.argsort(starts[row_idxs], kind="stable")]
+
+                bars: PolyCollection = PolyCollection(list(), edgecolor="black")
+                self.axes.add_collection(bars, autolim=False)
+
+                self.rows.append(TimelineBarRow(y_start, bar_names[row_idxs], starts[row_idxs], ends[row_idxs],
+                                                bar_facecolors[row_idxs], instances[row_idxs],
+                                                total_durations[row_idxs], bars))
+
+            self.row_y_starts = np.array([row.y_start for row in self.rows])
+
+            # Don't set y lim to allow vertical scrolling. Doing otherwise would force graph to fit all bars in
+            # single view. Level of detail is updated below, so x lim callbacks aren't needed.
+            self.axes.set_xlim((min(0.0, float(starts.min())), max(1.0, float(ends.max()))), emit=False)
+
+        self.update_lod()
+
+    def update_lod(self) -> None:
+        """
+        Shows the bars in view at the current zoom level.
+        """
+
+        for annotation in self.annotations:
+            annotation.remove()
+
+        self.annotations.clear()
+
+        if not self.rows:
+            return
+
+        x_lim: Tuple[float, float] = self.axes.get_xlim()
+        px_per_unit: float = self.axes.bbox.width / max(x_lim[1] - x_lim[0], np.finfo(float).eps)
+        min_width: float = TimelineBarPlotWidget.min_bar_px / px_per_unit
+        char_width: float = (self.fontsize * self.figure.dpi / 72 * TimelineBarPlotWidget.label_char_width /
+                             px_per_unit)
+
+        for row in self.rows:
+            # Cull bars outside the view. Ends are only sorted if bars don't overlap, so use the furthest end so far.
+            first: int = int(np.searchsorted(np.maximum.accumulate(row.ends), x_lim[0], side="right"))
+            last: int = int(np.searchsorted(row.starts, x_lim[1], side="left"))
+            starts: np.ndarray = row.starts[first:last]
+            ends: np.ndarray = row.ends[first:last]
+
+            # Merge runs of sub-pixel bars that are less than a pixel apart into one bar.
+            narrow: np.ndarray = ends - starts < min_width
+            merge_with_prev: np.ndarray = np.zeros(len(starts), dtype=bool)
+            merge_with_prev[1:] = narrow[1:] & narrow[:-1] & (starts[1:] - ends[:-1] < min_width)
+            group_starts: np.ndarray = np.flatnonzero(~merge_with_prev)
+
+            bar_starts: np.ndarray = starts[group_starts]
+            bar_ends: np.ndarray = np.maximum.reduceat(ends, group_starts) if len(group_starts) else ends[:0]
+            row.shown_idxs = first + group_starts
+            row.shown_names = row.names[row.shown_idxs].tolist()
+            row.shown_starts = bar_starts
+            row.shown_ends = bar_ends
+            row.shown_max_ends = np.maximum.accumulate(bar_ends)
+            row.shown_counts = np.diff(np.append(group_starts, len(starts)))
+
+            # Rectangle corners of every bar: (start, bottom), (start, top), (end, top), (end, bottom).
+            verts: np.ndarray = np.empty((len(bar_starts), 4, 2))
+            verts[:, (0, 1), 0] = bar_starts[:, np.newaxis]
+            verts[:, (2, 3), 0] = bar_ends[:, np.newaxis]
+            verts[:, (0, 3), 1] = row.y_start
+            verts[:, (1, 2), 1] = row.y_start + self.bar_height
+            row.collection.set_verts(verts)
+            row.collection.set_facecolor(row.facecolors[row.shown_idxs].tolist())
+
+            # Label unmerged bars whose part in view fits their name.
+            label_starts: np.ndarray = np.maximum(bar_starts, x_lim[0])
+            label_ends: np.ndarray = np.minimum(bar_ends, x_lim[1])
+            name_lengths: np.ndarray = np.array([len(name) for name in row.shown_names], dtype=np.float64)
+            labelled: np.ndarray = (row.shown_counts == 1) & (label_ends - label_starts >= name_lengths * char_width)
+
+            for i in np.flatnonzero(labelled).tolist():
+                start: float = float(label_starts[i])
+                end: float = float(label_ends[i])
+
+                # Clip text within bar boundaries.
+                # See: https://stackoverflow.com/a/27746640
+                box: TransformedBbox = TransformedBbox(
+                    Bbox([[start, row.y_start], [end, row.y_start + self.bar_height]]),
+                    self.axes.transData
+                )
+
+                # Center text within bar boundaries.
+                # See: https://stackoverflow.com/a/66837165
+                annotation: Annotation = self.axes.annotate(row.shown_names[i],
+                                                            xy=(start + (end - start) / 2,
+                                                                row.y_start + self.bar_height / 2),
+                                                            color=self.textcolor, ha="center", va="center",
+                                                            fontsize=self.fontsize, clip_box=box)
+                self.annotations.append(annotation)
+
+        # Coalesced with any other redraw before Tk next goes idle.
         # See: https://stackoverflow.com/a/30783010
-        self.canvas.draw()
+        self.canvas.draw_idle()
 
-    def clear(self) -> None:
-        for bar in self.bars:
-            bar.remove()
+    def remove_bars(self) -> None:
+        for row in self.rows:
+            row.collection.remove()
 
-        self.bars.clear()
+        self.rows.clear()
+        self.row_y_starts = np.zeros(0)
 
         for annotation in self.annotations:
             annotation.remove()
 
         self.annotations.clear()
 
-        self.bar_names.clear()
-        self.bar_infos.clear()
+        self.tooltip.set_visible(False)
+
+    def clear(self) -> None:
+        self.remove_bars()
 
         self.axes.set_ylim(0, 1)
         self.axes.set_xlim(0, 1)
@@ -229,17 +340,40 @@ class TimelineBarPlotWidget(ctk.CTkFrame):
         self.figure.canvas.restore_region(self.background)
         self.figure.canvas.blit(self.axes.bbox)
 
-    def update_tooltip(self, bars: BrokenBarHCollection, ind: int, x: float, y: float) -> None:
+    def find_bar(self, x: float, y: float) -> Tuple[Union[TimelineBarRow, None], int]:
+        """
+        :return: Row and index of the shown bar at a point in data coordinates, or (None, -1) if there's none.
+        """
+
+        # Last row starting at or below y.
+        row_idx: int = int(np.searchsorted(self.row_y_starts, y, side="right")) - 1
+        if row_idx < 0 or y > self.rows[row_idx].y_start + self.bar_height:
+            return None, -1
+
+        row: TimelineBarRow = self.rows[row_idx]
+        bar_idx: int = row.find_shown_bar(x)
+        if bar_idx < 0:
+            return None, -1
+
+        return row, bar_idx
+
+    def update_tooltip(self, row: TimelineBarRow, ind: int, x: float, y: float) -> None:
         # Update tooltip when hovering over bar.
         # See: https://stackoverflow.com/a/66501612
         self.tooltip.xy = (x, y)
-        box = bars.get_paths()[ind].get_extents()
 
         # Prepare tooltip display info. Emulate Unity's tooltip info.
-        name: str = self.bar_names[bars]
-        duration: float = box.x1 - box.x0
-        instances: int = self.bar_infos[name]["instances"]
-        total_duration: float = self.bar_infos[name]["total_duration"]
+        name: str = row.shown_names[ind]
+        duration: float = float(row.shown_ends[ind] - row.shown_starts[ind])
+        num_merged: int = int(row.shown_counts[ind])
+        if num_merged > 1:
+            self.tooltip.set_text(f"{num_merged} blocks\n{duration:.0f}ms (zoom in for details)")
+            self.tooltip.get_bbox_patch().set_alpha(0.9)
+            return
+
+        bar_idx: int = int(row.shown_idxs[ind])
+        instances: int = int(row.instances[bar_idx])
+        total_duration: float = float(row.total_durations[bar_idx])
         text = f"{name}\n{duration:.0f}ms"
         if instances > 1:
             text += f"\nTotal:{total_duration:.0f}ms ({instances} Instances)"
@@ -247,22 +381,37 @@ class TimelineBarPlotWidget(ctk.CTkFrame):
         self.tooltip.set_text(text)
         self.tooltip.get_bbox_patch().set_alpha(0.9)
 
+    def on_draw(self, event) -> None:
+        # Bars were redrawn (new frame, zoom, resize), so the tooltip is blitted over a new background.
+        self.bars_background = self.figure.canvas.copy_from_bbox(self.figure.bbox)
+        self.blit_tooltip()
+
+    def blit_tooltip(self) -> None:
+        if self.bars_background is None:
+            return
+
+        self.figure.canvas.restore_region(self.bars_background)
+        if self.tooltip.get_visible():
+            self.figure.draw_artist(self.tooltip)
+        self.figure.canvas.blit(self.figure.bbox)
+
     def on_hover(self, event) -> None:
         # Handle mouse hover event.
         # See: https://stackoverflow.com/a/66501612
         vis = self.tooltip.get_visible()
         if event.inaxes == self.axes:
-            for _, bars in enumerate(self.axes.collections):
-                bar_contains, ind = bars.contains(event)
-                if bar_contains:
-                    self.update_tooltip(bars, ind['ind'][0], event.xdata, event.ydata)
-                    self.tooltip.set_visible(True)
-                    self.figure.canvas.draw_idle()
-                    return
+            row: Union[TimelineBarRow, None]
+            ind: int
+            row, ind = self.find_bar(event.xdata, event.ydata)
+            if row:
+                self.update_tooltip(row, ind, event.xdata, event.ydata)
+                self.tooltip.set_visible(True)
+                self.blit_tooltip()
+                return
 
         if vis:
             self.tooltip.set_visible(False)
-            self.figure.canvas.draw_idle()
+            self.blit_tooltip()
 
 
 if __name__ == "__main__":
@@ -279,8 +428,9 @@ if __name__ == "__main__":
             self.bar_plot: TimelineBarPlotWidget = TimelineBarPlotWidget(self)
             self.bar_plot.grid(row=0, column=0, sticky="nsew")
 
-            self.bar_plot.add_bar("VeryLongTextLabel", 20, 4, 10, 80, "tab:blue", "white", 8)
-            self.bar_plot.add_bar("VeryLongTextLabel", 20, 4, 300, 350, "tab:blue", "white", 8)
+            self.bar_plot.set_bars(["VeryLongTextLabel", "VeryLongTextLabel"], np.array([20.0, 20.0]), 4,
+                                   np.array([10.0, 300.0]), np.array([80.0, 350.0]), ["tab:blue", "tab:blue"],
+                                   "white", 8)
 
             self.bar_plot.clear()
 
@@ -0,0 +1,69 @@
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+from matplotlib.collections import PolyCollection
+
+
+@dataclass
+class TimelineBarRow:
+    """
+    Bars that share a y start, e.g. every block of one sample depth.
+    Every bar is kept, and the collection only shows the bars in view, with bars too narrow to see merged.
+    """
+
+    y_start: float
+    # Every bar in the row, sorted by start. Ends are sorted too, unless a parent bar covers a gap between its calls.
+    names: np.ndarray
+    starts: np.ndarray
+    ends: np.ndarray
+    facecolors: np.ndarray
+    # Number of bars with each bar's name, and their total duration, over every row. Shown in tooltips.
+    instances: np.ndarray
+    total_durations: np.ndarray
+    collection: PolyCollection
+    # Bars shown in the collection, in collection order. A merged bar has the name of its first bar.
+    shown_idxs: np.ndarray
+    shown_names: List[str]
+    shown_starts: np.ndarray
+    shown_ends: np.ndarray
+    # Furthest end of the shown bars up to each bar. Sorted even where bars overlap, so it can be searched.
+    shown_max_ends: np.ndarray
+    shown_counts: np.ndarray
+
+    def __init__(self, y_start: float, names: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                 facecolors: np.ndarray, instances: np.ndarray, total_durations: np.ndarray,
+                 collection: PolyCollection) -> None:
+        self.y_start = y_start
+        self.names = names
+        self.starts = starts
+        self.ends = ends
+        self.facecolors = facecolors
+        self.instances = instances
+        self.total_durations = total_durations
+        self.collection = collection
+        self.shown_idxs = np.zeros(0, dtype=np.int64)
+        self.shown_names = list()
+        self.shown_starts = np.zeros(0)
+        self.shown_ends = np.zeros(0)
+        self.shown_max_ends = np.zeros(0)
+        self.shown_counts = np.zeros(0, dtype=np.int64)
+
+    def find_shown_bar(self, x: float) -> int:
+        """
+        :return: Index of the shown bar at x, or -1 if there's none. If several bars cover x, the one that starts
+                 last. O(log n) in the number of shown bars, plus the number of bars between the first and last
+                 that can cover x.
+        """
+
+        # Bars overlap where bars of the same depth are collapsed into one, e.g. a parent covering the gaps
+        # between its calls, so the last bar starting before x may end before x while an earlier, wider bar
+        # covers it. Bars that can cover x lie between the first whose furthest end so far reaches x and the last
+        # that starts at or before x.
+        first: int = int(np.searchsorted(self.shown_max_ends, x, side="left"))
+        last: int = int(np.searchsorted(self.shown_starts, x, side="right")) - 1
+        if first > last:
+            return -1
+
+        # First bar always covers x, since it's the first to reach it.
+        return first + int(np.flatnonzero(self.shown_ends[first:last + 1] >= x)[-1])
@@ -5,7 +5,7 @@ from Widgets.Tree.TreeColumnConfig import TreeColumnConfig
 
 
 class TreeWidgetTest(ctk.CTk):
-    def __init__(self) -> None:
+    def __init__(self, virtualized: bool = False, num_extra_entries: int = 0) -> None:
         super().__init__()
 
         self.title("TreeWidget Test")
@@ -14,7 +14,7 @@ class TreeWidgetTest(ctk.CTk):
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(0, weight=1)
 
-        self.tree_widget: TreeWidget = TreeWidget(self)
+        self.tree_widget: TreeWidget = TreeWidget(self, virtualized=virtualized, expand_all_btn=True)
         self.tree_widget.grid(row=0, column=0, sticky="nsew")
 
         name_col_config: TreeColumnConfig = TreeColumnConfig("Overview", 150, 1)
@@ -57,6 +57,13 @@ class TreeWidgetTest(ctk.CTk):
                                    ["FuncC", "100%", "15%", 25, 3.00, 0.50],
                                    "rootB")
 
+        # Stress entries, e.g. for checking that a virtualized tree stays responsive.
+        for i in range(0, num_extra_entries):
+            self.tree_widget.add_entry(f"rootB/FuncC/Func{i}",
+                                       2,
+                                       [f"Func{i}", f"{i % 100}%", "1%", i, i * 0.01, 0.01],
+                                       "rootB/FuncC")
+
         self.tree_widget.render_tree()
 
         """
@@ -76,5 +83,12 @@ class TreeWidgetTest(ctk.CTk):
 
 
 if __name__ == "__main__":
-    app: TreeWidgetTest = TreeWidgetTest()
+    import sys
+
+    # Pass "virtualized" to test the virtualized tree body with 10000 extra entries.
+    app: TreeWidgetTest
+    if "virtualized" in sys.argv:
+        app = TreeWidgetTest(virtualized=True, num_extra_entries=10000)
+    else:
+        app = TreeWidgetTest()
     app.mainloop()
@@ -12,30 +12,36 @@ if TYPE_CHECKING:
 
 
 class TreeBody(ctk.CTkScrollableFrame):
-    root_name: str = ""
+    root_name: Hashable = ""
 
     def __init__(self, *args,
                  width: int = 100,
                  height: int = 300,
                  col_configs: List[TreeColumnConfig],
+                 select_cb: Union[Callable[[Union[Hashable, None]], None], None] = None,
                  **kwargs) -> None:
         super().__init__(*args, width=width, height=height, **kwargs)
 
         self.col_configs: List[TreeColumnConfig] = col_configs
+        self.select_cb: Union[Callable[[Union[Hashable, None]], None], None] = select_cb
 
         self.configure(fg_color=("gray78", "gray28"))
         self.grid_columnconfigure(0, weight=1)
 
         self.tree: TreeDataStructure = TreeDataStructure()
         self.sel_entry: Union[TreeEntry, None] = None
-        self.entry_grid_infos: Dict[TreeEntry, Dict[str, Any]] = dict()
         self.entry_expand_states: Dict[TreeEntry, bool] = dict()
+        # Grid row of each entry and whether it's gridded, so drawing only touches entries that moved, appeared or
+        # disappeared.
+        self.entry_rows: Dict[TreeEntry, int] = dict()
+        self.entry_shown_states: Dict[TreeEntry, bool] = dict()
 
-    def add_entry(self, name: str, indent: int, data: List[Any], parent_name: str,
+    def add_entry(self, name: Hashable, indent: int, data: List[Any], parent_name: Hashable,
                   default_expand: bool = False, default_select: bool = False) -> None:
         # Create tree node.
         entry_config: TreeEntryConfig = TreeEntryConfig(name, indent, data,
-                                                        self.on_entry_clicked, self.on_entry_expanded)
+                                                        self.on_entry_clicked, self.on_entry_expanded,
+                                                        self.format_data(data))
         entry: TreeEntry = TreeEntry(master=self, entry_config=entry_config,
                                      col_minsizes=[x.minsize for x in self.col_configs],
                                      col_weights=[x.weight for x in self.col_configs])
@@ -49,65 +55,72 @@ class TreeBody(ctk.CTkScrollableFrame):
             self.sel_entry = entry
 
         # Insert node into tree.
-        if parent_name == TreeBody.root_name:
-            self.tree.root_node.add_child(child_node)
-        else:
-            parent_node: Union[TreeNode, None] = None
-            for node in self.tree.root_node:
-                if not node.entry:
-                    continue
-                if node.entry.entry_config.name == parent_name:
-                    parent_node = node
-                    break
-
-            if parent_node:
-                parent_node.add_child(child_node)
-            else:
-                raise RuntimeError(f"Tree entry parent named: {parent_name} does not exist")
-
-    def update_entry(self, name: str, data: List[Any]) -> None:
-        for node in self.tree.root_node:
-            if not node.entry:
-                continue
+        self.tree.add_node(child_node, None if parent_name == TreeBody.root_name else parent_name)
 
-            if node.entry.entry_config.name == name:
-                node.entry.update_entry(data)
-                break
+    def update_entry(self, name: Hashable, data: List[Any]) -> None:
+        node: Union[TreeNode, None] = self.tree.get_node(name)
+        if node and node.entry:
+            node.entry.update_entry(data, self.format_data(data))
 
-    def contains_entry(self, name: str) -> bool:
-        for node in self.tree.root_node:
+    def format_data(self, data: List[Any]) -> List[str]:
+        return [col_config.format(x) for col_config, x in zip(self.col_configs, data)]
+
+    def remove_entry(self, name: Hashable) -> None:
+        for node in self.tree.remove_node(name):
             if not node.entry:
                 continue
 
-            if node.entry.entry_config.name == name:
-                return True
+            if node.entry == self.sel_entry:
+                self.sel_entry = None
 
-        return False
+            self.entry_expand_states.pop(node.entry, None)
+            self.entry_rows.pop(node.entry, None)
+            self.entry_shown_states.pop(node.entry, None)
+            node.entry.grid_forget()
+            node.entry.destroy()
+
+    def contains_entry(self, name: Hashable) -> bool:
+        return name in self.tree
 
     def draw_tree(self) -> None:
-        # Flatten tree indices.
+        """
+        Grids entries at their pre-order index, and hides entries with a collapsed ancestor.
+        Only entries whose index or visibility changed are re-gridded, so redrawing after a sort or an expand only
+        moves the rows that changed.
+        """
+
+        shown_entries: List[Tuple[TreeEntry, int]] = list()
+        hidden_entries: List[TreeEntry] = list()
+
+        # Pre-order traversal. Each node is paired with whether all of its ancestors are expanded.
+        stack: List[Tuple[TreeNode, bool]] = [(child, True) for child in reversed(self.tree.root_node.children)]
         cur_idx: int = 0
-        for node in self.tree.root_node:
+        while stack:
+            node, visible = stack.pop()
             if not node.entry:
                 continue
 
-            if len(node.children) == 0:
-                node.entry.disable_expand()
+            entry: TreeEntry = node.entry
+            if len(node.children) == 0 and entry.expand_btn.cget("state") != "disabled":
+                entry.disable_expand()
 
-            node.entry.grid(row=cur_idx, column=0, sticky="ew")
-            self.store_entry_grid_info(node.entry)
-            cur_idx += 1
+            # Sets correct button symbol if expanded.
+            if self.entry_expand_states[entry] != entry.expanded:
+                entry.set_expanded(self.entry_expand_states[entry])
 
-        # Needs to be in a separate loop.
-        for node in self.tree.root_node:
-            if not node.entry:
-                continue
+            moved: bool = self.entry_rows.get(entry) != cur_idx
+            self.entry_rows[entry] = cur_idx
 
-            self.restore_entry_expand_state(node.entry)
+            if visible and (moved or not self.entry_shown_states.get(entry, False)):
+                shown_entries.append((entry, cur_idx))
+            elif not visible and self.entry_shown_states.get(entry, False):
+                hidden_entries.append(entry)
 
-            # Sets correct button symbol if expanded.
-            if self.entry_expand_states[node.entry] and not node.entry.expanded:
-                node.entry.on_expanded()
+            cur_idx += 1
+            child_visible: bool = visible and self.entry_expand_states[entry]
+            stack.extend((child, child_visible) for child in reversed(node.children))
+
+        self.update_layout(shown_entries, hidden_entries)
 
         if self.sel_entry:
             self.sel_entry.select()
@@ -121,94 +134,79 @@ class TreeBody(ctk.CTkScrollableFrame):
             node.entry.destroy()
 
         self.sel_entry = None
-        self.tree.root_node = TreeNode()
+        self.tree.clear()
+        self.entry_expand_states.clear()
+        self.entry_rows.clear()
+        self.entry_shown_states.clear()
 
     def sort_by(self, key: int, reverse: bool = False) -> None:
         self.tree.sort(key, reverse)
 
+    def order_by(self, names: List[Hashable]) -> None:
+        self.tree.order_by(names)
+
+    def get_expand_states(self) -> Dict[Hashable, bool]:
+        return {entry.entry_config.name: expanded for entry, expanded in self.entry_expand_states.items()}
+
+    def get_selected_name(self) -> Union[Hashable, None]:
+        if not self.sel_entry:
+            return None
+
+        return self.sel_entry.entry_config.name
+
     def on_entry_clicked(self, entry: TreeEntry, clicked: bool) -> None:
         # Force highlighting of selected node only.
-        # TODO: Call a user-defined callback here.
+        # Only the previously selected entry can still be highlighted.
+        if self.sel_entry and self.sel_entry != entry:
+            self.sel_entry.deselect()
+
         if clicked:
             self.sel_entry = entry
         else:
             self.sel_entry = None
 
-        for node in self.tree.root_node:
-            if not node.entry:
-                continue
-
-            if node.entry != entry:
-                node.entry.deselect()
+        if self.select_cb:
+            self.select_cb(self.get_selected_name())
 
     def on_entry_expanded(self, entry: TreeEntry, expanded: bool) -> None:
-        node: Union[TreeNode, None] = self.tree.search(entry)
-        if not node:
+        if not self.tree.search(entry):
             raise ValueError("Expanded tree entry does not have a node assigned", repr(entry))
 
+        # Descendants keep their own expand state, so they're shown the way they were left.
         self.store_entry_expand_state(entry, expanded)
-        if expanded:
-            # Restore expanded state for all immediate children and their descendants.
-            self.restore_descendants(node)
-        else:
-            # Hide all immediate children and their descendants.
-            # Store expanded state for when we expand this node.
-            self.hide_descendants(node)
+        self.draw_tree()
 
-    def restore_descendants(self, node: TreeNode) -> None:
-        if not node.entry:
-            return
-
-        # If current node is not expanded, we won't need to show its children.
-        if not self.entry_expand_states[node.entry]:
-            return
+    def set_all_expanded(self, expanded: bool) -> None:
+        for entry in self.entry_expand_states.keys():
+            self.entry_expand_states[entry] = expanded
 
-        # Show children of current node.
-        for child in node.children:
-            if child.entry:
-                self.show_entry(child.entry)
-            self.restore_descendants(child)
-
-    def hide_descendants(self, node: TreeNode) -> None:
-        for child in node.children:
-            if not child.entry:
-                continue
-            self.hide_entry(child.entry)
-            self.hide_descendants(child)
+        self.draw_tree()
 
-    def hide_entry(self, entry: TreeEntry) -> None:
-        entry.grid_forget()
+    def update_layout(self, shown_entries: List[Tuple[TreeEntry, int]], hidden_entries: List[TreeEntry]) -> None:
+        """
+        Grids and hides entries in one Tcl script instead of one geometry manager call per entry.
+        Geometry propagation is suspended meanwhile, so the body is only resized once, for the final layout.
+        """
 
-    def show_entry(self, entry: TreeEntry) -> None:
-        self.restore_entry_grid_info(entry)
+        if not shown_entries and not hidden_entries:
+            return
 
-    def store_entry_grid_info(self, entry: TreeEntry) -> None:
-        # See: https://stackoverflow.com/a/37732268
-        info: Dict[str, Any] = entry.grid_info()
-        self.entry_grid_infos[entry] = info
+        # Entries have no padding, so gridding them directly skips nothing that CustomTkinter's grid wrapper scales.
+        # See: https://www.tcl.tk/man/tcl8.6/TkCmd/grid.html
+        commands: List[str] = list()
+        if hidden_entries:
+            commands.append("grid remove " + " ".join(str(entry) for entry in hidden_entries))
+        commands.extend(f"grid configure {entry} -row {row} -column 0 -sticky ew" for entry, row in shown_entries)
 
-    def restore_entry_grid_info(self, entry: TreeEntry) -> None:
-        if entry not in self.entry_grid_infos:
-            raise RuntimeError("Tree entry's grid information not stored", repr(entry))
+        propagate: bool = bool(self.grid_propagate())
+        self.grid_propagate(False)
+        self.tk.eval("\n".join(commands))
+        self.grid_propagate(propagate)
 
-        info: Dict[str, Any] = self.entry_grid_infos[entry]
-        entry.grid(**info)
+        for entry in hidden_entries:
+            self.entry_shown_states[entry] = False
+        for entry, _ in shown_entries:
+            self.entry_shown_states[entry] = True
 
     def store_entry_expand_state(self, entry: TreeEntry, expanded: bool) -> None:
         self.entry_expand_states[entry] = expanded
-
-    def restore_entry_expand_state(self, entry: TreeEntry) -> None:
-        if entry not in self.entry_expand_states:
-            raise RuntimeError("Tree entry's grid information not stored", repr(entry))
-
-        node: Union[TreeNode, None] = self.tree.search(entry)
-        if not node:
-            raise ValueError("Tree entry does not have a node assigned", repr(entry))
-
-        for child in node.children:
-            if not child.entry:
-                continue
-            if self.entry_expand_states[entry]:
-                self.show_entry(child.entry)
-            else:
-                self.hide_entry(child.entry)
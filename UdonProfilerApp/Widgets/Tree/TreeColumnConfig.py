@@ -6,8 +6,15 @@ class TreeColumnConfig:
     name: str
     minsize: int
     weight: int
+    # Format of the column's values, e.g. "{:.2f}". Entries keep the typed values, which are also what the column is
+    # sorted by.
+    fmt: str
 
-    def __init__(self, name: str, minsize: int, weight: int) -> None:
+    def __init__(self, name: str, minsize: int, weight: int, fmt: str = "{}") -> None:
         self.name = name
         self.minsize = minsize
         self.weight = weight
+        self.fmt = fmt
+
+    def format(self, value: Any) -> str:
+        return self.fmt.format(value)
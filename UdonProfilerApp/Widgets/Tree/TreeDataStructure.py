@@ -11,18 +11,98 @@ if TYPE_CHECKING:
 @dataclass
 class TreeDataStructure:
     root_node: TreeNode
+    name_index: Dict[Hashable, TreeNode]
+    entry_index: Dict[TreeEntry, TreeNode]
 
     def __init__(self) -> None:
         self.root_node = TreeNode()
 
+        # Nodes by entry name and by entry widget, so lookups don't walk the tree.
+        self.name_index = dict()
+        self.entry_index = dict()
+
+    def __len__(self) -> int:
+        return len(self.name_index)
+
+    def __contains__(self, name: Hashable) -> bool:
+        return name in self.name_index
+
+    def add_node(self, node: TreeNode, parent_name: Union[Hashable, None] = None) -> None:
+        """
+        Inserts a node as the last child of its parent.
+        :param node: Node to insert. Must have an entry config, which names it.
+        :param parent_name: Name of the parent node, or None for a top level node.
+        """
+
+        if not node.config:
+            raise ValueError("Tree node has no entry config", repr(node))
+
+        parent_node: TreeNode = self.root_node
+        if parent_name is not None:
+            found_node: Union[TreeNode, None] = self.name_index.get(parent_name)
+            if not found_node:
+                raise RuntimeError(f"Tree entry parent named: {parent_name} does not exist")
+            parent_node = found_node
+
+        parent_node.add_child(node)
+
+        self.name_index[node.config.name] = node
+        if node.entry:
+            self.entry_index[node.entry] = node
+
+    def remove_node(self, name: Hashable) -> List[TreeNode]:
+        """
+        Removes a node and its descendants.
+        :param name: Name of the node to remove.
+        :return: Removed nodes, or an empty list if no node has that name.
+        """
+
+        node: Union[TreeNode, None] = self.name_index.get(name)
+        if not node:
+            return list()
+
+        if node.parent:
+            node.parent.children.remove(node)
+            node.parent = None
+
+        removed_nodes: List[TreeNode] = list(node)
+        for removed_node in removed_nodes:
+            if removed_node.config:
+                self.name_index.pop(removed_node.config.name, None)
+            if removed_node.entry:
+                self.entry_index.pop(removed_node.entry, None)
+
+        return removed_nodes
+
+    def get_node(self, name: Hashable) -> Union[TreeNode, None]:
+        return self.name_index.get(name)
+
     def search(self, data: TreeEntry) -> Union[TreeNode, None]:
-        for node in self.root_node:
-            if node.entry == data:
-                return node
+        return self.entry_index.get(data)
 
-        return None
+    def clear(self) -> None:
+        self.root_node = TreeNode()
+        self.name_index.clear()
+        self.entry_index.clear()
 
     def sort(self, key: int, reverse: bool = False) -> None:
-        # Sorting children of each node preserves tree structure.
-        for node in self.root_node:
+        # Sorting children of each node preserves tree structure. Nodes are only reordered, so indices stay valid.
+        # Leaves have nothing to sort, so only nodes with children are visited.
+        stack: List[TreeNode] = [self.root_node]
+        while stack:
+            node: TreeNode = stack.pop()
             node.sort_children(key, reverse)
+            stack.extend(child for child in node.children if child.children)
+
+    def order_by(self, names: List[Hashable]) -> None:
+        """
+        Orders the children of each node by where their names are in a list. Children not in it keep their order,
+        after those that are.
+        """
+
+        ranks: Dict[Hashable, int] = {name: i for i, name in enumerate(names)}
+        stack: List[TreeNode] = [self.root_node]
+        while stack:
+            node: TreeNode = stack.pop()
+            node.children.sort(key=lambda child: ranks.get(child.config.name if child.config else None, len(ranks)))
+            stack.extend(child for child in node.children if child.children)
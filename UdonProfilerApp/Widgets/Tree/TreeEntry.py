@@ -38,22 +38,24 @@ class TreeEntry(ctk.CTkFrame):
         self.expand_btn.grid(row=0, column=0, padx=(0, 10), sticky="ew")
 
         self.labels: List[ctk.CTkLabel] = list()
-        for i in range(0, len(self.entry_config.data)):
+        # Text of each label, so unchanged labels are skipped without asking Tk.
+        self.shown_texts: List[str] = list()
+        for i in range(0, len(self.entry_config.texts)):
             self.grid_columnconfigure(i + 1, weight=self.col_weights[i], minsize=self.col_minsizes[i])
 
+            text: str = self.get_text(i)
             lbl: ctk.CTkLabel
             if i == 0:
-                # Indent first column to signify tree structure.
-                lbl = ctk.CTkLabel(self, text=" " * self.entry_config.indent * 5 +
-                                              (self.entry_config.data[i]), anchor="w", corner_radius=0)
+                lbl = ctk.CTkLabel(self, text=text, anchor="w", corner_radius=0)
             else:
-                lbl = ctk.CTkLabel(self, text=str(self.entry_config.data[i]), anchor="center", corner_radius=0)
+                lbl = ctk.CTkLabel(self, text=text, anchor="center", corner_radius=0)
             # Force column contents to fit.
             # lbl.grid(row=0, column=i+1, padx=(5, max(10, self.col_minsizes[i] -
             #                                          len(str(self.entry_config.data)) * 4 - 5)), sticky="ew")
             lbl.grid(row=0, column=i+1, padx=(5, 5), sticky="ew")
             lbl.bind("<Button>", lambda event: self.on_clicked())
             self.labels.append(lbl)
+            self.shown_texts.append(text)
 
             # See: https://stackoverflow.com/a/60086946
             # self.winfo_toplevel().update()
@@ -80,6 +82,14 @@ class TreeEntry(ctk.CTkFrame):
 
         self.entry_config.expand_cb(self, self.expanded)
 
+    def set_expanded(self, expanded: bool) -> None:
+        """
+        Shows the entry as expanded or collapsed, without notifying the tree.
+        """
+
+        self.expanded = expanded
+        self.expand_btn.configure(text=TreeEntry.expanded_sym if expanded else TreeEntry.collapsed_sym)
+
     def select(self) -> None:
         self.selected = True
         self.configure(fg_color=TreeEntry.selected_color)
@@ -93,13 +103,44 @@ class TreeEntry(ctk.CTkFrame):
         self.expand_btn.configure(state="disabled")
         self.expand_btn.configure(text="")
 
-    def update_entry(self, data: List[Any]) -> None:
+    def set_entry_config(self, entry_config: TreeEntryConfig, expandable: bool, expanded: bool,
+                         selected: bool) -> None:
+        """
+        Rebinds the entry to another tree node. Used by virtualized trees, which reuse a fixed pool of entries.
+        """
+
+        self.entry_config = entry_config
+        self.update_entry(entry_config.data, entry_config.texts)
+
+        if expandable:
+            sym: str = TreeEntry.expanded_sym if expanded else TreeEntry.collapsed_sym
+            if self.expand_btn.cget("state") != "normal" or self.expand_btn.cget("text") != sym:
+                self.expand_btn.configure(state="normal", text=sym)
+        elif self.expand_btn.cget("state") != "disabled":
+            self.disable_expand()
+        self.expanded = expanded
+
+        if selected != self.selected:
+            if selected:
+                self.select()
+            else:
+                self.deselect()
+
+    def update_entry(self, data: List[Any], texts: List[str]) -> None:
         self.entry_config.data = data
+        self.entry_config.texts = texts
 
         for i in range(0, len(self.labels)):
-            lbl: ctk.CTkLabel = self.labels[i]
-            if i == 0:
-                # Indent first column to signify tree structure.
-                lbl.configure(text=" " * self.entry_config.indent * 5 + (self.entry_config.data[i]))
-            else:
-                lbl.configure(text=self.entry_config.data[i])
+            text: str = self.get_text(i)
+
+            # Reconfiguring a label redraws it, even when the text is unchanged.
+            if self.shown_texts[i] != text:
+                self.labels[i].configure(text=text)
+                self.shown_texts[i] = text
+
+    def get_text(self, col_idx: int) -> str:
+        if col_idx == 0:
+            # Indent first column to signify tree structure.
+            return " " * self.entry_config.indent * 5 + self.entry_config.texts[col_idx]
+
+        return self.entry_config.texts[col_idx]
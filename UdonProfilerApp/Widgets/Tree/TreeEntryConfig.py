@@ -8,17 +8,21 @@ if TYPE_CHECKING:
 
 @dataclass
 class TreeEntryConfig:
-    name: str
+    name: Hashable
     indent: int
+    # Typed values, which the tree is sorted by, and their formatted text.
     data: List[Any]
+    texts: List[str]
     click_cb: Callable[[TreeEntry, bool], None]
     expand_cb: Callable[[TreeEntry, bool], None]
 
-    def __init__(self, name: str, indent: int, data: List[Any],
+    def __init__(self, name: Hashable, indent: int, data: List[Any],
                  click_cb: Callable[[TreeEntry, bool], None],
-                 expand_cb: Callable[[TreeEntry, bool], None]) -> None:
+                 expand_cb: Callable[[TreeEntry, bool], None],
+                 texts: Union[List[str], None] = None) -> None:
         self.name = name
         self.indent = indent
         self.data = data
+        self.texts = texts if texts is not None else [str(x) for x in data]
         self.click_cb = click_cb
         self.expand_cb = expand_cb
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from Widgets.Tree.common import *
 
+from Widgets.Tree.TreeEntry import TreeEntry
 from Widgets.Tree.TreeHeaderColumn import TreeHeaderColumn
 
 if TYPE_CHECKING:
@@ -14,11 +15,18 @@ class TreeHeader(ctk.CTkFrame):
                  height: int = 32,
                  cols_config: List[TreeColumnConfig],
                  sort_cb: Callable[[int, int], None],
+                 expand_all_cb: Union[Callable[[bool], None], None] = None,
                  **kwargs) -> None:
+        """
+        :param expand_all_cb: Called with whether to expand or collapse every entry. No expand all button if None.
+        """
+
         super().__init__(*args, width=width, height=height, **kwargs)
 
         self.cols_config: List[TreeColumnConfig] = cols_config
         self.sort_cb: Callable[[int, int], None] = sort_cb
+        self.expand_all_cb: Union[Callable[[bool], None], None] = expand_all_cb
+        self.all_expanded: bool = False
 
         self.configure(fg_color=("gray78", "gray28"))
         self.grid_rowconfigure(0, weight=1)
@@ -30,6 +38,11 @@ class TreeHeader(ctk.CTkFrame):
                                                             state="disabled")
         self.placeholder_btn.grid(row=0, column=0, padx=(0, 10), sticky="ew")
 
+        # Sits above the entries' expand buttons.
+        if self.expand_all_cb:
+            self.placeholder_btn.configure(text=TreeEntry.collapsed_sym, width=20, state="normal",
+                                           command=self.on_expand_all_btn_clicked)
+
         self.cols: List[TreeHeaderColumn] = list()
         for i in range(0, len(self.cols_config)):
             self.grid_columnconfigure(i+1, weight=self.cols_config[i].weight, minsize=self.cols_config[i].minsize)
@@ -50,6 +63,13 @@ class TreeHeader(ctk.CTkFrame):
 
             self.cols.append(col)
 
+    def on_expand_all_btn_clicked(self) -> None:
+        self.all_expanded = not self.all_expanded
+        self.placeholder_btn.configure(text=TreeEntry.expanded_sym if self.all_expanded else TreeEntry.collapsed_sym)
+
+        if self.expand_all_cb:
+            self.expand_all_cb(self.all_expanded)
+
     def on_col_btn_clicked(self, col_idx: int, btn_state: int) -> None:
         self.sort_cb(col_idx, btn_state)
 
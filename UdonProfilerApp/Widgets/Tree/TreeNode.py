@@ -1,19 +1,30 @@
 from __future__ import annotations
 
+import numpy as np
+
 from Widgets.Tree.common import *
 
 if TYPE_CHECKING:
     from Widgets.Tree.TreeEntry import TreeEntry
+    from Widgets.Tree.TreeEntryConfig import TreeEntryConfig
 
 
 @dataclass
 class TreeNode:
     entry: Union[TreeEntry, None]
+    config: Union[TreeEntryConfig, None]
     parent: Union[TreeNode, None]
     children: List[TreeNode]
 
-    def __init__(self, data: Union[TreeEntry, None] = None) -> None:
+    def __init__(self, data: Union[TreeEntry, None] = None, config: Union[TreeEntryConfig, None] = None) -> None:
+        """
+        :param data: Entry widget shown for this node.
+        :param config: Entry configuration. Defaults to the entry widget's. Virtualized trees only store the
+                       configuration, and bind it to a pooled entry widget while the node is on screen.
+        """
+
         self.entry = data
+        self.config = config if config or not data else data.entry_config
         self.parent = None
         self.children = list()
 
@@ -27,6 +38,7 @@ class TreeNode:
             yield from child.__iter__()
 
     def add_child(self, child: TreeNode) -> None:
+        child.parent = self
         self.children.append(child)
 
     def sort_children(self, key: int, reverse: bool = False) -> None:
@@ -37,10 +49,20 @@ class TreeNode:
             raise KeyError("Sort index out of range", repr(key), repr(len(self.children)))
 
         for child in self.children:
-            if not child.entry:
+            if not child.config:
                 continue
-            if key >= len(child.entry.entry_config.data):
+            if key >= len(child.config.data):
                 raise KeyError("Sort index out of range", repr(key), repr(len(self.children)))
 
         # Ignore the mypy warning - c.data is guaranteed to be not None from previous check.
-        self.children.sort(key=lambda c: c.entry.entry_config.data[key], reverse=reverse)
+        keys: List[Any] = [child.config.data[key] for child in self.children]
+
+        # Children are permuted by an index array. Numeric columns are sorted by NumPy, as numbers.
+        numeric_keys: np.ndarray = np.asarray(keys)
+        order: Union[np.ndarray, List[int]]
+        if numeric_keys.dtype.kind in "biuf":
+            order = np.argsort(-numeric_keys.astype(np.float64) if reverse else numeric_keys, kind="stable")
+        else:
+            order = sorted(range(0, len(keys)), key=keys.__getitem__, reverse=reverse)
+
+        self.children = [self.children[i] for i in order]
@@ -2,6 +2,7 @@ from Widgets.Tree.common import *
 
 from Widgets.Tree.TreeHeader import TreeHeader
 from Widgets.Tree.TreeBody import TreeBody
+from Widgets.Tree.VirtualTreeBody import VirtualTreeBody
 from Widgets.Tree.TreeColumnConfig import TreeColumnConfig
 from Widgets.Tree.TreeEntry import TreeEntry
 
@@ -10,13 +11,30 @@ class TreeWidget(ctk.CTkFrame):
     def __init__(self, *args,
                  width: int = 350,
                  height: int = 500,
+                 virtualized: bool = False,
+                 expand_all_btn: bool = False,
+                 select_cb: Union[Callable[[Union[Hashable, None]], None], None] = None,
                  **kwargs) -> None:
+        """
+        :param virtualized: Only create entry widgets for the rows on screen. Use for trees with many entries.
+        :param expand_all_btn: Show a button in the header that expands or collapses every entry.
+        :param select_cb: Called with the name of the entry clicked, or None if it was deselected.
+        """
+
         super().__init__(*args, width=width, height=height, **kwargs)
 
+        self.virtualized: bool = virtualized
+        self.expand_all_btn: bool = expand_all_btn
+        self.select_cb: Union[Callable[[Union[Hashable, None]], None], None] = select_cb
         self.header: Union[TreeHeader, None] = None
-        self.body: Union[TreeBody, None] = None
+        self.body: Union[TreeBody, VirtualTreeBody, None] = None
 
         self.col_configs: List[TreeColumnConfig] = list()
+
+        # Sort column and order picked in the header, re-applied when entries are added or updated.
+        self.sort_col_idx: Union[int, None] = None
+        self.sort_reverse: bool = False
+        self.entries_changed: bool = False
         self.entries: List[TreeEntry] = list()
 
         # self.configure(fg_color=("gray78", "gray28"))
@@ -39,41 +57,105 @@ class TreeWidget(ctk.CTkFrame):
         """
 
         self.header = TreeHeader(master=self, cols_config=config,
-                                 sort_cb=lambda col_idx, btn_state: self.on_sort_btn_clicked(col_idx, btn_state))
+                                 sort_cb=lambda col_idx, btn_state: self.on_sort_btn_clicked(col_idx, btn_state),
+                                 expand_all_cb=self.set_all_expanded if self.expand_all_btn else None)
         self.header.grid(row=0, column=0, padx=5, pady=5, sticky="ew")
 
-        self.body = TreeBody(master=self, col_configs=config)
+        if self.virtualized:
+            self.body = VirtualTreeBody(master=self, col_configs=config, select_cb=self.select_cb)
+        else:
+            self.body = TreeBody(master=self, col_configs=config, select_cb=self.select_cb)
         self.body.grid(row=1, column=0, padx=5, pady=5, sticky="nsew")
 
     def add_column(self, col_name: str, col_size: int, col_weight: int) -> None:
         config: TreeColumnConfig = TreeColumnConfig(col_name, col_size, col_weight)
         self.col_configs.append(config)
 
-    def add_entry(self, name: str, indent: int, data: List[Any], parent_name: str,
+    def add_entry(self, name: Hashable, indent: int, data: List[Any], parent_name: Hashable,
                   default_expand: bool = False, default_select: bool = False) -> None:
         if not (self.header and self.body):
             raise RuntimeError("Tree body not initialized")
 
         self.body.add_entry(name, indent, data, parent_name, default_expand, default_select)
+        self.entries_changed = True
 
-    def update_entry(self, name: str, data: List[Any]) -> None:
+    def update_entry(self, name: Hashable, data: List[Any]) -> None:
         if not (self.header and self.body):
             raise RuntimeError("Tree body not initialized")
 
         self.body.update_entry(name, data)
+        self.entries_changed = True
+
+    def remove_entry(self, name: Hashable) -> None:
+        """
+        Removes an entry and its descendants. Does nothing if there's no entry with that name.
+        """
+
+        if not (self.header and self.body):
+            raise RuntimeError("Tree body not initialized")
+
+        self.body.remove_entry(name)
 
-    def contains_entry(self, name: str) -> bool:
+    def contains_entry(self, name: Hashable) -> bool:
         if not (self.header and self.body):
             raise RuntimeError("Tree body not initialized")
 
         return self.body.contains_entry(name)
 
+    def get_expand_states(self) -> Dict[Hashable, bool]:
+        """
+        :return: Expanded state of each entry, by entry name.
+        """
+
+        if not (self.header and self.body):
+            raise RuntimeError("Tree body not initialized")
+
+        return self.body.get_expand_states()
+
+    def get_selected_name(self) -> Union[Hashable, None]:
+        if not (self.header and self.body):
+            raise RuntimeError("Tree body not initialized")
+
+        return self.body.get_selected_name()
+
+    def expand_all(self) -> None:
+        self.set_all_expanded(True)
+
+    def collapse_all(self) -> None:
+        self.set_all_expanded(False)
+
+    def set_all_expanded(self, expanded: bool) -> None:
+        """
+        Expands or collapses every entry, and redraws the tree in one layout pass.
+        """
+
+        if not (self.header and self.body):
+            raise RuntimeError("Tree body not initialized")
+
+        self.body.set_all_expanded(expanded)
+
     def render_tree(self) -> None:
         if not (self.header and self.body):
             raise RuntimeError("Tree body not initialized")
 
+        if self.entries_changed and self.sort_col_idx is not None:
+            self.body.sort_by(self.sort_col_idx, self.sort_reverse)
+        self.entries_changed = False
+
         self.body.draw_tree()
 
+    def order_entries(self, names: List[Hashable]) -> None:
+        """
+        Orders sibling entries by where their names are in a list, unless a sort column is picked. New entries are
+        added as their parent's last child, so this restores an order after entries are added to a filled tree.
+        """
+
+        if not (self.header and self.body):
+            raise RuntimeError("Tree body not initialized")
+
+        if self.sort_col_idx is None:
+            self.body.order_by(names)
+
     def clear_tree(self) -> None:
         if not (self.header and self.body):
             raise RuntimeError("Tree body not initialized")
@@ -90,6 +172,8 @@ class TreeWidget(ctk.CTkFrame):
         else:
             reverse = True
 
+        self.sort_col_idx = col_idx
+        self.sort_reverse = reverse
         self.body.sort_by(col_idx, reverse)
 
         # Clear other column button states to prevent multi-sort issues.
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+from Widgets.Tree.common import *
+
+from Widgets.Tree.TreeBody import TreeBody
+from Widgets.Tree.TreeEntry import TreeEntry
+from Widgets.Tree.TreeEntryConfig import TreeEntryConfig
+from Widgets.Tree.TreeNode import TreeNode
+from Widgets.Tree.TreeDataStructure import TreeDataStructure
+
+if TYPE_CHECKING:
+    from Widgets.Tree.TreeColumnConfig import TreeColumnConfig
+
+
+class VirtualTreeBody(ctk.CTkFrame):
+    """
+    Tree body that only creates entry widgets for the rows on screen.
+    Nodes only hold their entry configuration. A pool of entries sized to the viewport is bound to the visible slice
+    of the flattened tree, and rebound when the tree is scrolled, expanded or redrawn, so the cost of drawing the
+    tree depends on the viewport height instead of the number of entries.
+    """
+
+    # Used to size the row pool until a bound row has been measured.
+    default_row_height: int = 32
+    wheel_rows: int = 3
+
+    def __init__(self, *args,
+                 width: int = 100,
+                 height: int = 300,
+                 col_configs: List[TreeColumnConfig],
+                 select_cb: Union[Callable[[Union[Hashable, None]], None], None] = None,
+                 **kwargs) -> None:
+        super().__init__(*args, width=width, height=height, **kwargs)
+
+        self.col_configs: List[TreeColumnConfig] = col_configs
+        self.select_cb: Union[Callable[[Union[Hashable, None]], None], None] = select_cb
+
+        self.configure(fg_color=("gray78", "gray28"))
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_columnconfigure(1, weight=0)
+        self.grid_rowconfigure(0, weight=1)
+
+        # Rows frame takes its size from the body, not from the pooled entries, so adding entries can't resize it.
+        self.rows_frame: ctk.CTkFrame = ctk.CTkFrame(self, fg_color="transparent", width=width, height=height)
+        self.rows_frame.grid(row=0, column=0, sticky="nsew")
+        self.rows_frame.grid_propagate(False)
+        self.rows_frame.grid_columnconfigure(0, weight=1)
+
+        self.scrollbar: ctk.CTkScrollbar = ctk.CTkScrollbar(self, command=self.on_scrollbar_moved)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.tree: TreeDataStructure = TreeDataStructure()
+        self.sel_name: Union[Hashable, None] = None
+        self.expand_states: Dict[Hashable, bool] = dict()
+
+        # Pre-order list of nodes whose ancestors are all expanded.
+        self.visible_nodes: List[TreeNode] = list()
+        # Index into visible nodes of the first row on screen.
+        self.first_row: int = 0
+        self.num_rows: int = 0
+        # Height of the rows frame, and of a row once measured. Rows are as tall as their font and scaling make them.
+        self.view_height: int = 0
+        self.row_height: Union[int, None] = None
+
+        self.rows: List[TreeEntry] = list()
+        self.bound_rows: Dict[Hashable, TreeEntry] = dict()
+
+        self.rows_frame.bind("<Configure>", lambda event: self.on_resized(event.height), add="+")
+        self.bind_mouse_wheel(self.rows_frame)
+
+    def add_entry(self, name: Hashable, indent: int, data: List[Any], parent_name: Hashable,
+                  default_expand: bool = False, default_select: bool = False) -> None:
+        entry_config: TreeEntryConfig = TreeEntryConfig(name, indent, data,
+                                                        self.on_entry_clicked, self.on_entry_expanded,
+                                                        self.format_data(data))
+        child_node: TreeNode = TreeNode(config=entry_config)
+
+        # Start with node collapsed/expanded.
+        self.expand_states[name] = default_expand
+
+        # Set select state.
+        if default_select:
+            self.sel_name = name
+
+        # Insert node into tree.
+        self.tree.add_node(child_node, None if parent_name == TreeBody.root_name else parent_name)
+
+    def update_entry(self, name: Hashable, data: List[Any]) -> None:
+        node: Union[TreeNode, None] = self.tree.get_node(name)
+        if not node or not node.config:
+            return
+
+        node.config.data = data
+        node.config.texts = self.format_data(data)
+
+        # Entries off screen pick up the new data when they're next bound.
+        row: Union[TreeEntry, None] = self.bound_rows.get(name)
+        if row:
+            row.update_entry(node.config.data, node.config.texts)
+
+    def format_data(self, data: List[Any]) -> List[str]:
+        return [col_config.format(x) for col_config, x in zip(self.col_configs, data)]
+
+    def remove_entry(self, name: Hashable) -> None:
+        # Expand states are kept, so entries that come back are shown the way they were left.
+        for node in self.tree.remove_node(name):
+            if node.config and node.config.name == self.sel_name:
+                self.sel_name = None
+
+    def contains_entry(self, name: Hashable) -> bool:
+        return name in self.tree
+
+    def draw_tree(self) -> None:
+        self.update_visible_nodes()
+        self.draw_rows()
+
+    def delete_entries(self) -> None:
+        # Expand states are kept, same as the non-virtualized body.
+        self.sel_name = None
+        self.tree.clear()
+        self.visible_nodes.clear()
+
+    def sort_by(self, key: int, reverse: bool = False) -> None:
+        self.tree.sort(key, reverse)
+
+    def order_by(self, names: List[Hashable]) -> None:
+        self.tree.order_by(names)
+
+    def get_expand_states(self) -> Dict[Hashable, bool]:
+        return self.expand_states
+
+    def get_selected_name(self) -> Union[Hashable, None]:
+        return self.sel_name
+
+    def on_entry_clicked(self, entry: TreeEntry, clicked: bool) -> None:
+        # Force highlighting of selected node only.
+        if clicked:
+            self.sel_name = entry.entry_config.name
+        else:
+            self.sel_name = None
+
+        for row in self.bound_rows.values():
+            if row != entry:
+                row.deselect()
+
+        if self.select_cb:
+            self.select_cb(self.sel_name)
+
+    def on_entry_expanded(self, entry: TreeEntry, expanded: bool) -> None:
+        name: Hashable = entry.entry_config.name
+        if name not in self.tree:
+            raise ValueError("Expanded tree entry does not have a node assigned", repr(entry))
+
+        self.expand_states[name] = expanded
+        self.draw_tree()
+
+    def set_all_expanded(self, expanded: bool) -> None:
+        for name in self.tree.name_index.keys():
+            self.expand_states[name] = expanded
+
+        self.draw_tree()
+
+    def update_visible_nodes(self) -> None:
+        self.visible_nodes.clear()
+
+        # Pre-order traversal that skips the descendants of collapsed nodes.
+        stack: List[TreeNode] = list(reversed(self.tree.root_node.children))
+        while stack:
+            node: TreeNode = stack.pop()
+            self.visible_nodes.append(node)
+
+            if node.config and self.expand_states.get(node.config.name, False):
+                stack.extend(reversed(node.children))
+
+    def draw_rows(self) -> None:
+        # Keep the last row at the bottom of the view when the tree shrinks.
+        max_first_row: int = max(0, len(self.visible_nodes) - self.num_rows + 1)
+        self.first_row = max(0, min(self.first_row, max_first_row))
+
+        self.bound_rows.clear()
+        for i in range(0, len(self.rows)):
+            row: TreeEntry = self.rows[i]
+            node_idx: int = self.first_row + i
+            if i >= self.num_rows or node_idx >= len(self.visible_nodes):
+                if row.winfo_manager():
+                    row.grid_remove()
+                continue
+
+            node: TreeNode = self.visible_nodes[node_idx]
+            if not node.config:
+                continue
+
+            row.set_entry_config(node.config,
+                                 expandable=len(node.children) > 0,
+                                 expanded=self.expand_states.get(node.config.name, False),
+                                 selected=node.config.name == self.sel_name)
+            if not row.winfo_manager():
+                row.grid()
+            self.bound_rows[node.config.name] = row
+
+        if self.row_height is None and self.bound_rows:
+            # Bound row has its requested size once pending geometry changes are applied.
+            self.after_idle(self.measure_row_height)
+
+        self.update_scrollbar()
+
+    def measure_row_height(self) -> None:
+        if self.row_height is not None or not self.bound_rows:
+            return
+
+        row_height: int = next(iter(self.bound_rows.values())).winfo_reqheight()
+        if row_height <= 1:
+            # Not laid out yet, so it's measured again on the next draw.
+            return
+
+        self.row_height = row_height
+        self.on_resized(self.view_height)
+
+    def get_row_height(self) -> int:
+        if self.row_height is not None:
+            return self.row_height
+
+        return int(self._apply_widget_scaling(VirtualTreeBody.default_row_height))
+
+    def update_scrollbar(self) -> None:
+        if len(self.visible_nodes) == 0:
+            self.scrollbar.set(0, 1)
+            return
+
+        start: float = self.first_row / len(self.visible_nodes)
+        end: float = min(1.0, (self.first_row + self.num_rows) / len(self.visible_nodes))
+        self.scrollbar.set(start, end)
+
+    def scroll_to(self, first_row: int) -> None:
+        max_first_row: int = max(0, len(self.visible_nodes) - self.num_rows + 1)
+        first_row = max(0, min(first_row, max_first_row))
+        if first_row == self.first_row:
+            return
+
+        self.first_row = first_row
+        self.draw_rows()
+
+    def on_scrollbar_moved(self, *args) -> None:
+        # See: https://tkdocs.com/shipman/scrollbar-callback.html
+        if args[0] == "moveto":
+            self.scroll_to(round(float(args[1]) * len(self.visible_nodes)))
+        elif args[0] == "scroll":
+            step: int = int(args[1])
+            if args[2] == "pages":
+                step *= max(1, self.num_rows - 1)
+            self.scroll_to(self.first_row + step)
+
+    def on_mouse_wheel(self, event) -> None:
+        # Windows and macOS report a wheel delta, X11 reports buttons 4 and 5.
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.first_row - VirtualTreeBody.wheel_rows)
+        else:
+            self.scroll_to(self.first_row + VirtualTreeBody.wheel_rows)
+
+    def bind_mouse_wheel(self, widget: Any) -> None:
+        widget.bind("<MouseWheel>", self.on_mouse_wheel, add="+")
+        widget.bind("<Button-4>", self.on_mouse_wheel, add="+")
+        widget.bind("<Button-5>", self.on_mouse_wheel, add="+")
+
+    def on_resized(self, height: int) -> None:
+        self.view_height = height
+
+        # One extra row covers a partially visible row at the bottom.
+        num_rows: int = height // self.get_row_height() + 1
+        if num_rows == self.num_rows:
+            return
+
+        self.num_rows = num_rows
+        while len(self.rows) < self.num_rows:
+            self.add_row()
+
+        self.draw_rows()
+
+    def add_row(self) -> None:
+        placeholder_config: TreeEntryConfig = TreeEntryConfig("", 0, [""] * len(self.col_configs),
+                                                              self.on_entry_clicked, self.on_entry_expanded)
+        row: TreeEntry = TreeEntry(master=self.rows_frame, entry_config=placeholder_config,
+                                   col_minsizes=[x.minsize for x in self.col_configs],
+                                   col_weights=[x.weight for x in self.col_configs])
+
+        row.grid(row=len(self.rows), column=0, sticky="ew")
+        row.grid_remove()
+
+        self.bind_mouse_wheel(row)
+        for child in row.winfo_children():
+            self.bind_mouse_wheel(child)
+
+        self.rows.append(row)
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Iterator, List, Union, TYPE_CHECKING
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Tuple, Union, TYPE_CHECKING
 
 import customtkinter as ctk
 
-__all__ = ["dataclass", "Any", "Callable", "Dict", "Iterator", "List", "Union", "TYPE_CHECKING", "ctk"]
+__all__ = ["dataclass", "Any", "Callable", "Dict", "Hashable", "Iterator", "List", "Tuple", "Union", "TYPE_CHECKING",
+           "ctk"]